@@ -20,9 +20,11 @@ Tool groups, in declaration order:
   the primary surface — CanadaBuys and Alberta APC together.
 - **Alberta APC tools** (``search_alberta_opportunities``, etc.):
   Alberta-only variants for targeted provincial work.
-- **Sandbox & model tools** (``process_bid_room``, ``check_cohere_status``,
-  ``analyze_contract_with_cohere``): E2B bid-room processing and optional
-  Cohere Command A+ review.
+- **Sandbox & model tools** (``process_bid_room``, ``get_bid_room_job``,
+  ``process_bid_room_batch``, ``get_bid_room_batch``,
+  ``check_cohere_status``, ``analyze_contract_with_cohere``): E2B bid-room
+  processing (inline, as a polled background job, or as a batch across
+  several tenders) and optional Cohere Command A+ review.
 
 When adding a tool: add the ``Tool`` entry here, implement the async handler
 in ``procurement_core/service.py``, add the name to ``TOOL_NAMES``, and cover
@@ -424,11 +426,93 @@ def get_mcp_tools() -> list[Tool]:
                         "description": "Sandbox command timeout in seconds (default 420)",
                         "default": 420
                     },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Ignore any cached result and reprocess the package even if the attachments have not changed (default false)",
+                        "default": False
+                    },
+                    "background": {
+                        "type": "boolean",
+                        "description": "Queue the run as a background job and return a job_id immediately instead of waiting for the result (default false)",
+                        "default": False
+                    },
                     "profile": PROFILE_ARG_SCHEMA
                 },
                 "required": ["reference"]
             }
         ),
+        Tool(
+            name="get_bid_room_job",
+            description="Check a background bid-room job started with process_bid_room(background=true). Returns its status, or the full bid-room analysis once it has finished.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job ID returned when the bid-room job was submitted"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="process_bid_room_batch",
+            description="Run bid rooms for several tenders at once: your watchlist, your top profile matches, or a list of references. Queues them as background jobs and returns a batch ID; check it with get_bid_room_batch for a side-by-side comparison ranked by fit score.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "source": {
+                        "type": "string",
+                        "enum": ["references", "watchlist", "matches"],
+                        "description": "Where the tenders come from. Defaults to `references` when references are given, otherwise `watchlist`."
+                    },
+                    "references": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "CanadaBuys or Alberta APC reference numbers (for source=references)"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum tenders to process (default: 5, max: 10)"
+                    },
+                    "days": {
+                        "type": "integer",
+                        "description": "For source=matches: only opportunities closing within this many days (default: 30)"
+                    },
+                    "business_context": {
+                        "type": "string",
+                        "description": "Optional business context applied to every tender. Defaults to the saved profile."
+                    },
+                    "max_attachments": {
+                        "type": "integer",
+                        "description": "Maximum attachments to process per tender (default: 5, max: 5)"
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Ignore cached bid-room results and process every tender again"
+                    },
+                    "profile": PROFILE_ARG_SCHEMA
+                }
+            }
+        ),
+        Tool(
+            name="get_bid_room_batch",
+            description="Check a bid-room batch started with process_bid_room_batch. Shows progress and the finished tenders ranked by fit score, with job IDs for each full review.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "batch_id": {
+                        "type": "string",
+                        "description": "Batch ID returned when the batch was submitted"
+                    },
+                    "wait_seconds": {
+                        "type": "integer",
+                        "description": "Wait up to this many seconds for the batch to finish before reporting (default: 0, max: 300)"
+                    }
+                },
+                "required": ["batch_id"]
+            }
+        ),
         Tool(
             name="check_cohere_status",
             description="Check whether the optional Cohere Command A+ model integration is configured. Does not call the model.",
@@ -460,6 +544,10 @@ def get_mcp_tools() -> list[Tool]:
                         "description": "Maximum model response tokens (default 1200, max 2000)",
                         "default": 1200
                     },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Ignore a cached analysis of the same prompt and ask the model again"
+                    },
                     "profile": PROFILE_ARG_SCHEMA
                 },
                 "required": ["reference"]
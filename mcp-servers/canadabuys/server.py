@@ -7,16 +7,19 @@ any stdio-capable MCP client launch this script directly (see
 adds the repo root to ``sys.path``, exposes the declared tool list from
 ``mcp_tools.get_mcp_tools()``, and forwards every call to
 ``procurement_core.service.call_tool_text``, wrapping the returned markdown
-in a single ``TextContent`` block.
+in a single ``TextContent`` block. When the client sends a progress token,
+tools that stream (``analyze_contract_with_cohere``) also forward their
+output as it is generated, as ``notifications/progress`` messages.
 
 Run directly:            ``python mcp-servers/canadabuys/server.py``
 Smoke test:              ``python -m unittest tests.test_canadabuys_mcp_smoke``
 Hosted equivalent:       ``server_http.py`` (StreamableHTTP MCP + REST)
 """
 
+import asyncio
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -26,7 +29,11 @@ ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from procurement_core.service import call_tool_text  # noqa: E402
+from procurement_core.service import (  # noqa: E402
+    call_tool_text,
+    reset_progress_sink,
+    set_progress_sink,
+)
 from mcp_tools import get_mcp_tools  # noqa: E402
 
 server = Server("canadabuys")
@@ -38,10 +45,40 @@ async def list_tools() -> list[Tool]:
     return get_mcp_tools()
 
 
+def _progress_sink() -> Callable[[str], None] | None:
+    """Forward streamed tool text as progress notifications, if the client asked for progress."""
+    try:
+        ctx = server.request_context
+    except LookupError:
+        return None
+    progress_token = ctx.meta.progressToken if ctx.meta else None
+    if progress_token is None:
+        return None
+    loop = asyncio.get_running_loop()
+    sent = 0
+
+    def sink(text: str) -> None:
+        # Called from the tool's worker thread; notifications go out on the loop.
+        nonlocal sent
+        sent += len(text)
+        asyncio.run_coroutine_threadsafe(
+            ctx.session.send_progress_notification(
+                progress_token, sent, message=text, related_request_id=ctx.request_id
+            ),
+            loop,
+        )
+
+    return sink
+
+
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle an MCP tool call through the shared procurement core."""
-    text = await call_tool_text(name, arguments)
+    token = set_progress_sink(_progress_sink())
+    try:
+        text = await call_tool_text(name, arguments)
+    finally:
+        reset_progress_sink(token)
     return [TextContent(type="text", text=text)]
 
 
@@ -56,6 +93,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    import asyncio
-
     asyncio.run(main())
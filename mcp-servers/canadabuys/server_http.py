@@ -11,7 +11,8 @@ One FastAPI app, two protocols, identical behaviour:
   the same tool schemas the MCP side declares; ``POST /tools/{tool_name}``
   calls any tool generically; and named convenience routes (``/search``,
   ``/details/{reference}``, ``/deadlines``, ``/matches``, ``/brief``,
-  ``/bid-room/process``, ``/profile``, ``/cohere/analyze``) map one-to-one
+  ``/bid-room/process``, ``/bid-room/jobs``, ``/bid-room/batches``, ``/profile``,
+  ``/cohere/analyze``, ``/cohere/analyze/stream``) map one-to-one
   onto the highest-value tools. Interactive docs at ``/docs``, schema at
   ``/openapi.json``, liveness at ``/health`` (no upstream calls).
 
@@ -25,7 +26,15 @@ REST caller and an MCP agent always get byte-identical markdown for the same
 tool and arguments. The bid-room route is the one exception: it returns the
 full JSON artifact envelope from ``process_bid_room_artifact`` (sandbox id,
 artifact, rendered markdown) and maps payload errors to 400 and missing
-runtime dependencies (E2B/Cohere keys) to 503.
+runtime dependencies (E2B/Cohere keys) to 503. ``POST /bid-room/jobs`` runs
+the same processing as a background job (202 with a job id) and
+``GET /bid-room/jobs/{job_id}`` polls it, returning the same envelope under
+``result`` once the job succeeds. ``POST /bid-room/batches`` queues one job
+per tender (references, watchlist, or top matches);
+``GET /bid-room/batches/{batch_id}`` returns the fit-ranked comparison and
+``/events`` streams each tender as server-sent events while it finishes.
+``POST /cohere/analyze/stream`` is the streaming form of ``/cohere/analyze``:
+the same analysis, sent as server-sent events while the model writes it.
 
 Deploy: ``uvicorn server_http:app`` (see Dockerfile, Procfile, railway.json
 in this directory). Local run: ``python server_http.py`` serves on :8000.
@@ -33,15 +42,16 @@ in this directory). Local run: ``python server_http.py`` serves on :8000.
 
 import asyncio
 import contextlib
+import json
 import sys
 import time
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
 from typing import Any
 
 from fastapi import Body, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from mcp.server import Server
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from mcp.types import TextContent, Tool
@@ -50,7 +60,7 @@ ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from procurement_core import storage, telemetry  # noqa: E402
+from procurement_core import cohere_cache, cohere_keys, sandbox_pool, storage, telemetry  # noqa: E402
 from procurement_core.auth import (  # noqa: E402
     GateError,
     PRO_TOOLS,
@@ -60,7 +70,23 @@ from procurement_core.auth import (  # noqa: E402
     validate_key,
 )
 from procurement_core.billing import WebhookError, process_webhook_event  # noqa: E402
-from procurement_core.service import TOOL_NAMES, call_tool_text, process_bid_room_artifact  # noqa: E402
+from procurement_core.bid_room_batch import (  # noqa: E402
+    batch_view,
+    get_batch,
+    iter_batch_updates,
+    submit_batch,
+)
+from procurement_core.bid_room_jobs import get_job, public_job_view, submit_job  # noqa: E402
+from procurement_core.service import (  # noqa: E402
+    TOOL_NAMES,
+    call_tool_text,
+    contract_analysis_cache_key,
+    contract_analysis_footer,
+    contract_analysis_header,
+    prepare_contract_analysis,
+    process_bid_room_artifact,
+    stream_cohere_chat,
+)
 from mcp_tools import get_mcp_tools  # noqa: E402
 
 mcp_server = Server("canadabuys")
@@ -80,9 +106,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         json_response=True,
         stateless=True,
     )
+    # Warm bid-room sandboxes boot in a daemon thread; off unless
+    # WA_BID_ROOM_POOL_SIZE is set.
+    sandbox_pool.start()
     async with session_manager.run():
         yield
     session_manager = None
+    await asyncio.to_thread(sandbox_pool.shutdown)
 
 
 app = FastAPI(
@@ -322,6 +352,8 @@ async def health() -> dict[str, Any]:
             "enabled": gate_enabled(),
             "pro_tools": sorted(PRO_TOOLS),
         },
+        "bid_room_pool": sandbox_pool.stats(),
+        "cohere_keys": cohere_keys.stats(),
     }
 
 
@@ -617,6 +649,138 @@ async def bid_room_process(request: Request, arguments: dict[str, Any] | None =
             storage.reset_tenant(token)
 
 
+async def _bid_room_gate(request: Request, tool_name: str) -> dict[str, Any] | None:
+    try:
+        return await asyncio.to_thread(check_tool_access, tool_name, _auth(request))
+    except GateError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+
+
+@app.post("/bid-room/jobs", tags=["bid-room"], status_code=202)
+async def bid_room_submit_job(
+    request: Request,
+    arguments: dict[str, Any] | None = Body(default=None),
+) -> JSONResponse:
+    """Queue bid-room processing as a background job and return its id.
+
+    Returns 202 for a new job, or 200 with the existing job when an identical
+    one is already queued or running. Pro-gated like ``/bid-room/process``.
+    """
+    record = await _bid_room_gate(request, "process_bid_room")
+    token = storage.set_tenant(record["key_hash"]) if record else None
+    try:
+        # Profile resolution may read tenant storage; keep it off the event loop.
+        job, created = await asyncio.to_thread(submit_job, arguments or {})
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    finally:
+        if token is not None:
+            storage.reset_tenant(token)
+    return JSONResponse(public_job_view(job), status_code=202 if created else 200)
+
+
+@app.get("/bid-room/jobs/{job_id}", tags=["bid-room"])
+async def bid_room_get_job(job_id: str, request: Request) -> dict[str, Any]:
+    """Poll a background bid-room job; ``result`` holds the envelope once it succeeds."""
+    record = await _bid_room_gate(request, "get_bid_room_job")
+    token = storage.set_tenant(record["key_hash"]) if record else None
+    try:
+        job = await asyncio.to_thread(get_job, job_id)
+    finally:
+        if token is not None:
+            storage.reset_tenant(token)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Bid room job not found: {job_id}")
+    return public_job_view(job)
+
+
+@app.post("/bid-room/batches", tags=["bid-room"], status_code=202)
+async def bid_room_submit_batch(
+    request: Request,
+    arguments: dict[str, Any] | None = Body(default=None),
+) -> JSONResponse:
+    """Queue bid rooms for several tenders and return the batch id.
+
+    ``source`` is ``references`` (with ``references``), ``watchlist``, or
+    ``matches`` (top profile matches). Pro-gated like ``/bid-room/process``.
+    """
+    record = await _bid_room_gate(request, "process_bid_room_batch")
+    token = storage.set_tenant(record["key_hash"]) if record else None
+    try:
+        batch = await asyncio.to_thread(submit_batch, arguments or {})
+        view = await asyncio.to_thread(batch_view, batch)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    finally:
+        if token is not None:
+            storage.reset_tenant(token)
+    return JSONResponse(view, status_code=202)
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _batch_snapshot(batch_id: str, key_hash: str | None) -> dict[str, Any] | None:
+    token = storage.set_tenant(key_hash) if key_hash else None
+    try:
+        batch = get_batch(batch_id)
+        return batch_view(batch) if batch is not None else None
+    finally:
+        if token is not None:
+            storage.reset_tenant(token)
+
+
+def _next_batch_update(
+    updates: Iterator[tuple[str, dict[str, Any]]],
+    key_hash: str | None,
+) -> tuple[str, dict[str, Any]] | None:
+    token = storage.set_tenant(key_hash) if key_hash else None
+    try:
+        return next(updates, None)
+    finally:
+        if token is not None:
+            storage.reset_tenant(token)
+
+
+@app.get("/bid-room/batches/{batch_id}", tags=["bid-room"])
+async def bid_room_get_batch(batch_id: str, request: Request) -> dict[str, Any]:
+    """Return batch progress and the finished tenders ranked by fit score."""
+    record = await _bid_room_gate(request, "get_bid_room_batch")
+    view = await asyncio.to_thread(_batch_snapshot, batch_id, record["key_hash"] if record else None)
+    if view is None:
+        raise HTTPException(status_code=404, detail=f"Bid room batch not found: {batch_id}")
+    return view
+
+
+@app.get("/bid-room/batches/{batch_id}/events", tags=["bid-room"])
+async def bid_room_batch_events(batch_id: str, request: Request) -> StreamingResponse:
+    """Stream a batch as server-sent events.
+
+    Emits ``event: tender`` with each tender's summary as its job finishes,
+    then one ``event: summary`` with the ranked comparison.
+    """
+    record = await _bid_room_gate(request, "get_bid_room_batch")
+    key_hash = record["key_hash"] if record else None
+    if await asyncio.to_thread(_batch_snapshot, batch_id, key_hash) is None:
+        raise HTTPException(status_code=404, detail=f"Bid room batch not found: {batch_id}")
+
+    async def events() -> AsyncIterator[str]:
+        # iter_batch_updates owns the poll/diff loop; each step (including
+        # its poll sleep) runs on a worker thread under the caller's tenant.
+        updates = iter_batch_updates(batch_id)
+        try:
+            while not await request.is_disconnected():
+                update = await asyncio.to_thread(_next_batch_update, updates, key_hash)
+                if update is None:
+                    return
+                yield _sse(*update)
+        finally:
+            updates.close()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
 @app.post("/profile", tags=["profile"])
 async def set_profile(request: Request, arguments: dict[str, Any] | None = Body(default=None)) -> dict[str, Any]:
     """Set the business profile used for opportunity matching."""
@@ -635,6 +799,75 @@ async def cohere_analyze(request: Request, arguments: dict[str, Any] | None = Bo
     return await run_tool("analyze_contract_with_cohere", arguments, _auth(request))
 
 
+
+@app.post("/cohere/analyze/stream", tags=["analysis"])
+async def cohere_analyze_stream(
+    request: Request,
+    arguments: dict[str, Any] | None = Body(default=None),
+) -> StreamingResponse:
+    """Stream a Cohere tender analysis as server-sent events.
+
+    Emits ``event: meta`` (provider, model, source, and the markdown header),
+    then ``event: chunk`` with ``{"text": ...}`` as the model writes, then
+    ``event: done`` with the markdown footer (or ``event: error`` if the
+    stream breaks). Same arguments and gate as ``/cohere/analyze``.
+    """
+    arguments = arguments or {}
+    record = await _bid_room_gate(request, "analyze_contract_with_cohere")
+    token = storage.set_tenant(record["key_hash"]) if record else None
+    try:
+        # Loads the tender and the tenant's profile; both can block.
+        prepared = await asyncio.to_thread(prepare_contract_analysis, arguments)
+    finally:
+        if token is not None:
+            storage.reset_tenant(token)
+    if isinstance(prepared, str):
+        raise HTTPException(status_code=400, detail=prepared)
+    cached = None if arguments.get("refresh") else cohere_cache.lookup(prepared["cache_key"])
+    if cached is not None:
+        chunks, provider, model = iter([cached["content"]]), cached["provider"], cached["model"]
+    else:
+        try:
+            chunks, provider, model = await asyncio.to_thread(
+                stream_cohere_chat, prepared["messages"], prepared["max_tokens"]
+            )
+        except RuntimeError as exc:
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    started = time.monotonic()
+
+    def events() -> Iterator[str]:
+        # Sync generator: Starlette iterates it in a worker thread, so the
+        # blocking reads from the model stream stay off the event loop.
+        header = contract_analysis_header(prepared, provider, model, cached["stored_utc"] if cached else "")
+        yield _sse("meta", {
+            "provider": provider,
+            "model": model,
+            "source": prepared["source_name"],
+            "reference": prepared["source_ref"],
+            "cached": cached is not None,
+            "header": header,
+        })
+        parts = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield _sse("chunk", {"text": chunk})
+        except (OSError, RuntimeError) as exc:
+            yield _sse("error", {"detail": str(exc)})
+            return
+        footer = contract_analysis_footer(prepared)
+        yield _sse("done", {"footer": footer})
+        if cached is None:
+            cohere_cache.store(contract_analysis_cache_key(prepared, model), "".join(parts), provider, model)
+        telemetry.capture_tool_call(
+            "analyze_contract_with_cohere", "rest", record, arguments, header + "".join(parts) + footer,
+            int((time.monotonic() - started) * 1000),
+        )
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,14 +1,37 @@
 import argparse
 import csv
+import hashlib
+import heapq
 import json
+import os
+import pickle
 import re
+import shutil
 import sys
+import tempfile
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from urllib.error import HTTPError, URLError
 from urllib.parse import unquote, urlsplit
 from pathlib import Path
 from urllib.request import Request, urlopen
 from io import TextIOWrapper
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from procurement_core.unspsc import UnspscClassifier, extract_codes  # noqa: E402
+
+try:
+    import duckdb
+except ImportError:  # duckdb is only needed for --parquet
+    duckdb = None
+
 
 REQUEST_HEADERS = {
     "User-Agent": (
@@ -20,6 +43,39 @@ REQUEST_HEADERS = {
     "Referer": "https://canadabuys.canada.ca/en/tender-opportunities",
 }
 
+DOWNLOAD_CHUNK_BYTES = 1024 * 64
+RETRY_BACKOFF_SECONDS = 0.5
+MAX_RETRY_BACKOFF_SECONDS = 8.0
+PROGRESS_INTERVAL_SECONDS = 2.0
+ATTACHMENT_STATE_FILENAME = "attachment_state.json"
+DEFAULT_RECHECK_HOURS = 168
+CACHEABLE_STATUSES = (200, 404)
+# Below this many distinct patterns a loop of `in` checks beats one regex
+# pass in CPython (see scripts/benchmark_pipeline_matching.py).
+COMPILED_MATCHER_MIN_PATTERNS = 96
+CLASSIFY_BATCH_ROWS = 2000
+SORT_BUFFER_ROWS = 50000
+PIPELINE_STATE_FILENAME = "pipeline_state.json"
+PIPELINE_STATE_VERSION = 1
+SOURCE_STATE_FILENAME = "source_state.json"
+DEFAULT_SOURCE_RECHECK_HOURS = 24
+PARTITION_FIELDS = ["publicationDate-datePublication"]
+REGION_FIELD_KEYWORDS = ("region", "province")
+TEXT_FIELD_KEYWORDS = ("title", "titre", "description")
+PROJECT_MANIFEST_FILENAME = "manifest.json"
+PROJECT_ARCHIVE_FILENAME = "projects.zip"
+MARKDOWN_MODES = ("files", "archive", "both")
+MARKDOWN_WORKERS = 4
+
+MATCH_COLUMNS = [
+    "match_regions",
+    "match_industries",
+    "match_codes",
+    "match_categories",
+    "match_sources",
+    "match_keywords",
+]
+
 REGION_FIELDS = [
     "regionsOfOpportunity-regionAppelOffres-eng",
     "regionsOfOpportunity-regionAppelOffres-fra",
@@ -101,6 +157,13 @@ def build_code_rules(config: dict) -> list[dict]:
     return [rule for rule in rules if rule]
 
 
+def compile_code_rules(rules: list[dict]) -> UnspscClassifier:
+    classifier = UnspscClassifier()
+    for rule in rules:
+        classifier.add(rule["prefix"], rule, exact=rule["match_type"] == "exact")
+    return classifier
+
+
 def build_rule(industry: str, category: str, code: str) -> dict | None:
     digits = normalize_code(code)
     if not digits:
@@ -121,9 +184,7 @@ def build_rule(industry: str, category: str, code: str) -> dict | None:
 
 
 def extract_unspsc_codes(value: str) -> list[str]:
-    if not value:
-        return []
-    return re.findall(r"[0-9]{4,8}", value)
+    return extract_codes(value)
 
 
 def parse_date(value: str) -> datetime | None:
@@ -281,43 +342,239 @@ def render_project_markdown(row: dict) -> str:
     return "\n".join(lines).strip() + "\n"
 
 
-def match_regions(row: dict, regions: list[str]) -> set[str]:
+def trie_pattern(words: list[str]) -> str:
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _trie_branch(trie)
+
+
+def _trie_branch(node: dict) -> str:
+    branches = [re.escape(char) + _trie_branch(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+
+class KeywordMatcher:
+    # Case-insensitive substring matching of many patterns, with the same
+    # results as testing `pattern.lower() in text.lower()` for each one.
+    def __init__(self, labelled_patterns, strategy: str | None = None) -> None:
+        self.labels: dict[str, list[tuple[str, str]]] = {}
+        for label, pattern in labelled_patterns:
+            self.labels.setdefault(pattern.lower(), []).append((label, pattern))
+        self.always = [pattern for pattern in self.labels if not pattern]
+        self.patterns = sorted(pattern for pattern in self.labels if pattern)
+        if strategy is None:
+            strategy = "regex" if len(self.patterns) >= COMPILED_MATCHER_MIN_PATTERNS else "scan"
+        self.strategy = strategy if self.patterns else "scan"
+        self._regex = None
+        self._scan = [(pattern, tuple(labelled)) for pattern, labelled in self.labels.items()]
+        self._contained: dict[str, list[str]] = {}
+        if self.strategy == "regex":
+            # The lookahead reports, at every position, the longest pattern
+            # starting there; shorter patterns inside it are added from
+            # _contained, so overlapping and nested matches are all found.
+            self._regex = re.compile("(?=(" + trie_pattern(self.patterns) + "))")
+            self._contained = {
+                pattern: [other for other in self.patterns if other in pattern]
+                for pattern in self.patterns
+            }
+
+    def find(self, haystack: str) -> set[str]:
+        found = set(self.always)
+        if self._regex is None:
+            found.update(pattern for pattern in self.patterns if pattern in haystack)
+            return found
+        for longest in set(self._regex.findall(haystack)):
+            found.update(self._contained[longest])
+        return found
+
+    def match(self, haystack: str) -> dict[str, set[str]]:
+        matches: dict[str, set[str]] = {}
+        if self._regex is None:
+            for pattern, labelled in self._scan:
+                if pattern in haystack:
+                    for label, original in labelled:
+                        matches.setdefault(label, set()).add(original)
+            return matches
+        for pattern in self.find(haystack):
+            for label, original in self.labels[pattern]:
+                matches.setdefault(label, set()).add(original)
+        return matches
+
+
+def build_region_matcher(regions: list[str]) -> KeywordMatcher:
+    return KeywordMatcher((region, region) for region in regions)
+
+
+def build_keyword_matcher(keyword_map: dict) -> KeywordMatcher:
+    return KeywordMatcher(
+        (industry, keyword) for industry, keywords in keyword_map.items() for keyword in keywords
+    )
+
+
+def match_regions(row: dict, matcher: KeywordMatcher, fields: list[str] = REGION_FIELDS) -> set[str]:
     combined = []
-    for field in REGION_FIELDS:
+    for field in fields:
         value = row.get(field, "")
         if value:
             combined.append(value)
     haystack = " ".join(combined).lower()
-    matched = set()
-    for region in regions:
-        if region.lower() in haystack:
-            matched.add(region)
-    return matched
+    return set(matcher.match(haystack))
 
 
-def match_keywords(row: dict, keyword_map: dict) -> dict:
-    text_parts = [row.get(field, "") for field in TEXT_FIELDS if row.get(field)]
+def match_keywords(row: dict, matcher: KeywordMatcher, fields: list[str] = TEXT_FIELDS) -> dict:
+    text_parts = [row.get(field, "") for field in fields if row.get(field)]
     haystack = " ".join(text_parts).lower()
-    matches = {}
-    for industry, keywords in keyword_map.items():
-        for keyword in keywords:
-            if keyword.lower() in haystack:
-                matches.setdefault(industry, set()).add(keyword)
-    return matches
-
-
-def match_unspsc(row_codes: list[str], rules: list[dict]) -> list[dict]:
-    hits = []
-    for rule in rules:
-        if rule["match_type"] == "exact":
-            if rule["prefix"] in row_codes:
-                hits.append(rule)
-        else:
-            for code in row_codes:
-                if code.startswith(rule["prefix"]):
-                    hits.append(rule)
-                    break
-    return hits
+    return matcher.match(haystack)
+
+
+def match_unspsc(row_codes: list[str], classifier: UnspscClassifier) -> list[dict]:
+    return classifier.match(row_codes)
+
+
+class RowClassifier:
+    # Compiled region/keyword/UNSPSC rules for one run. Picklable, so the
+    # process pool receives it once per worker rather than once per batch.
+    def __init__(
+        self,
+        regions: list[str],
+        keyword_map: dict,
+        rules: list[dict],
+        region_fields: list[str] = REGION_FIELDS,
+        text_fields: list[str] = TEXT_FIELDS,
+    ) -> None:
+        self.region_matcher = build_region_matcher(regions)
+        self.keyword_matcher = build_keyword_matcher(keyword_map)
+        self.code_classifier = compile_code_rules(rules)
+        self.region_fields = list(region_fields)
+        self.text_fields = list(text_fields)
+
+    def classify(self, row: dict) -> dict | None:
+        region_matches = match_regions(row, self.region_matcher, self.region_fields)
+        if not region_matches:
+            return None
+
+        unspsc_codes = extract_unspsc_codes(row.get("unspsc", ""))
+        unspsc_hits = match_unspsc(unspsc_codes, self.code_classifier)
+        keyword_hits = match_keywords(row, self.keyword_matcher, self.text_fields)
+
+        if not unspsc_hits and not keyword_hits:
+            return None
+
+        match_industries = set()
+        match_codes = set()
+        match_categories = set()
+        match_sources = set()
+        matched_keywords = set()
+
+        if unspsc_hits:
+            match_sources.add("unspsc")
+            for hit in unspsc_hits:
+                match_industries.add(hit["industry"])
+                match_codes.add(hit["code"])
+                match_categories.add(f"{hit['industry']}:{hit['category']}")
+
+        if keyword_hits:
+            match_sources.add("keyword")
+            for industry, keywords in keyword_hits.items():
+                match_industries.add(industry)
+                matched_keywords.update(keywords)
+
+        return build_output_row(row, {
+            "match_regions": ";".join(sorted(region_matches)),
+            "match_industries": ";".join(sorted(match_industries)),
+            "match_codes": ";".join(sorted(match_codes)),
+            "match_categories": ";".join(sorted(match_categories)),
+            "match_sources": ";".join(sorted(match_sources)),
+            "match_keywords": ";".join(sorted(matched_keywords)),
+        })
+
+    def classify_batch(self, rows: list[dict]) -> list[dict | None]:
+        return [self.classify(row) for row in rows]
+
+
+def build_output_row(row: dict, match_columns: dict) -> dict:
+    output_row = dict(row)
+    for column in MATCH_COLUMNS:
+        output_row[column] = match_columns.get(column, "")
+    attachments = parse_attachment_urls(row)
+    output_row["attachment_urls"] = ";".join(attachments)
+    output_row["attachment_working"] = ""
+    output_row["attachment_missing"] = ""
+    output_row["attachment_unchecked"] = ""
+    output_row["attachment_downloaded"] = ""
+    return output_row
+
+
+_WORKER_CLASSIFIER: RowClassifier | None = None
+
+
+def init_classify_worker(classifier: RowClassifier) -> None:
+    global _WORKER_CLASSIFIER
+    _WORKER_CLASSIFIER = classifier
+
+
+def classify_worker_batch(rows: list[dict]) -> list[dict | None]:
+    return _WORKER_CLASSIFIER.classify_batch(rows)
+
+
+def read_rows(reader, summary: dict, max_rows: int | None):
+    for row in reader:
+        summary["processed_total"] += 1
+        if max_rows and summary["processed_total"] > max_rows:
+            break
+        yield row
+
+
+def iter_batches(rows, size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def classify_rows(rows, classifier: RowClassifier, workers: int = 1, batch_rows: int = CLASSIFY_BATCH_ROWS):
+    # Yields one result per input row (None when it does not match).
+    if workers <= 1:
+        for row in rows:
+            yield classifier.classify(row)
+        return
+
+    # Batches are collected in submission order, so results come back in
+    # feed order whatever the worker count. At most two batches per worker
+    # are in flight, which keeps memory bounded on long historical feeds.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_classify_worker,
+        initargs=(classifier,),
+    ) as pool:
+        pending: deque = deque()
+        for batch in iter_batches(rows, max(1, batch_rows)):
+            pending.append(pool.submit(classify_worker_batch, batch))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def count_match(summary: dict, output_row: dict) -> None:
+    summary["matched_total"] += 1
+    for source in output_row["match_sources"].split(";"):
+        if source:
+            summary["match_sources"][source] += 1
+    for industry in output_row["match_industries"].split(";"):
+        if industry:
+            summary["industry_counts"][industry] = summary["industry_counts"].get(industry, 0) + 1
 
 
 def resolve_source(config: dict, source: str) -> str:
@@ -325,9 +582,112 @@ def resolve_source(config: dict, source: str) -> str:
         return config["sources"]["open_tenders_csv"]
     if source == "new":
         return config["sources"]["new_tenders_csv"]
+    dataset = config.get("datasets", {}).get(source)
+    if dataset:
+        return config["sources"][dataset["package_show"]]
     return source
 
 
+def dataset_name(config: dict, source: str) -> str:
+    if source in ("open", "new") or source in config.get("datasets", {}):
+        return sanitize_filename(source)
+    return "custom"
+
+
+def is_ckan_package(url: str) -> bool:
+    return url.startswith(("http://", "https://")) and "/action/package_show" in url
+
+
+def fetch_ckan_package(url: str, timeout: int) -> dict:
+    with urlopen(build_request(url), timeout=timeout) as response:
+        payload = json.load(response)
+    if not payload.get("success", True) or not isinstance(payload.get("result"), dict):
+        raise ValueError(f"CKAN package_show failed: {url}")
+    return payload["result"]
+
+
+def select_ckan_resource(package: dict, name_filter: str = "") -> dict:
+    resources = [
+        resource
+        for resource in package.get("resources", [])
+        if str(resource.get("format") or "").lower() == "csv"
+        or str(resource.get("url") or "").lower().endswith(".csv")
+    ]
+    if name_filter:
+        needle = name_filter.lower()
+        resources = [
+            resource
+            for resource in resources
+            if needle in f"{resource.get('name') or ''} {resource.get('url') or ''}".lower()
+        ]
+    if not resources:
+        raise ValueError(f"No CSV resource in CKAN package {package.get('name', '')!r} matches {name_filter!r}")
+    # Several CSVs (e.g. one per fiscal year): take the most recently updated.
+    return max(resources, key=lambda resource: resource.get("last_modified") or resource.get("created") or "")
+
+
+def download_source(url: str, output_root: Path, timeout: int, retries: int, recheck_hours: float) -> Path:
+    # Historical CSVs run to hundreds of megabytes: keep a local copy and
+    # reuse download_attachment for .part resume and conditional requests.
+    sources_dir = output_root / "sources"
+    destination = sources_dir / (sanitize_filename(filename_from_url(url)) or "source.csv")
+    state = AttachmentState(sources_dir / SOURCE_STATE_FILENAME, recheck_hours * 3600)
+    downloaded = download_attachment(url, destination, timeout, retries, state)
+    state.save()
+    if downloaded:
+        return destination
+    if destination.exists():
+        print(f"Could not refresh {url}; using the copy in {destination}", file=sys.stderr)
+        return destination
+    raise RuntimeError(f"Could not download {url}")
+
+
+def resolve_fields(header: list[str], configured: list[str], keywords: tuple[str, ...]) -> list[str]:
+    # Datasets name their columns differently; fall back to header columns
+    # whose names contain the keywords when none of the configured ones exist.
+    present = [field for field in configured if field in header]
+    if present or not header:
+        return present or list(configured)
+    return [field for field in header if any(keyword in field.lower() for keyword in keywords)]
+
+
+def write_parquet(csv_path: Path, target: Path, partition_fields: list[str]) -> int:
+    if duckdb is None:
+        raise ImportError(
+            "duckdb is required for Parquet output; install it with"
+            " `python -m pip install duckdb`"
+        )
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        header = next(csv.reader(handle), [])
+    tmp_target = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp_target, ignore_errors=True)
+    if not header:
+        shutil.rmtree(target, ignore_errors=True)
+        return 0
+
+    partition_field = next((field for field in partition_fields if field in header), None)
+    if partition_field:
+        column = '"' + partition_field.replace('"', '""') + '"'
+        year = (
+            f"CASE WHEN regexp_matches(coalesce({column}, ''), '^[0-9]{{4}}')"
+            f" THEN substr({column}, 1, 4) ELSE 'unknown' END"
+        )
+    else:
+        year = "'unknown'"
+    source = "'" + str(csv_path).replace("'", "''") + "'"
+    destination = "'" + str(tmp_target).replace("'", "''") + "'"
+    tmp_target.parent.mkdir(parents=True, exist_ok=True)
+    with duckdb.connect() as connection:
+        connection.execute(
+            f"COPY (SELECT *, {year} AS partition_year"
+            f" FROM read_csv({source}, header = true, all_varchar = true))"
+            f" TO {destination} (FORMAT PARQUET, PARTITION_BY (partition_year))"
+        )
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp_target, target)
+    return sum(1 for _path in target.rglob("*.parquet"))
+
+
 def open_source(path_or_url: str):
     path = Path(path_or_url)
     if path.is_file():
@@ -350,82 +710,742 @@ def sort_key(row: dict) -> tuple:
     return (date_value or datetime.max, category, entity.lower())
 
 
-def write_outputs(output_dir: Path, rows: list[dict], summary: dict) -> tuple[Path, Path]:
-    output_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-    csv_path = output_dir / f"filtered-{timestamp}.csv"
-    json_path = output_dir / f"summary-{timestamp}.json"
-
-    if not rows:
-        fieldnames = []
-    else:
-        fieldnames = list(rows[0].keys())
+class RowSorter:
+    # Sorts output rows by sort_key, computed once per row, with the feed
+    # position as tie-breaker (the order a stable in-memory sort gives).
+    # Past buffer_rows the sorted buffer is spilled to a temporary run file;
+    # iteration then merges the runs, so memory stays bounded by one buffer.
+    def __init__(self, buffer_rows: int = SORT_BUFFER_ROWS) -> None:
+        self.buffer_rows = max(1, buffer_rows)
+        self.count = 0
+        self._buffer: list[tuple] = []
+        self._sorted = True
+        self._runs: list[Path] = []
+        self._spill_dir: str | None = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def spilled_runs(self) -> int:
+        return len(self._runs)
+
+    def add(self, row: dict, position: int, change: str = "") -> None:
+        self._buffer.append((sort_key(row), position, change, row))
+        self._sorted = False
+        self.count += 1
+        if len(self._buffer) >= self.buffer_rows:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="canadabuys-sort-")
+        self._buffer.sort(key=lambda item: item[:2])
+        path = Path(self._spill_dir) / f"run-{len(self._runs):05d}.pickle"
+        with path.open("wb") as handle:
+            for item in self._buffer:
+                pickle.dump(item, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self._runs.append(path)
+        self._buffer = []
+
+    @staticmethod
+    def _read_run(path: Path):
+        with path.open("rb") as handle:
+            while True:
+                try:
+                    yield pickle.load(handle)
+                except EOFError:
+                    return
+
+    def __iter__(self):
+        # Yields (row, change) in sorted order; safe to iterate more than once.
+        if not self._sorted:
+            self._buffer.sort(key=lambda item: item[:2])
+            self._sorted = True
+        if not self._runs:
+            items = iter(self._buffer)
+        else:
+            items = heapq.merge(
+                *(self._read_run(path) for path in self._runs),
+                self._buffer,
+                key=lambda item: item[:2],
+            )
+        for _key, _position, change, row in items:
+            yield row, change
+
+    def close(self) -> None:
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+        self._runs = []
+        self._buffer = []
+
+
+class CsvStream:
+    # DictWriter whose header comes from the first row written.
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rows = 0
+        self._handle = path.open("w", encoding="utf-8", newline="")
+        self._writer: csv.DictWriter | None = None
+
+    def write(self, row: dict) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._handle, fieldnames=list(row.keys()))
+            self._writer.writeheader()
+        self._writer.writerow(row)
+        self.rows += 1
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        if self._writer is None:
+            csv.DictWriter(self._handle, fieldnames=[]).writeheader()
+        self._handle.close()
+
+
+def publish_latest(path: Path, latest: Path) -> None:
+    # Point latest.* at the finished file in one step: hard link when the
+    # filesystem allows it, otherwise a copy, then an atomic rename.
+    tmp_path = latest.with_name(latest.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    try:
+        os.link(path, tmp_path)
+    except OSError:
+        shutil.copyfile(path, tmp_path)
+    os.replace(tmp_path, latest)
 
-    with csv_path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
 
-    with json_path.open("w", encoding="utf-8") as handle:
-        json.dump(summary, handle, indent=2, sort_keys=True)
+def markdown_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
 
-    latest_csv = output_dir / "latest.csv"
-    latest_json = output_dir / "latest.json"
-    latest_csv.write_bytes(csv_path.read_bytes())
-    latest_json.write_bytes(json_path.read_bytes())
 
-    return csv_path, json_path
+def project_entry(project_id: str, row: dict, digest: str) -> dict:
+    return {
+        "id": project_id,
+        "file": f"{project_id}.md",
+        "digest": digest,
+        "title": row.get("title-titre-eng", "").strip() or row.get("title-titre-fra", "").strip(),
+        "reference": row.get("referenceNumber-numeroReference", ""),
+        "closing_date": row.get(SORT_DATE_FIELD, ""),
+        "entity": row.get(SORT_ENTITY_FIELD_EN, ""),
+        "industries": row.get("match_industries", ""),
+    }
 
 
-def write_project_markdowns(output_dir: Path, rows: list[dict]) -> int:
-    projects_dir = output_dir / "projects"
-    projects_dir.mkdir(parents=True, exist_ok=True)
-    count = 0
-    for index, row in enumerate(rows, start=1):
-        project_id = select_project_id(row, index)
-        filename = f"{project_id}.md"
-        path = projects_dir / filename
-        content = render_project_markdown(row)
-        path.write_text(content, encoding="utf-8")
-        count += 1
-    return count
+def write_json_atomic(path: Path, payload) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class ProjectMarkdown:
+    # Renders project markdown on a thread pool. A file is rewritten only when
+    # its content hash differs from the previous manifest.json; the manifest
+    # lists every project of the run in output order. With mode "archive" or
+    # "both" the markdown is also packed into projects.zip.
+    def __init__(self, projects_dir: Path, mode: str = "files", workers: int = MARKDOWN_WORKERS) -> None:
+        self.projects_dir = projects_dir
+        self.manifest_path = projects_dir / PROJECT_MANIFEST_FILENAME
+        self.archive_path = projects_dir.parent / PROJECT_ARCHIVE_FILENAME if mode != "files" else None
+        self.write_files = mode != "archive"
+        self.previous: dict[str, dict] = {}
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            self.previous = {entry["id"]: entry for entry in manifest.get("projects", [])}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.previous = {}
+        self.projects: list[dict] = []
+        self.written = 0
+        self._workers = max(1, workers)
+        self._pool = ThreadPoolExecutor(max_workers=self._workers) if self._workers > 1 else None
+        self._pending: deque = deque()
+        self._in_flight: set[str] = set()
+        self._archive = None
+        if self.archive_path is not None:
+            self._archive = zipfile.ZipFile(
+                self.archive_path.with_name(self.archive_path.name + ".tmp"), "w", zipfile.ZIP_DEFLATED
+            )
+
+    def add(self, project_id: str, row: dict, changed: bool = True) -> None:
+        previous = self.previous.get(project_id)
+        path = self.projects_dir / f"{project_id}.md"
+        unchanged = not changed and self._archive is None and previous is not None and path.exists()
+        if self._pool is None:
+            self._store((previous, "", False) if unchanged else self._render(project_id, row))
+            return
+        # Two rows with the same project id must be written in order.
+        if project_id in self._in_flight:
+            self._drain(0)
+        self._in_flight.add(project_id)
+        if unchanged:
+            # Queue behind pending renders so the manifest keeps output order.
+            future: Future = Future()
+            future.set_result((previous, "", False))
+        else:
+            future = self._pool.submit(self._render, project_id, row)
+        self._pending.append(future)
+        self._drain(self._workers * 4)
+
+    def _render(self, project_id: str, row: dict) -> tuple[dict, str, bool]:
+        text = render_project_markdown(row)
+        entry = project_entry(project_id, row, markdown_digest(text))
+        wrote = False
+        if self.write_files:
+            path = self.projects_dir / entry["file"]
+            previous = self.previous.get(project_id)
+            if previous is None or previous.get("digest") != entry["digest"] or not path.exists():
+                path.write_text(text, encoding="utf-8")
+                wrote = True
+        return entry, text, wrote
+
+    def _store(self, result: tuple[dict, str, bool]) -> None:
+        entry, text, wrote = result
+        self.projects.append(entry)
+        self.written += wrote
+        if self._archive is not None:
+            # Fixed timestamps keep the archive identical across runs.
+            self._archive.writestr(zipfile.ZipInfo(entry["file"], date_time=(1980, 1, 1, 0, 0, 0)), text)
+
+    def _drain(self, keep: int) -> None:
+        while len(self._pending) > keep:
+            result = self._pending.popleft().result()
+            self._in_flight.discard(result[0]["id"])
+            self._store(result)
+
+    def finish(self) -> None:
+        self._drain(0)
+        if self._archive is not None:
+            self._archive.close()
+            os.replace(self._archive.filename, self.archive_path)
+            self._archive = None
+        self.close()
+        write_json_atomic(self.manifest_path, {"count": len(self.projects), "projects": self.projects})
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._archive is not None:
+            # Interrupted run: drop the partial archive, keep the old one.
+            self._archive.close()
+            Path(self._archive.filename).unlink()
+            self._archive = None
+
+
+class RunOutputs:
+    # Timestamped CSV/summary (and delta CSV) written row by row, plus the
+    # per-project markdown; finish() publishes them as latest.*.
+    def __init__(
+        self,
+        output_dir: Path,
+        delta: bool = False,
+        markdown_mode: str = "files",
+        markdown_workers: int = MARKDOWN_WORKERS,
+    ) -> None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        self.run_id = timestamp
+        self.output_dir = output_dir
+        self.csv_path = output_dir / f"filtered-{timestamp}.csv"
+        self.json_path = output_dir / f"summary-{timestamp}.json"
+        self.projects_dir = output_dir / "projects"
+        self.projects_dir.mkdir(parents=True, exist_ok=True)
+        self.markdown = ProjectMarkdown(self.projects_dir, markdown_mode, markdown_workers)
+        self.rows = CsvStream(self.csv_path)
+        self.delta = CsvStream(output_dir / f"delta-{timestamp}.csv") if delta else None
+
+    def write_row(self, row: dict) -> None:
+        self.rows.write(row)
+
+    def write_delta(self, row: dict, change: str) -> None:
+        self.delta.write({"change": change, **row})
+
+    @property
+    def markdown_written(self) -> int:
+        return self.markdown.written
+
+    def write_markdown(self, project_id: str, row: dict, changed: bool = True) -> None:
+        self.markdown.add(project_id, row, changed)
+
+    def close(self) -> None:
+        self.markdown.close()
+        self.rows.close()
+        if self.delta is not None:
+            self.delta.close()
+
+    def finish(self, summary: dict) -> tuple[Path, Path]:
+        self.close()
+        with self.json_path.open("w", encoding="utf-8") as handle:
+            json.dump(summary, handle, indent=2, sort_keys=True)
+        publish_latest(self.csv_path, self.output_dir / "latest.csv")
+        publish_latest(self.json_path, self.output_dir / "latest.json")
+        if self.delta is not None:
+            publish_latest(self.delta.path, self.output_dir / "latest-delta.csv")
+        return self.csv_path, self.json_path
+
+    def discard_timestamped(self) -> tuple[Path, Path]:
+        # The run now lives in the notice store; keep only latest.*.
+        for path in (self.csv_path, self.json_path, self.delta.path if self.delta else None):
+            if path is not None and path.exists():
+                path.unlink()
+        return self.output_dir / "latest.csv", self.output_dir / "latest.json"
+
+
+class HostLimiter:
+    def __init__(self, per_host: int) -> None:
+        self.per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+
+    def __call__(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.per_host)
+            return self._semaphores[host]
+
+
+class Progress:
+    def __init__(self, label: str, total: int) -> None:
+        self.label = label
+        self.total = total
+        self.done = 0
+        self._lock = threading.Lock()
+        self._last_report = time.monotonic()
+
+    def advance(self) -> None:
+        with self._lock:
+            self.done += 1
+            now = time.monotonic()
+            finished = bool(self.total) and self.done >= self.total
+            if not finished and now - self._last_report < PROGRESS_INTERVAL_SECONDS:
+                return
+            self._last_report = now
+            self._report()
+
+    def finish(self) -> None:
+        with self._lock:
+            if self.done < self.total or not self.total:
+                self._report()
+
+    def _report(self) -> None:
+        total = f"/{self.total}" if self.total else ""
+        print(f"{self.label}: {self.done}{total}", file=sys.stderr, flush=True)
+
+
+class AttachmentState:
+    def __init__(self, path: Path, recheck_seconds: float) -> None:
+        self.path = path
+        self.recheck_seconds = recheck_seconds
+        self.entries: dict[str, dict] = {}
+        self.check_hits = 0
+        self.download_hits = 0
+        self._validated: set[str] = set()
+        self._lock = threading.Lock()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        urls = data.get("urls", {}) if isinstance(data, dict) else {}
+        if isinstance(urls, dict):
+            self.entries = {url: entry for url, entry in urls.items() if isinstance(entry, dict)}
+
+    def get(self, url: str) -> dict:
+        with self._lock:
+            return dict(self.entries.get(url, {}))
+
+    def is_fresh(self, entry: dict) -> bool:
+        return bool(entry) and time.time() - float(entry.get("checked_at", 0)) < self.recheck_seconds
+
+    def is_current(self, url: str, entry: dict) -> bool:
+        # Fresh, or already confirmed unchanged by this run's HEAD check.
+        with self._lock:
+            validated = url in self._validated
+        return validated or self.is_fresh(entry)
+
+    def conditional_headers(self, entry: dict) -> dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def cached_file(self, url: str) -> Path | None:
+        entry = self.get(url)
+        if not entry.get("path") or not entry.get("sha256"):
+            return None
+        path = Path(entry["path"])
+        try:
+            if path.stat().st_size != entry.get("size"):
+                return None
+        except OSError:
+            return None
+        return path
+
+    def record(self, url: str, status: int | None, headers=None) -> None:
+        etag = (headers.get("ETag") or "") if headers is not None else ""
+        last_modified = (headers.get("Last-Modified") or "") if headers is not None else ""
+        length = (headers.get("Content-Length") or "") if headers is not None else ""
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            changed = (
+                status != 200
+                or not (etag or last_modified or length)
+                or (etag and etag != entry.get("etag"))
+                or (last_modified and last_modified != entry.get("last_modified"))
+                or (length.isdigit() and entry.get("content_length") not in (None, int(length)))
+            )
+            if changed:
+                for key in ("sha256", "path", "size"):
+                    entry.pop(key, None)
+                self._validated.discard(url)
+            else:
+                self._validated.add(url)
+            entry["status"] = status
+            if etag:
+                entry["etag"] = etag
+            if last_modified:
+                entry["last_modified"] = last_modified
+            if length.isdigit():
+                entry["content_length"] = int(length)
+            entry["checked_at"] = time.time()
+            entry["checked_utc"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def revalidated(self, url: str, kind: str, answered: bool = False) -> None:
+        # Only a server answer (304) restarts the recheck window; a fresh
+        # cache hit made no request and must not keep the entry young.
+        with self._lock:
+            self._validated.add(url)
+            entry = self.entries.setdefault(url, {})
+            if answered:
+                entry["checked_at"] = time.time()
+                entry["checked_utc"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+            if kind == "check":
+                self.check_hits += 1
+            else:
+                self.download_hits += 1
+
+    def record_partial(self, url: str, validator: str) -> None:
+        # Lets a later run resume the .part with If-Range.
+        with self._lock:
+            self.entries.setdefault(url, {})["partial_validator"] = validator
+
+    def record_download(self, url: str, path: Path, headers) -> None:
+        digest = hashlib.sha256()
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(DOWNLOAD_CHUNK_BYTES), b""):
+                digest.update(chunk)
+        self.record(url, 200, headers)
+        with self._lock:
+            entry = self.entries[url]
+            entry.pop("partial_validator", None)
+            entry["sha256"] = digest.hexdigest()
+            entry["path"] = str(path.resolve())
+            entry["size"] = path.stat().st_size
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = json.dumps({"version": 1, "urls": self.entries}, indent=2, sort_keys=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def notice_key(row: dict) -> str:
+    reference = (
+        row.get("referenceNumber-numeroReference", "").strip()
+        or row.get("solicitationNumber-numeroSollicitation", "").strip()
+    )
+    if not reference:
+        return "row:" + row_digest(row)
+    return f"{reference}#{row.get('amendmentNumber-numeroModification', '').strip()}"
 
 
-def head_status(url: str, timeout: int) -> int | None:
-    request = build_request(url, method="HEAD")
-    try:
-        with urlopen(request, timeout=timeout) as response:
-            return response.status
-    except Exception as exc:
-        code = getattr(getattr(exc, "code", None), "value", None)
-        if code is None:
-            code = getattr(exc, "code", None)
-        return code
-
-
-def check_attachment_urls(urls: list[str], timeout: int, limit: int) -> dict[str, int | None]:
-    status_map: dict[str, int | None] = {}
-    for index, url in enumerate(urls, start=1):
-        if limit and index > limit:
-            break
-        status_map[url] = head_status(url, timeout)
-    return status_map
+def row_digest(row: dict) -> str:
+    text = "\x1f".join(f"{field}\x1e{value}" for field, value in row.items())
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
 
 
-def download_attachment(url: str, destination: Path, timeout: int) -> bool:
-    request = build_request(url, method="GET")
-    try:
-        with urlopen(request, timeout=timeout) as response:
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            with destination.open("wb") as handle:
-                while True:
-                    chunk = response.read(1024 * 64)
-                    if not chunk:
-                        break
-                    handle.write(chunk)
+def rules_fingerprint(config: dict, source_url: str) -> str:
+    rules = {
+        "version": PIPELINE_STATE_VERSION,
+        "source": source_url,
+        "filters": config.get("filters", {}),
+        "industries": config.get("industries", {}),
+        "datasets": config.get("datasets", {}),
+    }
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class PipelineState:
+    # Per-notice results of the previous run, keyed by reference number plus
+    # amendment number. A stored entry is reused only while the raw row hash
+    # and the rules fingerprint (config + source) are unchanged.
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self.previous: dict[str, dict] = {}
+        self.entries: dict[str, dict] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if isinstance(data, dict) and data.get("rules") == fingerprint:
+            notices = data.get("notices", {})
+            if isinstance(notices, dict):
+                self.previous = {key: entry for key, entry in notices.items() if isinstance(entry, dict)}
+
+    def unchanged(self, key: str, digest: str) -> dict | None:
+        entry = self.previous.get(key)
+        if entry is None or entry.get("row") != digest:
+            return None
+        self.entries[key] = dict(entry)
+        return entry
+
+    def change(self, key: str) -> str:
+        return "changed" if key in self.previous else "new"
+
+    def record(self, key: str, digest: str, output_row: dict | None) -> None:
+        match = {column: output_row[column] for column in MATCH_COLUMNS} if output_row else None
+        self.entries[key] = {"row": digest, "match": match}
+
+    def output_changed(self, key: str, digest: str) -> bool:
+        previous = self.previous.get(key, {}).get("output")
+        self.entries.setdefault(key, {})["output"] = digest
+        return previous != digest
+
+    def removed(self) -> int:
+        matched_before = {key for key, entry in self.previous.items() if entry.get("match")}
+        matched_now = {key for key, entry in self.entries.items() if entry.get("match")}
+        return len(matched_before - matched_now)
+
+    def save(self, keep_unseen: bool = False) -> None:
+        notices = dict(self.previous) if keep_unseen else {}
+        notices.update(self.entries)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(
+            {"version": PIPELINE_STATE_VERSION, "rules": self.fingerprint, "notices": notices},
+            sort_keys=True,
+        )
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def retry_delay(attempt: int) -> float:
+    return min(MAX_RETRY_BACKOFF_SECONDS, RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+
+
+def is_retryable_status(status: int | None) -> bool:
+    return status is None or status >= 500
+
+
+def head_request(url: str, timeout: int, retries: int = 0, extra_headers: dict | None = None) -> tuple:
+    status = None
+    headers = None
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(retry_delay(attempt))
+        request = build_request(url, method="HEAD")
+        for name, value in (extra_headers or {}).items():
+            request.add_header(name, value)
+        try:
+            with urlopen(request, timeout=timeout) as response:
+                return response.status, response.headers
+        except Exception as exc:
+            code = getattr(getattr(exc, "code", None), "value", None)
+            if code is None:
+                code = getattr(exc, "code", None)
+            status = code
+            headers = getattr(exc, "headers", None)
+        if not is_retryable_status(status):
+            break
+    return status, headers
+
+
+def head_status(url: str, timeout: int, retries: int = 0) -> int | None:
+    return head_request(url, timeout, retries)[0]
+
+
+def check_attachment_urls(
+    urls: list[str],
+    timeout: int,
+    limit: int,
+    concurrency: int = 1,
+    per_host: int = 4,
+    retries: int = 0,
+    state: AttachmentState | None = None,
+) -> dict[str, int | None]:
+    selected = urls[:limit] if limit else list(urls)
+    host_slot = HostLimiter(per_host)
+    progress = Progress("Checked attachment URLs", len(selected))
+
+    def check(url: str) -> int | None:
+        entry = state.get(url) if state else {}
+        if entry.get("status") in CACHEABLE_STATUSES and state.is_fresh(entry):
+            state.revalidated(url, "check")
+            progress.advance()
+            return entry["status"]
+        conditional = state.conditional_headers(entry) if entry.get("status") == 200 else None
+        with host_slot(url):
+            status, headers = head_request(url, timeout, retries, conditional)
+        if state and status == 304:
+            state.revalidated(url, "check", answered=True)
+            status = 200
+        elif state and not is_retryable_status(status):
+            # Timeouts and 5xx say nothing about the file; keep what is stored.
+            state.record(url, status, headers)
+        progress.advance()
+        return status
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        statuses = list(pool.map(check, selected))
+    progress.finish()
+    return dict(zip(selected, statuses))
+
+
+def reuse_cached_file(cached: Path, destination: Path) -> bool:
+    if cached.resolve() == destination.resolve():
         return True
-    except Exception:
+    partial = destination.with_name(destination.name + ".part")
+    try:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached, partial)
+        os.replace(partial, destination)
+    except OSError:
         return False
+    return True
+
+
+def range_validator(etag: str | None, last_modified: str | None) -> str:
+    # If-Range needs a strong validator; a weak ETag can't vouch for bytes.
+    if etag and not etag.startswith("W/"):
+        return etag
+    return last_modified or ""
+
+
+def download_attachment(
+    url: str,
+    destination: Path,
+    timeout: int,
+    retries: int = 0,
+    state: AttachmentState | None = None,
+) -> bool:
+    entry = state.get(url) if state else {}
+    cached = state.cached_file(url) if state else None
+    if cached is not None and state.is_current(url, entry) and reuse_cached_file(cached, destination):
+        state.revalidated(url, "download")
+        return True
+    partial = destination.with_name(destination.name + ".part")
+    # The validator of the file the .part holds: from the response that began
+    # it in this call, else as recorded by the run that left it behind.
+    validator = entry.get("partial_validator", "")
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(retry_delay(attempt))
+        offset = partial.stat().st_size if partial.exists() else 0
+        if offset and not validator:
+            # Without If-Range a changed file would be spliced onto the old bytes.
+            partial.unlink()
+            offset = 0
+        request = build_request(url, method="GET")
+        if offset:
+            request.add_header("Range", f"bytes={offset}-")
+            # Resume only if the file is unchanged; otherwise the server sends it whole.
+            request.add_header("If-Range", validator)
+        elif cached is not None:
+            for name, value in state.conditional_headers(entry).items():
+                request.add_header(name, value)
+        try:
+            with urlopen(request, timeout=timeout) as response:
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                # A server that ignores Range answers 200 with the whole file.
+                mode = "ab" if offset and response.status == 206 else "wb"
+                if mode == "wb":
+                    validator = range_validator(response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                received = 0
+                with partial.open(mode) as handle:
+                    while True:
+                        chunk = response.read(DOWNLOAD_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        handle.write(chunk)
+                        received += len(chunk)
+                headers = response.headers
+                # A dropped connection just ends the body early; keep the .part.
+                expected = headers.get("Content-Length") or ""
+                if expected.isdigit() and received < int(expected):
+                    raise ConnectionError(f"{url}: got {received} of {expected} bytes")
+            os.replace(partial, destination)
+            if state:
+                state.record_download(url, destination, headers)
+            return True
+        except HTTPError as exc:
+            if exc.code == 304 and cached is not None and reuse_cached_file(cached, destination):
+                state.revalidated(url, "download", answered=True)
+                return True
+            if exc.code == 416 and offset:
+                partial.unlink(missing_ok=True)
+                continue
+            if not is_retryable_status(exc.code):
+                return False
+        except (URLError, TimeoutError, ConnectionError):
+            continue
+    if state and validator and partial.exists():
+        state.record_partial(url, validator)
+    return False
+
+
+def download_attachment_jobs(
+    jobs: list[tuple[str, Path]],
+    timeout: int,
+    limit: int,
+    concurrency: int = 1,
+    per_host: int = 4,
+    retries: int = 0,
+    state: AttachmentState | None = None,
+) -> list[bool | None]:
+    # Jobs start in order and only while the successes so far plus those in
+    # flight are below the limit, so exactly the jobs a serial run would try
+    # are attempted (None marks a job that was never started).
+    outcomes: list[bool | None] = [None] * len(jobs)
+    host_slot = HostLimiter(per_host)
+    # With a limit the number of attempts is not known up front.
+    progress = Progress("Attachment downloads finished", 0 if limit else len(jobs))
+    condition = threading.Condition()
+    counts = {"ok": 0, "in_flight": 0}
+    destination_locks: dict[Path, threading.Lock] = {}
+
+    def run(index: int, url: str, destination: Path) -> None:
+        try:
+            with destination_locks[destination], host_slot(url):
+                ok = download_attachment(url, destination, timeout, retries, state)
+        except Exception:
+            ok = False
+        with condition:
+            outcomes[index] = ok
+            counts["in_flight"] -= 1
+            counts["ok"] += int(ok)
+            condition.notify_all()
+        progress.advance()
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for index, (url, destination) in enumerate(jobs):
+            with condition:
+                while limit and counts["in_flight"] and counts["ok"] + counts["in_flight"] >= limit:
+                    condition.wait()
+                if limit and counts["ok"] >= limit:
+                    break
+                counts["in_flight"] += 1
+                destination_locks.setdefault(destination, threading.Lock())
+            pool.submit(run, index, url, destination)
+    progress.finish()
+    return outcomes
 
 
 def run_pipeline(
@@ -438,6 +1458,21 @@ def run_pipeline(
     attachment_timeout: int,
     download_attachments: bool,
     download_limit: int,
+    attachment_concurrency: int = 1,
+    attachment_host_limit: int = 4,
+    attachment_retries: int = 0,
+    attachment_state: bool = False,
+    attachment_recheck_hours: float = DEFAULT_RECHECK_HOURS,
+    workers: int = 1,
+    classify_batch_rows: int = CLASSIFY_BATCH_ROWS,
+    incremental: bool = False,
+    sort_buffer_rows: int = SORT_BUFFER_ROWS,
+    ckan_resource: str = "",
+    source_recheck_hours: float = DEFAULT_SOURCE_RECHECK_HOURS,
+    parquet: bool = False,
+    store: bool = False,
+    markdown_mode: str = "files",
+    markdown_workers: int = MARKDOWN_WORKERS,
 ) -> tuple[Path, Path]:
     config = load_config(config_path)
     regions = config.get("filters", {}).get("regions", [])
@@ -445,10 +1480,20 @@ def run_pipeline(
         industry: data.get("keywords", [])
         for industry, data in config.get("industries", {}).items()
     }
-    rules = build_code_rules(config)
+    code_rules = build_code_rules(config)
+    dataset = config.get("datasets", {}).get(source, {})
     source_url = resolve_source(config, source)
+    output_root = build_output_dir(output_dir)
+
+    source_path = source_url
+    resource = None
+    if is_ckan_package(source_url):
+        resource = select_ckan_resource(fetch_ckan_package(source_url, attachment_timeout), ckan_resource)
+        source_url = resource["url"]
+        source_path = str(
+            download_source(source_url, output_root, attachment_timeout, attachment_retries, source_recheck_hours)
+        )
 
-    results = []
     summary = {
         "source": source_url,
         "regions": regions,
@@ -463,139 +1508,223 @@ def run_pipeline(
         "attachment_urls_other": 0,
         "attachment_download_attempted": 0,
         "attachment_downloaded": 0,
+        "attachment_check_cached": 0,
+        "attachment_download_cached": 0,
     }
-
-    with open_source(source_url) as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            summary["processed_total"] += 1
-            if max_rows and summary["processed_total"] > max_rows:
-                break
-
-            region_matches = match_regions(row, regions)
-            if not region_matches:
+    if resource is not None:
+        summary["ckan_resource"] = resource.get("name") or resource.get("id") or ""
+        summary["source_file"] = source_path
+
+    pipeline_state = None
+    if incremental:
+        pipeline_state = PipelineState(
+            output_root / PIPELINE_STATE_FILENAME,
+            rules_fingerprint(config, source_url),
+        )
+    changes: dict[str, int] = {"new": 0, "changed": 0, "unchanged": 0}
+    results = RowSorter(sort_buffer_rows)
+    attachment_urls_seen: set[str] = set()
+    queued: deque = deque()
+
+    def add_result(output_row: dict, position: int, change: str = "") -> None:
+        count_match(summary, output_row)
+        attachment_urls_seen.update(url for url in output_row["attachment_urls"].split(";") if url.strip())
+        results.add(output_row, position, change)
+
+    def rows_to_classify(rows):
+        for position, row in enumerate(rows):
+            if pipeline_state is None:
+                queued.append((position, None, None))
+                yield row
                 continue
-
-            unspsc_codes = extract_unspsc_codes(row.get("unspsc", ""))
-            unspsc_hits = match_unspsc(unspsc_codes, rules)
-            keyword_hits = match_keywords(row, keyword_map)
-
-            if not unspsc_hits and not keyword_hits:
+            key = notice_key(row)
+            digest = row_digest(row)
+            entry = pipeline_state.unchanged(key, digest)
+            if entry is not None:
+                changes["unchanged"] += 1
+                if entry.get("match"):
+                    add_result(build_output_row(row, entry["match"]), position)
                 continue
+            queued.append((position, key, digest))
+            yield row
 
-            match_industries = set()
-            match_codes = set()
-            match_categories = set()
-            match_sources = set()
-            matched_keywords = set()
-
-            if unspsc_hits:
-                match_sources.add("unspsc")
-                summary["match_sources"]["unspsc"] += 1
-                for hit in unspsc_hits:
-                    match_industries.add(hit["industry"])
-                    match_codes.add(hit["code"])
-                    match_categories.add(f"{hit['industry']}:{hit['category']}")
-
-            if keyword_hits:
-                match_sources.add("keyword")
-                summary["match_sources"]["keyword"] += 1
-                for industry, keywords in keyword_hits.items():
-                    match_industries.add(industry)
-                    matched_keywords.update(keywords)
-
-            for industry in match_industries:
-                summary["industry_counts"][industry] = summary["industry_counts"].get(industry, 0) + 1
-
-            output_row = dict(row)
-            output_row["match_regions"] = ";".join(sorted(region_matches))
-            output_row["match_industries"] = ";".join(sorted(match_industries))
-            output_row["match_codes"] = ";".join(sorted(match_codes))
-            output_row["match_categories"] = ";".join(sorted(match_categories))
-            output_row["match_sources"] = ";".join(sorted(match_sources))
-            output_row["match_keywords"] = ";".join(sorted(matched_keywords))
-            attachments = parse_attachment_urls(row)
-            output_row["attachment_urls"] = ";".join(attachments)
-            output_row["attachment_working"] = ""
-            output_row["attachment_missing"] = ""
-            output_row["attachment_unchecked"] = ""
-            output_row["attachment_downloaded"] = ""
-
-            results.append(output_row)
-            summary["matched_total"] += 1
-
-    results.sort(key=sort_key)
-
-    summary["output_rows"] = len(results)
-    summary["generated_at_utc"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-
-    attachment_urls: list[str] = []
-    if results:
-        seen = set()
-        for row in results:
-            urls = [u for u in row.get("attachment_urls", "").split(";") if u.strip()]
-            for url in urls:
-                if url in seen:
+    try:
+        with open_source(source_path) as handle:
+            reader = csv.DictReader(handle)
+            header = reader.fieldnames or []
+            row_classifier = RowClassifier(
+                regions,
+                keyword_map,
+                code_rules,
+                region_fields=resolve_fields(
+                    header, dataset.get("region_fields", REGION_FIELDS), REGION_FIELD_KEYWORDS
+                ),
+                text_fields=resolve_fields(header, dataset.get("text_fields", TEXT_FIELDS), TEXT_FIELD_KEYWORDS),
+            )
+            rows = read_rows(reader, summary, max_rows)
+            for output_row in classify_rows(rows_to_classify(rows), row_classifier, workers, classify_batch_rows):
+                position, key, digest = queued.popleft()
+                change = ""
+                if pipeline_state is not None:
+                    change = pipeline_state.change(key)
+                    changes[change] += 1
+                    pipeline_state.record(key, digest, output_row)
+                if output_row is not None:
+                    add_result(output_row, position, change)
+
+        summary["output_rows"] = len(results)
+        summary["generated_at_utc"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        summary["attachment_urls_total"] = len(attachment_urls_seen)
+
+        attachment_urls: list[str] = []
+        if attachment_urls_seen and (check_attachments or download_attachments):
+            seen = set()
+            for row, _change in results:
+                for url in row.get("attachment_urls", "").split(";"):
+                    if url.strip() and url not in seen:
+                        seen.add(url)
+                        attachment_urls.append(url)
+
+        state = None
+        if attachment_state and (check_attachments or download_attachments):
+            state = AttachmentState(
+                output_root / ATTACHMENT_STATE_FILENAME,
+                attachment_recheck_hours * 3600,
+            )
+
+        status_map: dict[str, int | None] = {}
+        if check_attachments and attachment_urls:
+            status_map = check_attachment_urls(
+                attachment_urls,
+                attachment_timeout,
+                attachment_check_limit,
+                concurrency=attachment_concurrency,
+                per_host=attachment_host_limit,
+                retries=attachment_retries,
+                state=state,
+            )
+            summary["attachment_urls_checked"] = len(status_map)
+            summary["attachment_urls_ok"] = sum(1 for status in status_map.values() if status == 200)
+            summary["attachment_urls_missing"] = sum(1 for status in status_map.values() if status == 404)
+            summary["attachment_urls_other"] = sum(
+                1 for status in status_map.values() if status not in (200, 404)
+            )
+
+        downloaded: dict[int, list[str]] = {}
+        if download_attachments and attachment_urls:
+            jobs: list[tuple[str, Path]] = []
+            job_rows: list[int] = []
+            for index, (row, _change) in enumerate(results, start=1):
+                project_id = select_project_id(row, index)
+                urls = [u for u in row.get("attachment_urls", "").split(";") if u.strip()]
+                if not urls:
                     continue
-                seen.add(url)
-                attachment_urls.append(url)
-    summary["attachment_urls_total"] = len(attachment_urls)
-
-    status_map: dict[str, int | None] = {}
-    if check_attachments and attachment_urls:
-        status_map = check_attachment_urls(attachment_urls, attachment_timeout, attachment_check_limit)
-        summary["attachment_urls_checked"] = len(status_map)
-        summary["attachment_urls_ok"] = sum(1 for status in status_map.values() if status == 200)
-        summary["attachment_urls_missing"] = sum(1 for status in status_map.values() if status == 404)
-        summary["attachment_urls_other"] = sum(
-            1 for status in status_map.values() if status not in (200, 404)
-        )
-
-    download_remaining = download_limit if download_limit else None
-    if download_attachments and attachment_urls:
-        output_root = build_output_dir(output_dir)
-        for index, row in enumerate(results, start=1):
-            project_id = select_project_id(row, index)
-            urls = [u for u in row.get("attachment_urls", "").split(";") if u.strip()]
-            if not urls:
-                continue
-            downloaded = []
-            for url in urls:
-                if download_remaining is not None and download_remaining <= 0:
-                    break
-                status = status_map.get(url)
-                if status not in (None, 200):
+                for url in urls:
+                    status = status_map.get(url)
+                    if status not in (None, 200):
+                        continue
+                    filename = sanitize_filename(filename_from_url(url))
+                    if not filename:
+                        filename = "document"
+                    jobs.append((url, output_root / "attachments" / project_id / filename))
+                    job_rows.append(index)
+            outcomes = download_attachment_jobs(
+                jobs,
+                attachment_timeout,
+                download_limit,
+                concurrency=attachment_concurrency,
+                per_host=attachment_host_limit,
+                retries=attachment_retries,
+                state=state,
+            )
+            for (url, _destination), index, outcome in zip(jobs, job_rows, outcomes):
+                if outcome is None:
                     continue
-                filename = sanitize_filename(filename_from_url(url))
-                if not filename:
-                    filename = "document"
-                destination = output_root / "attachments" / project_id / filename
                 summary["attachment_download_attempted"] += 1
-                if download_attachment(url, destination, attachment_timeout):
+                if outcome:
                     summary["attachment_downloaded"] += 1
-                    downloaded.append(url)
-                    if download_remaining is not None:
-                        download_remaining -= 1
-            row["attachment_downloaded"] = ";".join(downloaded)
-
-    if status_map:
-        for row in results:
-            urls = [u for u in row.get("attachment_urls", "").split(";") if u.strip()]
-            working = [u for u in urls if status_map.get(u) == 200]
-            missing = [u for u in urls if status_map.get(u) == 404]
-            unchecked = [
-                u
-                for u in urls
-                if status_map.get(u) not in (200, 404)
-            ]
-            row["attachment_working"] = ";".join(working)
-            row["attachment_missing"] = ";".join(missing)
-            row["attachment_unchecked"] = ";".join(unchecked)
-
-    output_root = build_output_dir(output_dir)
-    summary["markdown_count"] = write_project_markdowns(output_root, results)
-    summary["markdown_dir"] = str((output_root / "projects").resolve())
-    csv_path, json_path = write_outputs(output_root, results, summary)
+                    downloaded.setdefault(index, []).append(url)
+
+        if state:
+            summary["attachment_check_cached"] = state.check_hits
+            summary["attachment_download_cached"] = state.download_hits
+            state.save()
+
+        # Single streaming pass: fill the attachment columns, then write each
+        # row to the CSV (and delta) and its project markdown.
+        outputs = RunOutputs(
+            output_root,
+            delta=pipeline_state is not None,
+            markdown_mode=markdown_mode,
+            markdown_workers=markdown_workers,
+        )
+        try:
+            for index, (row, change) in enumerate(results, start=1):
+                if downloaded:
+                    row["attachment_downloaded"] = ";".join(downloaded.get(index, []))
+                if status_map:
+                    urls = [u for u in row.get("attachment_urls", "").split(";") if u.strip()]
+                    working = [u for u in urls if status_map.get(u) == 200]
+                    missing = [u for u in urls if status_map.get(u) == 404]
+                    unchecked = [
+                        u
+                        for u in urls
+                        if status_map.get(u) not in (200, 404)
+                    ]
+                    row["attachment_working"] = ";".join(working)
+                    row["attachment_missing"] = ";".join(missing)
+                    row["attachment_unchecked"] = ";".join(unchecked)
+
+                project_id = select_project_id(row, index)
+                markdown_changed = True
+                if pipeline_state is not None:
+                    if change:
+                        outputs.write_delta(row, change)
+                    output_digest = row_digest({"project_id": project_id, **row})
+                    markdown_changed = pipeline_state.output_changed(notice_key(row), output_digest)
+                outputs.write_markdown(project_id, row, changed=markdown_changed)
+                outputs.write_row(row)
+            outputs.markdown.finish()
+        finally:
+            outputs.close()
+
+        summary["markdown_count"] = len(results)
+        summary["markdown_dir"] = str(outputs.projects_dir.resolve())
+        summary["markdown_written"] = outputs.markdown_written
+        if outputs.markdown.archive_path is not None:
+            summary["markdown_archive"] = str(outputs.markdown.archive_path.resolve())
+        if pipeline_state is not None:
+            summary["incremental"] = {
+                **changes,
+                "removed": pipeline_state.removed(),
+                "delta_rows": outputs.delta.rows,
+                "markdown_written": outputs.markdown_written,
+            }
+        if parquet:
+            parquet_dir = output_root / "parquet" / dataset_name(config, source)
+            summary["parquet_files"] = write_parquet(
+                outputs.csv_path,
+                parquet_dir,
+                dataset.get("partition_fields", PARTITION_FIELDS),
+            )
+            summary["parquet_dir"] = str(parquet_dir)
+        if store:
+            # Only --store runs pay for importing the notice store.
+            from procurement_core.notice_store import NoticeStore
+
+            notice_store = NoticeStore(output_root)
+            summary["run_id"] = outputs.run_id
+            summary["store_path"] = str(notice_store.path)
+        csv_path, json_path = outputs.finish(summary)
+        if store:
+            notice_store.append_run(outputs.run_id, csv_path, summary)
+            csv_path, json_path = outputs.discard_timestamped()
+    finally:
+        results.close()
+
+    if pipeline_state is not None:
+        truncated = bool(max_rows) and summary["processed_total"] > max_rows
+        pipeline_state.save(keep_unseen=truncated)
     return csv_path, json_path
 
 
@@ -611,7 +1740,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--source",
         default="open",
-        help="Data source: open, new, or a URL/path to a CSV file.",
+        help="Data source: open, new, awards, contract-history, a CKAN package_show URL, "
+        "or a URL/path to a CSV file.",
     )
     parser.add_argument(
         "--output-dir",
@@ -652,6 +1782,99 @@ def parse_args() -> argparse.Namespace:
         default=10,
         help="Maximum number of attachments to download (0 = no limit).",
     )
+    parser.add_argument(
+        "--attachment-concurrency",
+        type=int,
+        default=8,
+        help="Attachment checks/downloads to run at once (1 = serial).",
+    )
+    parser.add_argument(
+        "--attachment-host-limit",
+        type=int,
+        default=4,
+        help="Maximum concurrent attachment requests to any one host.",
+    )
+    parser.add_argument(
+        "--attachment-retries",
+        type=int,
+        default=2,
+        help="Retries with backoff for attachment requests that time out or return 5xx.",
+    )
+    parser.add_argument(
+        "--attachment-recheck-hours",
+        type=float,
+        default=DEFAULT_RECHECK_HOURS,
+        help="Reuse stored attachment checks/downloads younger than this; older ones are revalidated "
+        "with conditional requests (0 = always revalidate).",
+    )
+    parser.add_argument(
+        "--no-attachment-state",
+        action="store_true",
+        help=f"Do not read or write {ATTACHMENT_STATE_FILENAME} in the output directory.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to classify rows (1 = in-process). Output is identical for any value.",
+    )
+    parser.add_argument(
+        "--batch-rows",
+        type=int,
+        default=CLASSIFY_BATCH_ROWS,
+        help=f"Rows sent to a worker at a time when --workers > 1 (default: {CLASSIFY_BATCH_ROWS}).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Reuse {PIPELINE_STATE_FILENAME} from the previous run: classify only new or amended "
+        "notices, rewrite only the markdown that changed, and write latest-delta.csv.",
+    )
+    parser.add_argument(
+        "--sort-buffer-rows",
+        type=int,
+        default=SORT_BUFFER_ROWS,
+        help="Matched rows sorted in memory; beyond this, sorted runs spill to temporary files "
+        f"and are merged (default: {SORT_BUFFER_ROWS}).",
+    )
+    parser.add_argument(
+        "--ckan-resource",
+        default="",
+        help="For CKAN sources, pick the CSV resource whose name or URL contains this text "
+        "(default: the most recently updated CSV).",
+    )
+    parser.add_argument(
+        "--source-recheck-hours",
+        type=float,
+        default=DEFAULT_SOURCE_RECHECK_HOURS,
+        help="Reuse a downloaded CKAN CSV younger than this without contacting the server "
+        "(0 = always revalidate).",
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Also write matched rows to output/canadabuys/parquet/<source>/, partitioned by year "
+        "(requires duckdb).",
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Append the run to output/canadabuys/canadabuys.duckdb (deduplicated notices + run history) "
+        "instead of keeping timestamped filtered-*/summary-* files (requires duckdb).",
+    )
+    parser.add_argument(
+        "--markdown",
+        choices=MARKDOWN_MODES,
+        default="files",
+        help=f"Write project markdown as files under projects/, one {PROJECT_ARCHIVE_FILENAME} archive, "
+        "or both (default: files).",
+    )
+    parser.add_argument(
+        "--markdown-workers",
+        type=int,
+        default=MARKDOWN_WORKERS,
+        help=f"Threads rendering and writing project markdown (default: {MARKDOWN_WORKERS}).",
+    )
     return parser.parse_args()
 
 
@@ -673,6 +1896,21 @@ def main() -> int:
         args.attachment_timeout,
         args.download_attachments,
         args.download_limit,
+        args.attachment_concurrency,
+        args.attachment_host_limit,
+        args.attachment_retries,
+        not args.no_attachment_state,
+        args.attachment_recheck_hours,
+        args.workers,
+        args.batch_rows,
+        args.incremental,
+        args.sort_buffer_rows,
+        args.ckan_resource,
+        args.source_recheck_hours,
+        args.parquet,
+        args.store,
+        args.markdown,
+        args.markdown_workers,
     )
     print(f"Wrote: {csv_path}")
     print(f"Wrote: {json_path}")
@@ -15,6 +15,15 @@ other services:
     from procurement_core import TOOL_NAMES, call_tool_text
 """
 
-from .service import TOOL_NAMES, call_tool_text
-
 __all__ = ["TOOL_NAMES", "call_tool_text"]
+
+
+def __getattr__(name: str):
+    # ``service`` loads .env files and creates the data directory on import, so
+    # it is only pulled in when these names are asked for; light modules such as
+    # ``unspsc`` stay importable on their own (e.g. by the CanadaBuys pipeline).
+    if name in __all__:
+        from . import service
+
+        return getattr(service, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
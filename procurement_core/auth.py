@@ -51,6 +51,9 @@ MAX_CACHE_ENTRIES = 4096
 PRO_TOOLS = frozenset(
     {
         "process_bid_room",
+        "get_bid_room_job",
+        "process_bid_room_batch",
+        "get_bid_room_batch",
         "analyze_contract_with_cohere",
         "watch_opportunity",
         "list_watchlist",
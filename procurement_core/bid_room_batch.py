@@ -0,0 +1,323 @@
+"""Bulk bid-room processing for a watchlist, a match set, or a reference list.
+
+``process_bid_room`` handles one tender per call. A batch fans a set of
+references out over the existing background job queue
+(:mod:`procurement_core.bid_room_jobs`) and tracks them together.
+
+- **Sources.** :func:`submit_batch` takes explicit ``references``, the
+  tenant's ``watchlist``, or the top ``matches`` from
+  ``collect_unified_matches`` for the saved profile, capped at
+  ``MAX_BATCH_SIZE``.
+- **Execution.** Each reference becomes an ordinary bid-room job, so the
+  batch inherits everything jobs already do: payloads are built on the
+  ``WA_BID_ROOM_WORKERS`` worker threads (concurrently, not up front), runs
+  lease warm sandboxes from ``sandbox_pool``, finished artifacts are reused
+  from ``bid_room_cache``, identical in-flight jobs are shared, and standard
+  documents already parsed for another tender come from
+  ``extraction_cache`` instead of being re-parsed.
+- **Streaming.** :func:`iter_batch_updates` yields each tender's summary as
+  its job finishes and then the final comparison; the HTTP app serves the
+  same sequence as server-sent events.
+- **Comparison.** :func:`batch_view` ranks finished tenders by the Cohere
+  fit score (then recommendation, then closing date) for a side-by-side
+  bid/no-bid summary.
+
+Batch records persist as JSON under ``DATA_DIR/bid_room_batches/`` and,
+like jobs, are visible only to the tenant that submitted them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+BATCHES_DIRNAME = "bid_room_batches"
+DEFAULT_BATCH_SIZE = 5
+MAX_BATCH_SIZE = 10
+BATCH_SOURCES = ("references", "watchlist", "matches")
+TERMINAL_STATUSES = frozenset({"succeeded", "failed"})
+_BATCH_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+_RECOMMENDATION_RANK = {"pursue": 0, "maybe": 1, "pass": 2}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# ============== Persistence ==============
+
+
+def _batches_dir() -> Path:
+    from procurement_core import service
+
+    path = service.DATA_DIR / BATCHES_DIRNAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _batch_path(batch_id: str) -> Path | None:
+    if not _BATCH_ID_PATTERN.fullmatch(str(batch_id or "")):
+        return None
+    return _batches_dir() / f"{batch_id}.json"
+
+
+def _write(record: dict[str, Any]) -> None:
+    path = _batch_path(record["batch_id"])
+    if path is None:
+        raise ValueError(f"Invalid batch id: {record['batch_id']}")
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(record, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def get_batch(batch_id: str) -> dict[str, Any] | None:
+    """Return a batch record for the current tenant, or None when unknown."""
+    from procurement_core import storage
+
+    path = _batch_path(batch_id)
+    if path is None or not path.exists():
+        return None
+    try:
+        record = json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return None
+    if not isinstance(record, dict) or record.get("tenant") != storage.current_tenant():
+        return None
+    return record
+
+
+# ============== Submission ==============
+
+
+def _parse_references(value: Any) -> list[str]:
+    if isinstance(value, str):
+        value = re.split(r"[,\s]+", value)
+    if not isinstance(value, list):
+        return []
+    references: list[str] = []
+    for item in value:
+        reference = str(item or "").strip()
+        if reference and reference.lower() not in {ref.lower() for ref in references}:
+            references.append(reference)
+    return references
+
+
+def batch_references(args: dict) -> tuple[str, list[str], list[str]]:
+    """Resolve ``(source, references, warnings)`` for a batch request."""
+    from procurement_core.service import clamp_int, collect_unified_matches, resolve_profile
+
+    limit = clamp_int(args.get("limit"), default=DEFAULT_BATCH_SIZE, minimum=1, maximum=MAX_BATCH_SIZE)
+    source = str(args.get("source") or "").strip().lower()
+    if not source:
+        source = "references" if args.get("references") else "watchlist"
+    if source not in BATCH_SOURCES:
+        raise ValueError(f"Unknown batch source `{source}`. Use one of: {', '.join(BATCH_SOURCES)}.")
+
+    warnings: list[str] = []
+    if source == "references":
+        references = _parse_references(args.get("references"))
+    elif source == "watchlist":
+        from procurement_core.extensions import load_watchlist
+
+        references = _parse_references([item.get("reference") for item in load_watchlist()])
+    else:
+        profile = resolve_profile(args)
+        if not profile:
+            raise ValueError("Set a business profile first; `matches` batches rank opportunities against it.")
+        days = clamp_int(args.get("days"), default=30, minimum=1, maximum=365)
+        matches, warnings = collect_unified_matches(profile, days, limit)
+        references = _parse_references([opportunity.get("reference") for _score, _days, opportunity, _reasons in matches])
+
+    if not references:
+        raise ValueError(f"No references to process from `{source}`.")
+    if len(references) > limit:
+        warnings.append(f"Processing the first {limit} of {len(references)} references.")
+    return source, references[:limit], warnings
+
+
+def submit_batch(args: dict) -> dict[str, Any]:
+    """Queue one bid-room job per reference and persist the batch record."""
+    from procurement_core import storage
+    from procurement_core.bid_room_jobs import submit_job
+
+    source, references, warnings = batch_references(args)
+    shared = {
+        key: args[key]
+        for key in ("business_context", "max_attachments", "timeout_seconds", "command_timeout_seconds", "refresh", "profile")
+        if key in args
+    }
+    tenders = []
+    for reference in references:
+        try:
+            job, _created = submit_job({**shared, "reference": reference})
+        except ValueError as exc:
+            tenders.append({"reference": reference, "job_id": "", "error": str(exc)})
+            continue
+        tenders.append({"reference": reference, "job_id": job["job_id"], "error": ""})
+
+    record = {
+        "batch_id": uuid.uuid4().hex,
+        "tenant": storage.current_tenant(),
+        "source": source,
+        "created_utc": _now(),
+        "warnings": warnings,
+        "tenders": tenders,
+    }
+    _write(record)
+    return record
+
+
+# ============== Progress and Comparison ==============
+
+
+def _tender_summary(entry: dict[str, Any]) -> dict[str, Any]:
+    from procurement_core.bid_room_jobs import get_job
+
+    summary: dict[str, Any] = {
+        "reference": entry["reference"],
+        "job_id": entry.get("job_id", ""),
+        "status": "failed" if entry.get("error") else "queued",
+        "error": entry.get("error", ""),
+        "title": "",
+        "closing": "",
+        "fit_score": None,
+        "bid_recommendation": "",
+        "requirements": 0,
+        "deadlines": 0,
+        "cached": False,
+    }
+    if not entry.get("job_id"):
+        return summary
+    job = get_job(entry["job_id"])
+    if job is None:
+        summary.update(status="failed", error="Job record is missing.")
+        return summary
+    summary.update(status=job["status"], error=job.get("error", ""))
+    envelope = job.get("result") or {}
+    artifact = envelope.get("artifact") or {}
+    opportunity = artifact.get("opportunity") or {}
+    analysis = artifact.get("cohere_analysis") or {}
+    evidence = artifact.get("evidence") or {}
+    summary.update(
+        title=str(opportunity.get("title") or ""),
+        closing=str(opportunity.get("closing") or ""),
+        fit_score=analysis.get("fit_score"),
+        bid_recommendation=str(analysis.get("bid_recommendation") or ""),
+        requirements=len(evidence.get("requirements") or []),
+        deadlines=len(evidence.get("deadlines") or []),
+        cached=bool(envelope.get("cached")),
+    )
+    return summary
+
+
+def _ranking_key(summary: dict[str, Any]) -> tuple:
+    fit = summary["fit_score"]
+    fit = fit if isinstance(fit, (int, float)) else -1
+    word = summary["bid_recommendation"].split(" ", 1)[0].strip(" -:,.").lower()
+    return (-fit, _RECOMMENDATION_RANK.get(word, 3), summary["closing"] or "9999", summary["reference"])
+
+
+def batch_view(record: dict[str, Any]) -> dict[str, Any]:
+    """Return batch progress plus finished tenders ranked by fit score."""
+    tenders = [_tender_summary(entry) for entry in record["tenders"]]
+    counts = {status: sum(1 for item in tenders if item["status"] == status) for status in ("succeeded", "failed")}
+    pending = len(tenders) - counts["succeeded"] - counts["failed"]
+    return {
+        "batch_id": record["batch_id"],
+        "source": record.get("source", ""),
+        "created_utc": record.get("created_utc", ""),
+        "status": "running" if pending else "completed",
+        "total": len(tenders),
+        "succeeded": counts["succeeded"],
+        "failed": counts["failed"],
+        "pending": pending,
+        "warnings": record.get("warnings", []),
+        "tenders": tenders,
+        "ranking": sorted((item for item in tenders if item["status"] == "succeeded"), key=_ranking_key),
+    }
+
+
+def iter_batch_updates(
+    batch_id: str,
+    *,
+    poll_seconds: float = 2.0,
+    timeout: float | None = None,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield ``("tender", summary)`` as jobs finish, then ``("summary", view)``.
+
+    Stops early (without the summary) when ``timeout`` elapses first.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    reported: set[str] = set()
+    while True:
+        record = get_batch(batch_id)
+        if record is None:
+            return
+        view = batch_view(record)
+        for tender in view["tenders"]:
+            key = tender["job_id"] or tender["reference"]
+            if tender["status"] in TERMINAL_STATUSES and key not in reported:
+                reported.add(key)
+                yield "tender", tender
+        if view["status"] == "completed":
+            yield "summary", view
+            return
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+        time.sleep(poll_seconds)
+
+
+def render_batch_markdown(view: dict[str, Any]) -> str:
+    """Render batch progress and the fit-score comparison for MCP users."""
+    output = "# Bid Room Batch\n\n"
+    output += f"**Batch ID:** `{view['batch_id']}`\n"
+    output += f"**Source:** {view['source']}\n"
+    output += (
+        f"**Progress:** {view['succeeded']} succeeded, {view['failed']} failed, "
+        f"{view['pending']} pending of {view['total']}\n\n"
+    )
+    for warning in view.get("warnings", []):
+        output += f"> {warning}\n"
+    if view.get("warnings"):
+        output += "\n"
+
+    if view["ranking"]:
+        output += "## Ranked by Fit\n\n"
+        output += "| # | Reference | Title | Fit | Recommendation | Reqs | Deadlines | Closing | Job |\n"
+        output += "|---|---|---|---|---|---|---|---|---|\n"
+        for index, item in enumerate(view["ranking"], 1):
+            fit = item["fit_score"] if item["fit_score"] is not None else "-"
+            output += (
+                f"| {index} | `{item['reference']}` | {item['title'][:60]} | {fit} | "
+                f"{item['bid_recommendation'][:60]} | {item['requirements']} | {item['deadlines']} | "
+                f"{item['closing'][:10]} | `{item['job_id']}` |\n"
+            )
+        output += "\n"
+
+    others = [item for item in view["tenders"] if item["status"] != "succeeded"]
+    if others:
+        output += "## Not Finished\n\n"
+        for item in others:
+            line = f"- `{item['reference']}`: {item['status']}"
+            if item["job_id"]:
+                line += f" (job `{item['job_id']}`)"
+            if item["error"]:
+                line += f" - {item['error'][:200]}"
+            output += line + "\n"
+        output += "\n"
+
+    if view["status"] == "running":
+        output += (
+            f"Poll with `get_bid_room_batch` and `batch_id` `{view['batch_id']}` "
+            "(REST: `GET /bid-room/batches/{batch_id}`, or `/events` for a live stream). "
+            "Use `get_bid_room_job` with a tender's job id for its full review.\n"
+        )
+    else:
+        output += "Use `get_bid_room_job` with a tender's job id for its full review.\n"
+    return output.strip()
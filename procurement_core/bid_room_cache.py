@@ -0,0 +1,212 @@
+"""Content-addressed cache for bid-room artifacts.
+
+A bid-room run boots an E2B sandbox, downloads every attachment, extracts
+PDF/DOCX/XLSX text, and makes several Cohere calls. When neither the tender
+package nor the business profile has changed, the result would be the same,
+so this module keeps finished artifacts on the host and serves repeats
+without a sandbox.
+
+- **Lookup key.** :func:`cache_key` hashes everything that determines the
+  artifact other than attachment bytes: opportunity reference, the sorted
+  attachment URL set, the inline notice text, the normalized profile, the
+  whole Cohere request config (model, token budget, response schema, tools),
+  processing limits, and the processor version plus a digest of
+  ``SANDBOX_PROCESSOR`` itself (so any processor edit invalidates old
+  entries without a manual version bump).
+- **Content address.** Each entry records the SHA-256 the sandbox computed
+  for every attachment, plus the ``ETag``/``Last-Modified`` validators the
+  server sent. The entry's ``content_key`` is the hash of the lookup key and
+  those digests.
+- **Revalidation.** :func:`lookup` only checks whether the attachments
+  changed: a ``HEAD`` per attachment compared against the stored validator,
+  falling back to a streamed, size-capped download hashed on the host (bytes
+  are hashed, never parsed — untrusted files are still only opened inside the
+  sandbox) when the server sends no validators. Any mismatch, network error,
+  or attachment that failed to download last time is a miss.
+
+Entries live as JSON under ``DATA_DIR/bid_room_cache/``. Cache problems never
+fail a bid-room call: unreadable entries are misses and write errors are
+ignored.
+
+Environment variables:
+    WA_BID_ROOM_CACHE_TTL_SECONDS   max entry age (default 604800; 0 disables)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+CACHE_DIRNAME = "bid_room_cache"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+REVALIDATE_TIMEOUT_SECONDS = 20
+USER_AGENT = "WorkspaceAlberta-BidRoom/0.1"
+_READ_CHUNK_BYTES = 256 * 1024
+
+
+def ttl_seconds() -> int:
+    """Return the configured entry lifetime; 0 disables the cache."""
+    try:
+        return max(0, int(os.environ.get("WA_BID_ROOM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)))
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def _sha256_text(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _cache_dir() -> Path:
+    from procurement_core import service
+
+    path = service.DATA_DIR / CACHE_DIRNAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cache_key(payload: dict[str, Any]) -> str:
+    """Hash the non-attachment inputs that determine a bid-room artifact."""
+    from procurement_core.e2b_bid_room import PROCESSOR_VERSION, SANDBOX_PROCESSOR
+
+    material = {
+        "processor": PROCESSOR_VERSION,
+        "processor_digest": _sha256_text(SANDBOX_PROCESSOR),
+        "reference": str(payload.get("opportunity", {}).get("reference", "")).strip().lower(),
+        "attachment_urls": sorted(str(item.get("url", "")) for item in payload.get("attachments", [])),
+        "documents": [_sha256_text(str(item.get("text", ""))) for item in payload.get("documents", [])],
+        "profile": payload.get("profile", {}),
+        # Model, token budget, response schema, tools and loop mode all shape
+        # the review; the dict holds no secrets (the key travels in env vars).
+        "cohere": payload.get("cohere", {}),
+        "limits": payload.get("limits", {}),
+    }
+    return _sha256_text(json.dumps(material, sort_keys=True, ensure_ascii=False))
+
+
+def content_key(key: str, attachments: list[dict[str, Any]]) -> str:
+    """Hash a lookup key with the attachment content digests."""
+    digests = sorted(f"{item['url']}\n{item['sha256']}" for item in attachments)
+    return _sha256_text(key + "\n" + "\n".join(digests))
+
+
+def _attachment_fingerprints(payload: dict[str, Any], artifact: dict[str, Any]) -> list[dict[str, Any]] | None:
+    urls = {str(item.get("url", "")) for item in payload.get("attachments", [])}
+    fingerprints = []
+    for document in artifact.get("documents", []):
+        url = str(document.get("url") or "")
+        if url not in urls:
+            continue
+        if not document.get("sha256"):
+            # Failed or skipped download: nothing to revalidate against.
+            return None
+        fingerprints.append({
+            "url": url,
+            "sha256": document["sha256"],
+            "etag": str(document.get("etag") or ""),
+            "last_modified": str(document.get("last_modified") or ""),
+        })
+    if {item["url"] for item in fingerprints} != urls:
+        return None
+    return fingerprints
+
+
+# ============== Revalidation ==============
+
+
+def _head(url: str) -> dict[str, str]:
+    request = Request(url, method="HEAD", headers={"User-Agent": USER_AGENT, "Accept": "*/*"})
+    with urlopen(request, timeout=REVALIDATE_TIMEOUT_SECONDS) as response:
+        return {
+            "etag": str(response.headers.get("ETag") or ""),
+            "last_modified": str(response.headers.get("Last-Modified") or ""),
+        }
+
+
+def _stream_sha256(url: str) -> str:
+    from procurement_core.e2b_bid_room import MAX_FILE_BYTES
+
+    digest = hashlib.sha256()
+    total = 0
+    request = Request(url, headers={"User-Agent": USER_AGENT, "Accept": "*/*"})
+    with urlopen(request, timeout=REVALIDATE_TIMEOUT_SECONDS) as response:
+        while True:
+            chunk = response.read(_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > MAX_FILE_BYTES:
+                return ""
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def attachment_unchanged(fingerprint: dict[str, Any]) -> bool:
+    """Return True when the attachment still matches its cached fingerprint."""
+    try:
+        validators = _head(fingerprint["url"])
+        if fingerprint["etag"] and validators["etag"]:
+            return validators["etag"] == fingerprint["etag"]
+        if fingerprint["last_modified"] and validators["last_modified"]:
+            return validators["last_modified"] == fingerprint["last_modified"]
+    except (HTTPError, URLError, OSError, ValueError):
+        # Some servers reject HEAD; fall through to hashing the body.
+        pass
+    try:
+        return _stream_sha256(fingerprint["url"]) == fingerprint["sha256"]
+    except (HTTPError, URLError, OSError, ValueError):
+        return False
+
+
+# ============== Lookup / Store ==============
+
+
+def lookup(payload: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the cached entry for a payload when its attachments are unchanged."""
+    ttl = ttl_seconds()
+    if ttl <= 0:
+        return None
+    key = cache_key(payload)
+    path = _cache_dir() / f"{key}.json"
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        stored = datetime.strptime(entry["stored_utc"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if (datetime.now(timezone.utc) - stored).total_seconds() > ttl:
+        return None
+    if not all(attachment_unchanged(item) for item in entry.get("attachments", [])):
+        return None
+    return entry
+
+
+def store(payload: dict[str, Any], sandbox_id: str, artifact: dict[str, Any]) -> dict[str, Any] | None:
+    """Cache a finished artifact; returns the entry, or None when not cacheable."""
+    if ttl_seconds() <= 0:
+        return None
+    fingerprints = _attachment_fingerprints(payload, artifact)
+    if fingerprints is None:
+        return None
+    key = cache_key(payload)
+    entry = {
+        "key": key,
+        "content_key": content_key(key, fingerprints),
+        "reference": str(payload.get("opportunity", {}).get("reference", "")),
+        "stored_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "sandbox_id": sandbox_id,
+        "attachments": fingerprints,
+        "artifact": artifact,
+    }
+    try:
+        path = _cache_dir() / f"{key}.json"
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(entry, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        return None
+    return entry
@@ -0,0 +1,294 @@
+"""Background jobs for bid-room processing.
+
+``process_bid_room`` is the slowest tool in the service: booting an E2B
+sandbox, downloading attachments, extracting text, and running the Cohere
+review can take many minutes, which ties up a connection and a worker thread
+and breaks behind proxies with shorter idle timeouts. This module runs the
+same work as a job the caller can poll.
+
+- :func:`submit_job` validates the reference, resolves the profile up front
+  (so the tenant's saved profile is read while the request context is still
+  bound), and queues :func:`service.process_bid_room_artifact` on a bounded
+  thread pool. Submissions for the same tenant, reference, profile, and
+  processing options while a job is still queued or running return the
+  existing job instead of starting a second sandbox.
+- Job records persist as JSON under ``DATA_DIR/bid_room_jobs/`` and carry
+  the full artifact envelope once the job succeeds, so a result outlives the
+  request that started it.
+- :func:`get_job` returns a record only to the tenant that submitted it. A
+  record left ``queued``/``running`` by a previous process (restart,
+  redeploy) is marked failed on read rather than polled forever.
+
+Failure stance matches ``process_bid_room_artifact``: payload problems
+(``ValueError``) and missing runtime dependencies (``RuntimeError``) are
+recorded on the job as ``invalid_request`` / ``unavailable`` errors, never
+raised into the worker pool.
+
+Environment variables:
+    WA_BID_ROOM_WORKERS   background worker threads (default 2, max 8)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+JOBS_DIRNAME = "bid_room_jobs"
+DEFAULT_WORKERS = 2
+MAX_WORKERS = 8
+ACTIVE_STATUSES = frozenset({"queued", "running"})
+_JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_futures: dict[str, Future] = {}
+_active_keys: dict[str, str] = {}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def worker_count() -> int:
+    """Return the configured background worker count."""
+    from procurement_core.service import clamp_int
+
+    return clamp_int(os.environ.get("WA_BID_ROOM_WORKERS"), DEFAULT_WORKERS, 1, MAX_WORKERS)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=worker_count(), thread_name_prefix="bid-room-job")
+    return _executor
+
+
+# ============== Persistence ==============
+
+
+def _jobs_dir() -> Path:
+    from procurement_core import service
+
+    path = service.DATA_DIR / JOBS_DIRNAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _job_path(job_id: str) -> Path | None:
+    if not _JOB_ID_PATTERN.fullmatch(str(job_id or "")):
+        return None
+    return _jobs_dir() / f"{job_id}.json"
+
+
+def _read(job_id: str) -> dict[str, Any] | None:
+    path = _job_path(job_id)
+    if path is None or not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write(record: dict[str, Any]) -> None:
+    path = _job_path(record["job_id"])
+    if path is None:
+        raise ValueError(f"Invalid job id: {record['job_id']}")
+    # Write-then-rename so a poll never reads a half-written record.
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(record, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+# ============== Submission ==============
+
+
+def job_arguments(args: dict) -> dict[str, Any]:
+    """Normalize the processing arguments a job runs with (and dedupes on)."""
+    from procurement_core.service import clamp_int, resolve_profile
+
+    reference = str(args.get("reference") or "").strip()
+    if not reference:
+        raise ValueError("Please provide a reference number.")
+    return {
+        "reference": reference,
+        "business_context": str(args.get("business_context") or "").strip(),
+        "max_attachments": clamp_int(args.get("max_attachments"), default=5, minimum=0, maximum=5),
+        "timeout_seconds": clamp_int(args.get("timeout_seconds"), default=900, minimum=60, maximum=86400),
+        "command_timeout_seconds": clamp_int(
+            args.get("command_timeout_seconds"), default=420, minimum=120, maximum=3600
+        ),
+        "refresh": bool(args.get("refresh", False)),
+        "profile": resolve_profile(args) or {},
+    }
+
+
+def dedupe_key(tenant: str | None, arguments: dict[str, Any]) -> str:
+    """Hash the tenant and normalized arguments into a job dedupe key."""
+    material = {
+        "tenant": tenant or "",
+        "reference": arguments["reference"].lower(),
+        "business_context": arguments["business_context"],
+        "max_attachments": arguments["max_attachments"],
+        "timeout_seconds": arguments["timeout_seconds"],
+        "command_timeout_seconds": arguments["command_timeout_seconds"],
+        # A refresh must not attach to a run that may be served from cache.
+        "refresh": arguments["refresh"],
+        "profile": arguments["profile"],
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def submit_job(args: dict) -> tuple[dict[str, Any], bool]:
+    """Queue a bid-room job, or return the active duplicate.
+
+    Returns ``(record, created)``; ``created`` is False when an identical job
+    was already queued or running.
+    """
+    from procurement_core import storage
+
+    arguments = job_arguments(args)
+    tenant = storage.current_tenant()
+    key = dedupe_key(tenant, arguments)
+
+    with _lock:
+        existing_id = _active_keys.get(key)
+        if existing_id:
+            existing = _read(existing_id)
+            if existing and existing.get("status") in ACTIVE_STATUSES:
+                return existing, False
+
+        job_id = uuid.uuid4().hex
+        record = {
+            "job_id": job_id,
+            "status": "queued",
+            "reference": arguments["reference"],
+            "tenant": tenant,
+            "dedupe_key": key,
+            "arguments": arguments,
+            "created_utc": _now(),
+            "started_utc": "",
+            "finished_utc": "",
+            "error": "",
+            "error_kind": "",
+            "result": None,
+        }
+        _write(record)
+        _active_keys[key] = job_id
+        # Jobs run off the request thread; carry the tenant binding along.
+        context = contextvars.copy_context()
+        _futures[job_id] = _get_executor().submit(context.run, _run_job, job_id)
+    return record, True
+
+
+def _run_job(job_id: str) -> None:
+    from procurement_core.service import process_bid_room_artifact
+
+    record = _read(job_id)
+    if record is None:
+        return
+    record["status"] = "running"
+    record["started_utc"] = _now()
+    _write(record)
+
+    try:
+        record["result"] = process_bid_room_artifact(dict(record["arguments"]))
+        record["status"] = "succeeded"
+    except ValueError as exc:
+        record.update(status="failed", error=str(exc), error_kind="invalid_request")
+    except RuntimeError as exc:
+        record.update(status="failed", error=str(exc), error_kind="unavailable")
+    except Exception as exc:  # noqa: BLE001 - a job must always reach a terminal state
+        record.update(status="failed", error=f"{type(exc).__name__}: {exc}", error_kind="internal")
+    finally:
+        record["finished_utc"] = _now()
+        _write(record)
+        with _lock:
+            if _active_keys.get(record["dedupe_key"]) == job_id:
+                del _active_keys[record["dedupe_key"]]
+            _futures.pop(job_id, None)
+
+
+# ============== Polling ==============
+
+
+def get_job(job_id: str) -> dict[str, Any] | None:
+    """Return a job record for the current tenant, or None when unknown."""
+    from procurement_core import storage
+
+    record = _read(job_id)
+    if record is None or record.get("tenant") != storage.current_tenant():
+        return None
+    with _lock:
+        orphaned = record.get("status") in ACTIVE_STATUSES and job_id not in _futures
+    if orphaned:
+        record.update(
+            status="failed",
+            error="Job was interrupted before it finished (server restart). Submit it again.",
+            error_kind="interrupted",
+            finished_utc=_now(),
+        )
+        _write(record)
+    return record
+
+
+def wait_for_job(job_id: str, timeout: float | None = None) -> dict[str, Any] | None:
+    """Block until a job submitted by this process finishes, then return it."""
+    with _lock:
+        future = _futures.get(job_id)
+    if future is not None:
+        future.result(timeout=timeout)
+    return get_job(job_id)
+
+
+def public_job_view(record: dict[str, Any]) -> dict[str, Any]:
+    """Return the JSON-safe job fields exposed to REST callers."""
+    return {
+        "job_id": record["job_id"],
+        "status": record["status"],
+        "reference": record.get("reference", ""),
+        "created_utc": record.get("created_utc", ""),
+        "started_utc": record.get("started_utc", ""),
+        "finished_utc": record.get("finished_utc", ""),
+        "error": record.get("error", ""),
+        "error_kind": record.get("error_kind", ""),
+        "result": record.get("result"),
+    }
+
+
+def render_job_markdown(record: dict[str, Any], *, created: bool | None = None) -> str:
+    """Render a job record for MCP users."""
+    status = record["status"]
+    if status == "succeeded" and record.get("result"):
+        return str(record["result"].get("markdown", "")).strip()
+
+    output = "# Bid Room Job\n\n"
+    output += f"**Job ID:** `{record['job_id']}`\n"
+    output += f"**Reference:** `{record.get('reference', '')}`\n"
+    output += f"**Status:** {status}\n"
+    output += f"**Submitted:** {record.get('created_utc', '')}\n"
+    if record.get("started_utc"):
+        output += f"**Started:** {record['started_utc']}\n"
+    if record.get("finished_utc"):
+        output += f"**Finished:** {record['finished_utc']}\n"
+    if created is False:
+        output += "\nAn identical job is already in progress, so no new sandbox was started.\n"
+    if status == "failed":
+        output += f"\nBid room processing failed: {record.get('error', '')}\n"
+    elif status in ACTIVE_STATUSES:
+        output += (
+            f"\nPoll with `get_bid_room_job` and `job_id` `{record['job_id']}` "
+            "(REST: `GET /bid-room/jobs/{job_id}`). Processing usually takes a few minutes.\n"
+        )
+    return output.strip()
@@ -0,0 +1,157 @@
+"""Prompt/response cache for Cohere contract analysis.
+
+``analyze_contract_with_cohere`` sends the same prompt whenever the same
+tender is reviewed with the same profile, context, and question, and each
+call costs tokens and 10–60 s. This module keeps finished analyses so
+repeats return immediately.
+
+- **Key.** :func:`cache_key` hashes the model, the full message list,
+  ``max_tokens``, temperature, and the configured reasoning effort. The
+  messages embed the rendered notice and business context, so an amended
+  tender or a changed profile is a different key.
+- **Memory.** An LRU of at most ``WA_COHERE_CACHE_MAX_ENTRIES`` entries,
+  each valid for ``WA_COHERE_CACHE_TTL_SECONDS``.
+- **Disk (optional).** With ``WA_COHERE_CACHE_PERSIST=1``, entries are also
+  written as JSON under ``DATA_DIR/cohere_cache/`` (pruned to the same
+  entry bound) so they survive restarts and are shared by workers on one
+  volume.
+
+Analyses depend only on the public notice and the context in the prompt,
+so entries are not tenant-scoped; two tenants only share an entry when their
+prompts are identical. Cache problems never fail an analysis: unreadable
+entries are misses and write errors are ignored.
+
+Environment variables:
+    WA_COHERE_CACHE_TTL_SECONDS   max entry age (default 86400; 0 disables)
+    WA_COHERE_CACHE_MAX_ENTRIES   entries kept in memory and on disk (default 256)
+    WA_COHERE_CACHE_PERSIST       set to 1 to persist entries to disk (default off)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+CACHE_DIRNAME = "cohere_cache"
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_ENTRIES = 256
+
+_memory: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def ttl_seconds() -> int:
+    """Return the configured entry lifetime; 0 disables the cache."""
+    return _env_int("WA_COHERE_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+
+
+def max_entries() -> int:
+    return max(1, _env_int("WA_COHERE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+
+
+def persist_enabled() -> bool:
+    return os.environ.get("WA_COHERE_CACHE_PERSIST", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _cache_dir() -> Path:
+    from procurement_core import service
+
+    path = service.DATA_DIR / CACHE_DIRNAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cache_key(model: str, messages: list[dict[str, str]], max_tokens: int, temperature: float) -> str:
+    """Hash every request input that determines the model's answer."""
+    material = {
+        "model": model,
+        "messages": messages,
+        "max_tokens": int(max_tokens),
+        "temperature": float(temperature),
+        "reasoning_effort": os.environ.get("CANADABUYS_COHERE_REASONING_EFFORT", ""),
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _fresh(entry: dict[str, Any], ttl: int) -> bool:
+    return time.time() - float(entry.get("stored_at", 0)) < ttl
+
+
+def lookup(key: str) -> dict[str, Any] | None:
+    """Return ``{"content", "provider", "model", "stored_utc"}`` for a fresh entry."""
+    ttl = ttl_seconds()
+    if not ttl:
+        return None
+    with _lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            if _fresh(entry, ttl):
+                _memory.move_to_end(key)
+                return entry
+            del _memory[key]
+    if not persist_enabled():
+        return None
+    try:
+        entry = json.loads((_cache_dir() / f"{key}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or not isinstance(entry.get("content"), str) or not _fresh(entry, ttl):
+        return None
+    _remember(key, entry)
+    return entry
+
+
+def _remember(key: str, entry: dict[str, Any]) -> None:
+    with _lock:
+        _memory[key] = entry
+        _memory.move_to_end(key)
+        while len(_memory) > max_entries():
+            _memory.popitem(last=False)
+
+
+def store(key: str, content: str, provider: str, model: str) -> None:
+    """Remember a finished analysis (no-op when the cache is disabled)."""
+    if not ttl_seconds() or not content.strip():
+        return
+    entry = {
+        "content": content,
+        "provider": provider,
+        "model": model,
+        "stored_at": time.time(),
+        "stored_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    _remember(key, entry)
+    if not persist_enabled():
+        return
+    try:
+        directory = _cache_dir()
+        path = directory / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+        entries = sorted(directory.glob("*.json"), key=lambda item: item.stat().st_mtime)
+        for stale in entries[: max(0, len(entries) - max_entries())]:
+            stale.unlink(missing_ok=True)
+    except OSError:
+        return
+
+
+def clear() -> None:
+    """Drop every in-memory entry (disk entries are left alone)."""
+    with _lock:
+        _memory.clear()
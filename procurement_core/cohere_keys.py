@@ -0,0 +1,252 @@
+"""Load balancing and circuit breaking across the configured Cohere keys.
+
+``get_cohere_api_keys`` returns every configured key (``COHERE_API_KEY``,
+``COHERE_PROD_API_KEY``). Trying them strictly in order sends all traffic to
+the first key until it starts returning 429s, so concurrent analyses pile up
+on one quota while the other sits idle. This module keeps per-key state for
+the process and decides which key each request should use.
+
+- **Spreading.** :func:`schedule` orders healthy keys by requests in flight,
+  then by rate-limit headroom, then by configured order. Sequential traffic
+  still goes to the first key; concurrent traffic spreads across all of them.
+  A key already running ``WA_COHERE_KEY_MAX_IN_FLIGHT`` requests is skipped.
+- **Rate-limit awareness.** :func:`observe_headers` reads
+  ``x-ratelimit-remaining-*`` / ``x-ratelimit-limit-*`` /
+  ``x-ratelimit-reset-*`` from each response; a key that reports no
+  remaining requests is rested until its reset time.
+- **Circuit breaker.** A rate/quota error opens the key's circuit for its
+  ``Retry-After`` (or ``WA_COHERE_KEY_COOLDOWN_SECONDS``, doubled on each
+  repeat trip up to ``MAX_COOLDOWN_SECONDS``). ``TRANSIENT_FAILURE_LIMIT``
+  consecutive server/network errors open it the same way. Once the cooldown
+  passes the key is half-open: one trial request is allowed, and its outcome
+  closes or re-opens the circuit.
+- **Saturation.** When no key is available, :func:`schedule` returns an
+  empty list and the caller routes to Hugging Face (when a token is set)
+  instead of queueing more work on throttled keys.
+
+State is per process and keyed by env var name; it resets when the key
+behind a name changes.
+
+Environment variables:
+    WA_COHERE_KEY_MAX_IN_FLIGHT      concurrent requests per key (default 4)
+    WA_COHERE_KEY_COOLDOWN_SECONDS   first circuit-open period (default 30)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping
+
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_COOLDOWN_SECONDS = 30.0
+MAX_COOLDOWN_SECONDS = 600.0
+TRANSIENT_FAILURE_LIMIT = 3
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+@dataclass
+class _KeyState:
+    fingerprint: str
+    in_flight: int = 0
+    remaining: int | None = None
+    limit: int | None = None
+    open_until: float = 0.0
+    trips: int = 0
+    transient_failures: int = 0
+    trial_running: bool = False
+    successes: int = 0
+    failures: int = 0
+
+
+_lock = threading.Lock()
+_states: dict[str, _KeyState] = {}
+
+
+def _env_number(name: str, default: float, minimum: float) -> float:
+    try:
+        return max(minimum, float(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def max_in_flight() -> int:
+    return int(_env_number("WA_COHERE_KEY_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT, 1))
+
+
+def cooldown_seconds() -> float:
+    return _env_number("WA_COHERE_KEY_COOLDOWN_SECONDS", DEFAULT_COOLDOWN_SECONDS, 0)
+
+
+def _state(key_name: str, token: str = "") -> _KeyState:
+    # Callers hold _lock.
+    fingerprint = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16] if token else ""
+    state = _states.get(key_name)
+    if state is None or (fingerprint and state.fingerprint and state.fingerprint != fingerprint):
+        state = _KeyState(fingerprint=fingerprint)
+        _states[key_name] = state
+    elif fingerprint and not state.fingerprint:
+        state.fingerprint = fingerprint
+    return state
+
+
+def parse_seconds(value: Any) -> float | None:
+    """Parse ``Retry-After``/reset header values: seconds, ``1m30s``, or an HTTP date."""
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if parts and "".join(number + unit for number, unit in parts) == text:
+        scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+        return sum(float(number) * scale[unit] for number, unit in parts)
+    try:
+        return max(0.0, parsedate_to_datetime(text).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _header(headers: Mapping[str, str] | None, *names: str) -> str:
+    if not headers:
+        return ""
+    for name in names:
+        value = headers.get(name)
+        if value:
+            return str(value)
+    return ""
+
+
+def _header_int(headers: Mapping[str, str] | None, *names: str) -> int | None:
+    try:
+        return int(float(_header(headers, *names)))
+    except ValueError:
+        return None
+
+
+def _available(state: _KeyState, now: float, cap: int) -> bool:
+    if state.in_flight >= cap:
+        return False
+    if state.open_until > now:
+        return False
+    # Half-open after a trip: a single trial request at a time.
+    return not (state.trips and state.trial_running)
+
+
+def schedule(keys: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Return the available ``(token, key_name)`` pairs, best first.
+
+    Empty when every key is open, rate-limited, or at its in-flight cap.
+    """
+    now = time.monotonic()
+    cap = max_in_flight()
+    ranked = []
+    with _lock:
+        for index, (token, key_name) in enumerate(keys):
+            state = _state(key_name, token)
+            if not _available(state, now, cap):
+                continue
+            headroom = 1.0
+            if state.remaining is not None and state.limit:
+                headroom = state.remaining / state.limit
+            ranked.append((state.in_flight, -headroom, state.transient_failures, index, (token, key_name)))
+    return [entry[-1] for entry in sorted(ranked)]
+
+
+def by_reopen_time(keys: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Order every key by when it becomes available (used when no fallback route exists)."""
+    with _lock:
+        ranked = [
+            (_state(key_name, token).open_until, _state(key_name, token).in_flight, index, (token, key_name))
+            for index, (token, key_name) in enumerate(keys)
+        ]
+    return [entry[-1] for entry in sorted(ranked)]
+
+
+def begin(key_name: str) -> None:
+    """Count a request against ``key_name`` until :func:`record_outcome`."""
+    with _lock:
+        state = _state(key_name)
+        state.in_flight += 1
+        if state.trips and state.open_until <= time.monotonic():
+            state.trial_running = True
+
+
+def observe_headers(key_name: str, headers: Mapping[str, str] | None) -> None:
+    """Record rate-limit headers from a Cohere response."""
+    remaining = _header_int(headers, "x-ratelimit-remaining-requests", "x-ratelimit-remaining")
+    limit = _header_int(headers, "x-ratelimit-limit-requests", "x-ratelimit-limit")
+    if remaining is None and limit is None:
+        return
+    reset = parse_seconds(_header(headers, "x-ratelimit-reset-requests", "x-ratelimit-reset"))
+    with _lock:
+        state = _state(key_name)
+        if remaining is not None:
+            state.remaining = remaining
+        if limit is not None:
+            state.limit = limit
+        if remaining == 0:
+            state.open_until = max(state.open_until, time.monotonic() + (reset if reset is not None else cooldown_seconds()))
+
+
+def record_outcome(key_name: str, outcome: str, retry_after: float | None = None) -> None:
+    """Finish a request started with :func:`begin`.
+
+    ``outcome`` is ``"ok"``, ``"limit"`` (rate/quota error), ``"transient"``
+    (server or network error), or ``"rejected"`` (a request error that says
+    nothing about the key's health).
+    """
+    now = time.monotonic()
+    with _lock:
+        state = _state(key_name)
+        state.in_flight = max(0, state.in_flight - 1)
+        state.trial_running = False
+        if outcome == "ok":
+            state.successes += 1
+            state.trips = 0
+            state.transient_failures = 0
+            return
+        if outcome == "rejected":
+            return
+        state.failures += 1
+        if outcome == "transient":
+            state.transient_failures += 1
+            if state.transient_failures < TRANSIENT_FAILURE_LIMIT and not state.trips:
+                return
+        cooldown = min(MAX_COOLDOWN_SECONDS, cooldown_seconds() * (2 ** state.trips))
+        if retry_after is not None:
+            cooldown = max(cooldown, min(retry_after, MAX_COOLDOWN_SECONDS))
+        state.trips += 1
+        state.open_until = max(state.open_until, now + cooldown)
+        if outcome == "limit":
+            state.remaining = 0
+
+
+def stats() -> dict[str, dict[str, Any]]:
+    """Return per-key scheduler state for health reporting (no secrets)."""
+    now = time.monotonic()
+    with _lock:
+        return {
+            key_name: {
+                "circuit": "open" if state.open_until > now else ("half_open" if state.trips else "closed"),
+                "in_flight": state.in_flight,
+                "remaining": state.remaining,
+                "retry_in_seconds": round(max(0.0, state.open_until - now), 1),
+                "successes": state.successes,
+                "failures": state.failures,
+            }
+            for key_name, state in sorted(_states.items())
+        }
+
+
+def reset() -> None:
+    """Forget all key state."""
+    with _lock:
+        _states.clear()
@@ -13,13 +13,16 @@ How it works, end to end:
     live APC detail response plus the saved business profile into a JSON
     payload: opportunity metadata, attachment URLs (capped at
     ``MAX_ATTACHMENTS``), profile context, and processing limits.
-2.  **Sandbox execution.** :func:`run_live_bid_room_process` boots an E2B
-    sandbox, injects ``SANDBOX_PROCESSOR`` (a self-contained Python script,
-    stored as a raw string in this module) with the payload substituted in,
-    and runs it under a command timeout. The processor downloads attachments,
-    extracts text (pdfminer/python-docx/openpyxl installed on demand via
-    :func:`ensure_package`), walks ZIPs up to ``MAX_ZIP_MEMBERS``, and builds
-    an evidence bundle of normalized document text.
+2.  **Sandbox execution.** :func:`run_live_bid_room_process` leases an E2B
+    sandbox (a warm one from ``sandbox_pool`` when the pool is enabled,
+    otherwise a cold one), injects ``SANDBOX_PROCESSOR`` (a self-contained
+    Python script, stored as a raw string in this module) with the payload
+    substituted in, and runs it under a command timeout. The processor
+    downloads attachments, extracts text (pypdf/python-docx/openpyxl
+    installed on demand via :func:`ensure_package`, or preinstalled in warm
+    sandboxes), walks ZIPs up to ``MAX_ZIP_MEMBERS``, and builds an evidence
+    bundle of normalized document text. :mod:`procurement_core.local_bid_room`
+    runs the same script in a host subprocess when E2B is not available.
 3.  **In-sandbox Cohere review.** ``call_cohere`` (inside the processor) calls
     Command A+ with read-only evidence tools (``search_extracted_documents``,
     ``get_bid_evidence``) and a strict JSON schema
@@ -27,6 +30,14 @@ How it works, end to end:
     extracted text; responses are validated by ``validate_cohere_analysis``
     against ``REQUIRED_COHERE_FIELDS`` (bid recommendation, fit score,
     requirements, risks, missing info, deadlines, questions, next actions).
+    Search ranks overlapping passages with a BM25 index built once per run,
+    so repeated tool calls are lookups rather than rescans of every document.
+    Each turn's tool calls run concurrently. By default their results go to
+    one plain-text JSON synthesis request; with ``cohere.tool_result_turns``
+    set they are sent back as ``role: tool`` messages for up to
+    ``MAX_COHERE_TURNS`` turns, and a valid JSON answer ends the loop without
+    the synthesis request. ``cohere_tool_calls`` records every model turn
+    (latency, input/output tokens) and every tool call.
 4.  **Artifact return.** The processor prints a single JSON artifact to
     stdout; :func:`parse_artifact` recovers it, ``validate_bid_room_artifact``
     checks its shape, and :func:`render_bid_room_markdown` formats the
@@ -35,7 +46,28 @@ How it works, end to end:
 
 Safety limits: ``MAX_FILE_BYTES`` (25 MB per file), ``MAX_COHERE_CHARS``
 (80k prompt chars), ``MAX_ATTACHMENTS`` (5), and per-command timeouts. All
-are enforced inside the sandbox as well as on the host.
+are enforced inside the sandbox as well as on the host. Attachments stream to
+disk in chunks (hashed as they arrive), and ZIP members are inflated the same
+way under a per-member expansion-ratio guard and a per-archive byte budget,
+so sandbox memory stays flat and zip bombs are cut off early. When a package
+is larger than ``MAX_COHERE_CHARS``, the prompt text is packed from the
+passages densest in requirements, deadlines, and profile keywords (each
+document's opening passage kept, near-duplicates dropped) rather than cut
+off in document order; the artifact's ``evidence.packing`` reports the
+budget, source and packed sizes, and what was left out.
+
+Throughput: the processor downloads attachments on a thread pool capped at
+``DOWNLOAD_CONCURRENCY`` connections and extracts them in a forked process
+pool sized to the sandbox's cores. Each document gets a
+``DOC_TIME_BUDGET_SECONDS`` soft deadline — extractors stop early and mark
+the text ``partial`` — plus a hard timeout after which it is recorded as
+``extract_timeout``, so a package takes about as long as its slowest
+document rather than the sum of all of them.
+Evidence extraction makes one pass per document: a single alternation of
+the requirement/deadline trigger words and profile keywords finds candidate
+offsets, and only the pattern owning each trigger is matched there
+(``scripts/benchmark_bid_room_evidence.py`` compares it with the original
+per-pattern scan).
 
 Requires ``E2B_API_KEY``; Cohere analysis inside the sandbox additionally
 requires ``COHERE_API_KEY`` (see :func:`has_e2b_api_key` /
@@ -60,6 +92,15 @@ COHERE_CHAT_URL = "https://api.cohere.com/v2/chat"
 MAX_ATTACHMENTS = 5
 MAX_FILE_BYTES = 25 * 1024 * 1024
 MAX_COHERE_CHARS = 80_000
+DOWNLOAD_CONCURRENCY = 3
+DOC_TIME_BUDGET_SECONDS = 90
+# Stamped into every artifact; part of the bid-room cache key, so bump it when
+# the artifact shape changes in a way cached results should not survive.
+PROCESSOR_VERSION = "workspacealberta-e2b-bid-room-v1"
+PROCESSOR_MAIN_MARKER = "# ---- processor main ----"
+# Names the extract_* text output; keys the host-side extraction cache, so
+# bump it whenever an extractor's output for the same bytes would change.
+EXTRACTOR_VERSION = "workspacealberta-extract-v1"
 REQUIRED_COHERE_FIELDS = (
     "bid_recommendation",
     "fit_score",
@@ -122,15 +163,26 @@ SAMPLE_DOCUMENTS = [
 ]
 
 
+# Where _run_e2b_payload writes the payload inside the sandbox, and the cap on
+# the command string, kept well under Linux's 128 KiB MAX_ARG_STRLEN.
+SANDBOX_PAYLOAD_PATH = "/tmp/workspacealberta-bid-room-payload.json"
+MAX_COMMAND_BYTES = 96 * 1024
+
+
 SANDBOX_PROCESSOR = r"""
+import bisect
 import hashlib
 import html
 import json
+import math
+import multiprocessing
 import os
 import re
 import subprocess
 import sys
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from urllib.error import HTTPError, URLError
@@ -138,7 +190,12 @@ from urllib.parse import unquote, urlparse
 from urllib.request import Request, urlopen
 
 payload = json.loads(__PAYLOAD_JSON__)
-work_dir = Path("/tmp/workspacealberta-bid-room")
+# The host-side local runner points these at a private temp dir, an
+# attachment directory, and offline/no-pip mode; E2B uses the defaults.
+work_dir = Path(os.environ.get("BID_ROOM_WORK_DIR") or "/tmp/workspacealberta-bid-room")
+FILE_ROOT = os.environ.get("BID_ROOM_FILE_ROOT", "")
+OFFLINE = os.environ.get("BID_ROOM_OFFLINE") == "1"
+ALLOW_PIP = os.environ.get("BID_ROOM_NO_PIP") != "1"
 download_dir = work_dir / "downloads"
 extract_dir = work_dir / "extract"
 download_dir.mkdir(parents=True, exist_ok=True)
@@ -148,7 +205,44 @@ MAX_FILE_BYTES = int(payload.get("limits", {}).get("max_file_bytes", 25 * 1024 *
 MAX_COHERE_CHARS = int(payload.get("limits", {}).get("max_cohere_chars", 80000))
 MAX_ZIP_MEMBERS = 12
 MAX_DOC_CHARS = 24000
+DOWNLOAD_CONCURRENCY = max(1, int(payload.get("limits", {}).get("download_concurrency", 3)))
+DOC_TIME_BUDGET_SECONDS = float(payload.get("limits", {}).get("doc_time_budget_seconds", 90))
+EXTRACT_GRACE_SECONDS = 15
+STREAM_CHUNK_BYTES = 256 * 1024
+# Zip-bomb guards: per-member expansion ratio and total bytes unpacked per archive.
+MAX_ZIP_RATIO = 100
+MAX_ZIP_TOTAL_BYTES = 4 * MAX_FILE_BYTES
+ZIP_RATIO_GRACE_BYTES = 1024 * 1024
 USER_AGENT = "WorkspaceAlberta-BidRoom/0.1"
+# Soft per-document deadline, set by extract_with_budget in whichever
+# process runs the extraction. Extractors stop early and flag the text as
+# partial instead of blowing the whole command timeout on one document.
+EXTRACT_DEADLINE = None
+EXTRACT_PARTIAL = False
+# Host-supplied extraction cache: text already extracted from attachments
+# with these SHA-256s. Matching downloads skip parsing; new extractions are
+# returned in the artifact so the host can cache them.
+EXTRACTION_CACHE_ENABLED = bool(payload.get("extraction_cache"))
+EXTRACTION_CACHE = {
+    str(entry.get("sha256", "")): entry
+    for entry in payload.get("extraction_cache", {}).get("entries", [])
+    if entry.get("sha256")
+}
+# BM25 passage index for search_extracted_documents, built on first use.
+PASSAGE_CHARS = 900
+PASSAGE_OVERLAP = 300
+BM25_K1 = 1.2
+BM25_B = 0.75
+PASSAGE_INDEX = None
+# Evidence packing for the model prompt (see pack_text_for_model).
+PACK_PASSAGE_CHARS = 1200
+PACK_GAP = "\n[...]\n"
+SHINGLE_WORDS = 5
+NEAR_DUPLICATE_JACCARD = 0.8
+# Cohere tool loop: model turns before falling back to synthesis, and tool
+# calls executed per turn.
+MAX_COHERE_TURNS = 4
+MAX_TOOL_CALLS_PER_TURN = 4
 REQUIRED_COHERE_FIELDS = (
     "bid_recommendation",
     "fit_score",
@@ -167,6 +261,8 @@ def ensure_package(import_name, package_name=None):
         return
     except ImportError:
         pass
+    if not ALLOW_PIP:
+        raise RuntimeError(f"{package_name or import_name} is not installed and pip installs are disabled")
     subprocess.run(
         [sys.executable, "-m", "pip", "install", "-q", package_name or import_name],
         check=True,
@@ -186,23 +282,62 @@ def sha256_bytes(data):
     return hashlib.sha256(data).hexdigest()
 
 
-def read_url(url):
+def out_of_time():
+    global EXTRACT_PARTIAL
+    if EXTRACT_DEADLINE is not None and time.monotonic() >= EXTRACT_DEADLINE:
+        EXTRACT_PARTIAL = True
+        return True
+    return False
+
+
+def url_error(url):
+    # http(s) only, unless the local runner allows file:// under FILE_ROOT;
+    # a tender must never be able to point the processor at host files.
+    parsed = urlparse(url)
+    if parsed.scheme in ("http", "https"):
+        return "network access is disabled" if OFFLINE else ""
+    if parsed.scheme == "file" and FILE_ROOT:
+        root = Path(FILE_ROOT).resolve()
+        target = Path(unquote(parsed.path)).resolve()
+        if target == root or root in target.parents:
+            return ""
+        return "file URL is outside the attachment directory"
+    return f"unsupported URL scheme: {parsed.scheme or 'none'}"
+
+
+def download_to_path(url, path):
+    # Stream to disk in chunks, hashing as we go, so memory stays flat no
+    # matter how large the attachment is. Returns (bytes, sha256, headers, error).
+    error = url_error(url)
+    if error:
+        return 0, "", {}, error
     request = Request(url, headers={"User-Agent": USER_AGENT, "Accept": "*/*"})
+    digest = hashlib.sha256()
+    total = 0
     try:
         with urlopen(request, timeout=90) as response:
             content_length = response.headers.get("Content-Length")
             if content_length and int(content_length) > MAX_FILE_BYTES:
-                return None, response.headers, f"file too large from content-length: {content_length}"
-            data = response.read(MAX_FILE_BYTES + 1)
-            if len(data) > MAX_FILE_BYTES:
-                return None, response.headers, f"file exceeded {MAX_FILE_BYTES} byte limit"
-            return data, response.headers, ""
+                return 0, "", response.headers, f"file too large from content-length: {content_length}"
+            with open(path, "wb") as handle:
+                while True:
+                    chunk = response.read(STREAM_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    total += len(chunk)
+                    if total > MAX_FILE_BYTES:
+                        raise OverflowError(f"file exceeded {MAX_FILE_BYTES} byte limit")
+                    digest.update(chunk)
+                    handle.write(chunk)
+            return total, digest.hexdigest(), response.headers, ""
     except HTTPError as exc:
-        return None, {}, f"HTTP {exc.code}"
+        error = f"HTTP {exc.code}"
     except URLError as exc:
-        return None, {}, f"URL error: {exc.reason}"
+        error = f"URL error: {exc.reason}"
     except Exception as exc:
-        return None, {}, str(exc)
+        error = str(exc)
+    path.unlink(missing_ok=True)
+    return 0, "", {}, error
 
 
 def decode_text(data):
@@ -231,6 +366,8 @@ def extract_pdf(path):
     reader = PdfReader(str(path))
     pages = []
     for page in reader.pages[:80]:
+        if out_of_time():
+            break
         pages.append(page.extract_text() or "")
         if sum(len(item) for item in pages) >= MAX_DOC_CHARS:
             break
@@ -244,6 +381,8 @@ def extract_docx(path):
     doc = docx.Document(str(path))
     parts = [para.text for para in doc.paragraphs if para.text.strip()]
     for table in doc.tables[:20]:
+        if out_of_time():
+            break
         for row in table.rows[:100]:
             cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
             if cells:
@@ -258,9 +397,11 @@ def extract_xlsx(path):
     wb = openpyxl.load_workbook(str(path), read_only=True, data_only=True)
     rows = []
     for sheet in wb.worksheets[:8]:
+        if out_of_time():
+            break
         rows.append(f"Sheet: {sheet.title}")
         for index, row in enumerate(sheet.iter_rows(values_only=True), 1):
-            if index > 250:
+            if index > 250 or (index % 50 == 0 and out_of_time()):
                 break
             cells = [str(cell) for cell in row if cell not in (None, "")]
             if cells:
@@ -282,22 +423,63 @@ def extract_from_path(path, content_type=""):
         return html_to_text(path.read_text(encoding="utf-8", errors="replace"))
     if suffix in {".txt", ".md", ".csv", ".json", ".xml"}:
         return path.read_text(encoding="utf-8", errors="replace")
-    data = path.read_bytes()
-    if b"\x00" not in data[:2048]:
-        return decode_text(data)
+    with open(path, "rb") as handle:
+        head = handle.read(2048)
+    if b"\x00" not in head:
+        return decode_text(path.read_bytes())
     raise ValueError(f"unsupported file type: {suffix or content_type or 'unknown'}")
 
 
+class ZipBudgetExceeded(OverflowError):
+    pass
+
+
+def copy_zip_member(archive, member, target, budget):
+    # Declared sizes in the central directory can lie, so the limits are
+    # enforced on the bytes actually inflated, chunk by chunk.
+    ratio_floor = max(member.compress_size, 1)
+    written = 0
+    with archive.open(member) as source, open(target, "wb") as handle:
+        while True:
+            chunk = source.read(STREAM_CHUNK_BYTES)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > budget:
+                raise ZipBudgetExceeded(f"archive exceeded {MAX_ZIP_TOTAL_BYTES} byte total unpack limit")
+            if written > MAX_FILE_BYTES:
+                raise OverflowError(f"member exceeded {MAX_FILE_BYTES} byte unpack limit")
+            if written > max(ratio_floor * MAX_ZIP_RATIO, ZIP_RATIO_GRACE_BYTES):
+                raise OverflowError(f"member exceeded {MAX_ZIP_RATIO}:1 compression ratio")
+            handle.write(chunk)
+    return written
+
+
 def extract_zip(path):
     outputs = []
+    remaining = MAX_ZIP_TOTAL_BYTES
     with zipfile.ZipFile(path) as archive:
         for member in archive.infolist()[:MAX_ZIP_MEMBERS]:
-            if member.is_dir() or member.file_size > MAX_FILE_BYTES:
+            if out_of_time():
+                break
+            if member.is_dir():
+                continue
+            declared_ratio = member.file_size / max(member.compress_size, 1)
+            if member.file_size > MAX_FILE_BYTES or (
+                member.file_size > ZIP_RATIO_GRACE_BYTES and declared_ratio > MAX_ZIP_RATIO
+            ):
+                outputs.append(f"--- {member.filename} ---\n[Skipped: exceeds zip size or ratio limits]")
                 continue
             member_name = safe_name(member.filename, "zip_member")
             target = extract_dir / f"{path.stem}_{member_name}"
-            with archive.open(member) as source:
-                target.write_bytes(source.read(MAX_FILE_BYTES + 1))
+            try:
+                remaining -= copy_zip_member(archive, member, target, remaining)
+            except OverflowError as exc:
+                target.unlink(missing_ok=True)
+                outputs.append(f"--- {member.filename} ---\n[Skipped: {exc}]")
+                if isinstance(exc, ZipBudgetExceeded):
+                    break
+                continue
             try:
                 text = extract_from_path(target)
                 if text.strip():
@@ -313,49 +495,264 @@ def extract_document_text(path, content_type=""):
     return extract_from_path(path, content_type)
 
 
+def extract_with_budget(path_text, content_type, budget_seconds):
+    global EXTRACT_DEADLINE, EXTRACT_PARTIAL
+    EXTRACT_DEADLINE = time.monotonic() + budget_seconds
+    EXTRACT_PARTIAL = False
+    try:
+        text = extract_document_text(Path(path_text), content_type)
+    finally:
+        EXTRACT_DEADLINE = None
+    return text, EXTRACT_PARTIAL
+
+
+def prepare_extractors(downloads):
+    # Install parser packages once in the parent; concurrent pip installs from
+    # pool workers would race each other.
+    kinds = {".pdf": "pdf", ".docx": "docx", ".xlsx": "xlsx"}
+    needed = set()
+    for _record, path, content_type in downloads:
+        suffix = path.suffix.lower()
+        if suffix == ".zip" or "zip" in content_type:
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    names = archive.namelist()[:MAX_ZIP_MEMBERS]
+            except Exception:
+                continue
+            needed.update(kinds[Path(name).suffix.lower()] for name in names if Path(name).suffix.lower() in kinds)
+        elif "pdf" in content_type:
+            needed.add("pdf")
+        elif suffix in kinds:
+            needed.add(kinds[suffix])
+    try:
+        if "pdf" in needed:
+            ensure_package("cryptography")
+            ensure_package("pypdf")
+        if "docx" in needed:
+            ensure_package("docx", "python-docx")
+        if "xlsx" in needed:
+            ensure_package("openpyxl")
+    except Exception as exc:
+        warnings.append(f"Extractor package install failed: {exc}")
+
+
+def download_attachment(index, attachment):
+    url = attachment.get("url", "")
+    name = attachment.get("name") or safe_name(url, f"attachment-{index}")
+    record = {
+        "name": name,
+        "source": attachment.get("kind", "attachment"),
+        "url": url,
+        "bytes": 0,
+        "sha256": "",
+        "etag": "",
+        "last_modified": "",
+        "status": "pending",
+        "text": "",
+        "text_length": 0,
+        "error": "",
+        "cache": "",
+    }
+    # Index prefix keeps same-named attachments from overwriting each other.
+    path = download_dir / f"{index:02d}-{safe_name(name or url, f'attachment-{index}')}"
+    size, digest, headers, error = download_to_path(url, path)
+    if error:
+        record["status"] = "download_failed"
+        record["error"] = error
+        return record, None, ""
+    record["bytes"] = size
+    record["sha256"] = digest
+    record["etag"] = str(headers.get("ETag") or "")
+    record["last_modified"] = str(headers.get("Last-Modified") or "")
+    cached = EXTRACTION_CACHE.get(digest)
+    if cached:
+        record["text"] = str(cached.get("text", ""))[:MAX_DOC_CHARS]
+        record["text_length"] = int(cached.get("text_length") or len(record["text"]))
+        record["status"] = str(cached.get("status") or "extracted")
+        record["cache"] = "hit"
+        path.unlink(missing_ok=True)
+        return record, None, ""
+    if EXTRACTION_CACHE_ENABLED:
+        record["cache"] = "miss"
+    return record, path, str(headers.get("Content-Type", ""))
+
+
+def extraction_pool(size):
+    if size < 2:
+        return None
+    try:
+        # Fork: the processor runs from stdin, so spawn could not re-import it.
+        return multiprocessing.get_context("fork").Pool(processes=size)
+    except Exception as exc:
+        warnings.append(f"Parallel extraction unavailable, extracting serially: {exc}")
+        return None
+
+
+def extract_downloads(downloads):
+    pending = [item for item in downloads if item[1] is not None]
+    prepare_extractors(pending)
+    size = min(len(pending), os.cpu_count() or 1)
+    pool = extraction_pool(size)
+    jobs = []
+    if pool is not None:
+        jobs = [
+            pool.apply_async(extract_with_budget, (str(path), content_type, DOC_TIME_BUDGET_SECONDS))
+            for _record, path, content_type in pending
+        ]
+        waves = -(-len(pending) // size)
+        hard_deadline = time.monotonic() + waves * DOC_TIME_BUDGET_SECONDS + EXTRACT_GRACE_SECONDS
+    try:
+        for position, (record, path, content_type) in enumerate(pending):
+            try:
+                if pool is None:
+                    text, partial = extract_with_budget(str(path), content_type, DOC_TIME_BUDGET_SECONDS)
+                else:
+                    text, partial = jobs[position].get(timeout=max(1.0, hard_deadline - time.monotonic()))
+                record["text"] = text[:MAX_DOC_CHARS]
+                record["text_length"] = len(text)
+                if not text.strip():
+                    record["status"] = "empty"
+                else:
+                    record["status"] = "partial" if partial else "extracted"
+                if partial:
+                    record["error"] = f"stopped at the {DOC_TIME_BUDGET_SECONDS:g}s extraction budget"
+            except multiprocessing.TimeoutError:
+                record["status"] = "extract_timeout"
+                record["error"] = f"extraction exceeded the {DOC_TIME_BUDGET_SECONDS:g}s budget"
+            except Exception as exc:
+                record["status"] = "extract_failed"
+                record["error"] = str(exc)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
 def normalize_line(text):
     return " ".join(str(text).split())
 
 
+REQUIREMENT_PATTERNS = [
+    r"\bmust\b[^.\n]{0,360}[.\n]",
+    r"\bshall\b[^.\n]{0,360}[.\n]",
+    r"\bmandatory\b[^.\n]{0,360}[.\n]",
+    r"\brequired\b[^.\n]{0,360}[.\n]",
+    r"\binsurance\b[^.\n]{0,360}[.\n]",
+    r"\bbond(?:ing)?\b[^.\n]{0,360}[.\n]",
+    r"\bcertification\b[^.\n]{0,360}[.\n]",
+    r"\bsafety\b[^.\n]{0,360}[.\n]",
+    r"\bsecurity clearance\b[^.\n]{0,360}[.\n]",
+]
+DEADLINE_PATTERNS = [
+    r"(?:closing date|closing|site meeting|questions? must be submitted|deadline|due date)[: ]+[^.\n]{0,240}[.\n]?",
+    r"\b20\d{2}-\d{2}-\d{2}(?:[T ][0-9:]{4,8})?",
+]
+EVIDENCE_PATTERNS = (
+    [("requirement", re.compile(pattern, re.IGNORECASE)) for pattern in REQUIREMENT_PATTERNS]
+    + [("deadline", re.compile(pattern, re.IGNORECASE)) for pattern in DEADLINE_PATTERNS]
+)
+# Literal triggers each evidence pattern starts with, keyed by its index in
+# EVIDENCE_PATTERNS. No two patterns share a trigger start, so the trigger
+# that fires at a position names the only pattern that can match there.
+EVIDENCE_TRIGGERS = (
+    "must", "shall", "mandatory", "required", "insurance", "bond", "certification",
+    "safety", "security clearance", "closing|site meeting|question|deadline|due date", r"20\d\d-",
+)
+TRIGGER_INDEX = {
+    literal: index
+    for index, trigger in enumerate(EVIDENCE_TRIGGERS[:-1])
+    for literal in trigger.split("|")
+}
+DATE_TRIGGER = re.compile(EVIDENCE_TRIGGERS[-1])
+
+
+def compile_trigger(keywords, ignore_case=False):
+    # One alternation of plain literals: evidence triggers first, then profile
+    # keywords. Without capture groups or lookahead, re keeps its literal
+    # prefix scan, which is what makes a single pass cheaper than eleven.
+    parts = list(EVIDENCE_TRIGGERS)
+    parts.extend(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+    return re.compile("|".join(parts), re.IGNORECASE if ignore_case else 0)
+
+
+def trigger_index(matched):
+    index = TRIGGER_INDEX.get(matched)
+    if index is None and DATE_TRIGGER.fullmatch(matched):
+        index = len(EVIDENCE_TRIGGERS) - 1
+    return index
+
+
+def scan_evidence(text, keywords, triggers=None):
+    # One pass over the text. Returns tagged spans
+    # (kind, pattern_index, start, end, matched_text) and the keywords found.
+    # Each pattern keeps its own resume offset so its matches are exactly the
+    # non-overlapping ones re.finditer would return.
+    lowered = text.lower()
+    if text.isascii():
+        # ASCII text lowers in place, so offsets into ``lowered`` are offsets
+        # into ``text`` and a case-sensitive scan finds what IGNORECASE would.
+        scan_text = lowered
+        fused = keywords
+        if triggers is None:
+            triggers = compile_trigger(fused)
+    else:
+        # Case folding can change lengths or match differently from
+        # str.lower(); scan the original and check keywords separately.
+        scan_text = text
+        fused = []
+        triggers = compile_trigger(fused, ignore_case=True)
+    found = {keyword for keyword in keywords if keyword not in fused and keyword in lowered}
+    by_initial = {}
+    for keyword in fused:
+        by_initial.setdefault(keyword[0], []).append(keyword)
+    resume = [0] * len(EVIDENCE_PATTERNS)
+    spans = []
+    search = triggers.search
+    hit = search(scan_text)
+    while hit:
+        position = hit.start()
+        index = trigger_index(hit.group().lower())
+        if index is not None and position >= resume[index]:
+            kind, pattern = EVIDENCE_PATTERNS[index]
+            match = pattern.match(text, position)
+            if match:
+                spans.append((kind, index, match.start(), match.end(), match.group(0)))
+                resume[index] = match.end() if match.end() > position else position + 1
+        # A keyword can start where a trigger fired, or inside a longer one.
+        candidates = by_initial.get(scan_text[position])
+        if candidates:
+            hits = [keyword for keyword in candidates if scan_text.startswith(keyword, position)]
+            if hits:
+                found.update(hits)
+                by_initial[scan_text[position]] = [keyword for keyword in candidates if keyword not in found]
+        # Resume one character on rather than after the hit, so triggers and
+        # keywords that start inside it are still seen.
+        hit = search(scan_text, position + 1)
+    return spans, found
+
+
 def extract_evidence(text_documents, profile):
-    requirement_patterns = [
-        r"\bmust\b[^.\n]{0,360}[.\n]",
-        r"\bshall\b[^.\n]{0,360}[.\n]",
-        r"\bmandatory\b[^.\n]{0,360}[.\n]",
-        r"\brequired\b[^.\n]{0,360}[.\n]",
-        r"\binsurance\b[^.\n]{0,360}[.\n]",
-        r"\bbond(?:ing)?\b[^.\n]{0,360}[.\n]",
-        r"\bcertification\b[^.\n]{0,360}[.\n]",
-        r"\bsafety\b[^.\n]{0,360}[.\n]",
-        r"\bsecurity clearance\b[^.\n]{0,360}[.\n]",
-    ]
-    deadline_patterns = [
-        r"(?:closing date|closing|site meeting|questions? must be submitted|deadline|due date)[: ]+[^.\n]{0,240}[.\n]?",
-        r"\b20\d{2}-\d{2}-\d{2}(?:[T ][0-9:]{4,8})?",
-    ]
     requirements = []
     deadlines = []
     matched_terms = set()
     keywords = [str(word).lower() for word in profile.get("keywords", []) if str(word).strip()]
-    text_for_model = []
+    triggers = compile_trigger(keywords)
+    document_spans = []
 
     for document in text_documents:
         text = document.get("text", "")
-        lowered = text.lower()
-        for keyword in keywords:
-            if keyword in lowered:
-                matched_terms.add(keyword)
-        for pattern in requirement_patterns:
-            for match in re.finditer(pattern, text, flags=re.IGNORECASE):
-                line = normalize_line(match.group(0))
-                if line:
-                    requirements.append({"source": document["name"], "text": line[:500]})
-        for pattern in deadline_patterns:
-            for match in re.finditer(pattern, text, flags=re.IGNORECASE):
-                line = normalize_line(match.group(0))
-                if line:
-                    deadlines.append({"source": document["name"], "text": line[:400]})
-        text_for_model.append(f"## {document['name']}\n{text[:MAX_DOC_CHARS]}")
+        spans, found = scan_evidence(text, keywords, triggers)
+        matched_terms.update(found)
+        document_spans.append(spans)
+        # Pattern-major order, as when each pattern was scanned separately.
+        for kind, _index, _start, _end, matched in sorted(spans, key=lambda span: (span[1], span[2])):
+            line = normalize_line(matched)
+            if not line:
+                continue
+            if kind == "requirement":
+                requirements.append({"source": document["name"], "text": line[:500]})
+            else:
+                deadlines.append({"source": document["name"], "text": line[:400]})
 
     def dedupe(items):
         seen = set()
@@ -368,14 +765,130 @@ def extract_evidence(text_documents, profile):
             output.append(item)
         return output
 
+    text_for_model, packing = pack_text_for_model(text_documents, document_spans, keywords)
     return {
         "requirements": dedupe(requirements)[:80],
         "deadlines": dedupe(deadlines)[:40],
         "matched_terms": sorted(matched_terms),
-        "text_for_model": "\n\n".join(text_for_model)[:MAX_COHERE_CHARS],
+        "text_for_model": text_for_model,
+        "packing": packing,
     }
 
 
+def shingles(text):
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {tuple(words)} if words else set()
+    return {tuple(words[index:index + SHINGLE_WORDS]) for index in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def near_duplicate(candidate, packed):
+    if not candidate:
+        return False
+    for other in packed:
+        overlap = len(candidate & other)
+        if overlap and overlap / (len(candidate) + len(other) - overlap) >= NEAR_DUPLICATE_JACCARD:
+            return True
+    return False
+
+
+def pack_text_for_model(text_documents, document_spans, keywords):
+    # Fit the model prompt to MAX_COHERE_CHARS by evidence density rather
+    # than document order: split each document into passages, score them by
+    # requirement/deadline spans and keyword hits per character, keep each
+    # document's opening passage for coverage, then add the densest passages
+    # until the budget is spent, skipping near-duplicates (shared boilerplate
+    # repeated across addenda). Chosen passages go back in document order.
+    sections = [(document, document.get("text", "")[:MAX_DOC_CHARS]) for document in text_documents]
+    source_chars = sum(len(f"## {document['name']}\n{text}") for document, text in sections) + 2 * max(0, len(sections) - 1)
+    stats = {
+        "budget_chars": MAX_COHERE_CHARS,
+        "source_chars": source_chars,
+        "documents_total": len(sections),
+    }
+    if source_chars <= MAX_COHERE_CHARS:
+        text = "\n\n".join(f"## {document['name']}\n{body}" for document, body in sections)
+        stats.update({
+            "packed_chars": len(text),
+            "estimated_tokens": (len(text) + 3) // 4,
+            "documents_included": len(sections),
+            "passages_total": 0,
+            "passages_packed": 0,
+            "duplicates_skipped": 0,
+            "truncated": False,
+        })
+        return text, stats
+
+    candidates = []
+    for document_index, ((document, text), spans) in enumerate(zip(sections, document_spans)):
+        starts = sorted(span[2] for span in spans)
+        for start, end in passage_spans(text, PACK_PASSAGE_CHARS, 0):
+            lowered = text[start:end].lower()
+            evidence_hits = bisect.bisect_left(starts, end) - bisect.bisect_left(starts, start)
+            keyword_hits = sum(lowered.count(keyword) for keyword in keywords)
+            density = (2 * evidence_hits + keyword_hits) * 1000 / max(1, end - start)
+            candidates.append({
+                "document": document_index,
+                "start": start,
+                "end": end,
+                "density": density,
+                "opening": start == 0,
+            })
+
+    # Openings first (coverage), then the rest by density; ties keep document order.
+    order = sorted(
+        candidates,
+        key=lambda item: (not item["opening"], -item["density"], item["document"], item["start"]),
+    )
+    chosen = []
+    packed_shingles = []
+    headers = set()
+    used = 0
+    duplicates = 0
+    for item in order:
+        if not item["opening"] and item["density"] <= 0:
+            break
+        document, text = sections[item["document"]]
+        cost = item["end"] - item["start"] + len(PACK_GAP)
+        if item["document"] not in headers:
+            cost += len(f"## {document['name']}\n") + 2
+        if used + cost > MAX_COHERE_CHARS:
+            continue
+        passage_shingles = shingles(text[item["start"]:item["end"]])
+        if near_duplicate(passage_shingles, packed_shingles):
+            duplicates += 1
+            continue
+        packed_shingles.append(passage_shingles)
+        headers.add(item["document"])
+        chosen.append(item)
+        used += cost
+
+    blocks = []
+    for document_index, (document, text) in enumerate(sections):
+        picked = sorted((item for item in chosen if item["document"] == document_index), key=lambda item: item["start"])
+        if not picked:
+            continue
+        parts = []
+        previous_end = 0
+        for item in picked:
+            if parts and item["start"] != previous_end:
+                parts.append(PACK_GAP)
+            parts.append(text[item["start"]:item["end"]])
+            previous_end = item["end"]
+        blocks.append(f"## {document['name']}\n" + "".join(parts))
+    text = "\n\n".join(blocks)[:MAX_COHERE_CHARS]
+    stats.update({
+        "packed_chars": len(text),
+        "estimated_tokens": (len(text) + 3) // 4,
+        "documents_included": len(blocks),
+        "passages_total": len(candidates),
+        "passages_packed": len(chosen),
+        "duplicates_skipped": duplicates,
+        "truncated": True,
+    })
+    return text, stats
+
+
 def parse_model_json(content):
     content = content.strip()
     content = re.sub(r"<\|START_THINKING\|>.*?<\|END_THINKING\|>", "", content, flags=re.DOTALL)
@@ -434,7 +947,7 @@ COHERE_TOOLS = [
         "function": {
             "name": "search_extracted_documents",
             "description": (
-                "Search the extracted tender documents for source-grounded snippets. "
+                "Search the extracted tender documents for the best-matching source-grounded passages. "
                 "Use this before making bid/no-bid claims."
             ),
             "parameters": {
@@ -446,7 +959,7 @@ COHERE_TOOLS = [
                     },
                     "top_k": {
                         "type": "integer",
-                        "description": "Maximum number of matching snippets to return.",
+                        "description": "Maximum number of matching passages to return.",
                     },
                 },
                 "required": ["query"],
@@ -568,48 +1081,118 @@ def query_terms(query):
     return [term for term in re.findall(r"[a-z0-9]{3,}", str(query).lower()) if term]
 
 
-def best_snippet(text, terms, radius=420):
-    lowered = text.lower()
-    positions = [lowered.find(term) for term in terms if term in lowered]
-    position = min([item for item in positions if item >= 0], default=0)
-    start = max(0, position - radius)
-    end = min(len(text), position + radius)
-    return normalize_line(text[start:end])[:900]
+def passage_spans(text, size=PASSAGE_CHARS, overlap=PASSAGE_OVERLAP):
+    # Overlapping windows, nudged forward to a word start, so a requirement
+    # cut by one passage boundary is whole in the neighbouring passage.
+    # With no overlap each window ends where the next begins, tiling the text.
+    stride = size - overlap
+    start = 0
+    while start < len(text):
+        following = start + stride
+        space = text.find(" ", following, following + 40)
+        if space != -1:
+            following = space + 1
+        end = min(len(text), start + size if overlap else following)
+        yield start, end
+        if end >= len(text):
+            break
+        start = following
 
 
-def search_extracted_documents(query, top_k=4):
-    terms = query_terms(query)
-    limit = clamp_int(top_k, 4, 1, 8)
-    results = []
-    for document in documents:
+SEARCHABLE_STATUSES = {"extracted", "partial"}
+
+
+def build_passage_index(source_documents):
+    # Split every extracted (or partially extracted) document once, lowercase
+    # each passage once, and keep term frequencies plus an inverted index for
+    # BM25 scoring.
+    passages = []
+    postings = {}
+    for document in source_documents:
         text = document.get("text", "")
-        if document.get("status") != "extracted" or not text.strip():
+        if document.get("status") not in SEARCHABLE_STATUSES or not text.strip():
             continue
-        lowered = text.lower()
-        score = sum(lowered.count(term) for term in terms) if terms else 0
-        if score <= 0 and terms:
+        for start, end in passage_spans(text):
+            frequencies = {}
+            for term in query_terms(text[start:end]):
+                frequencies[term] = frequencies.get(term, 0) + 1
+            passage_id = len(passages)
+            passages.append({
+                "source": document.get("name", ""),
+                "url": document.get("url", ""),
+                "status": document.get("status", ""),
+                "offset": start,
+                "text": text[start:end],
+                "length": sum(frequencies.values()),
+            })
+            for term, count in frequencies.items():
+                postings.setdefault(term, []).append((passage_id, count))
+    total_length = sum(item["length"] for item in passages)
+    return {
+        "documents": source_documents,
+        "passages": passages,
+        "postings": postings,
+        "average_length": total_length / len(passages) if passages else 0.0,
+        "results": {},
+    }
+
+
+def passage_index():
+    global PASSAGE_INDEX
+    if PASSAGE_INDEX is None or PASSAGE_INDEX["documents"] is not documents:
+        PASSAGE_INDEX = build_passage_index(documents)
+    return PASSAGE_INDEX
+
+
+def rank_passages(index, terms):
+    passages = index["passages"]
+    average_length = index["average_length"] or 1.0
+    scores = {}
+    for term in set(terms):
+        matches = index["postings"].get(term)
+        if not matches:
             continue
-        results.append({
-            "source": document.get("name", ""),
-            "url": document.get("url", ""),
-            "status": document.get("status", ""),
-            "score": score,
-            "snippet": best_snippet(text, terms),
-        })
+        idf = math.log(1 + (len(passages) - len(matches) + 0.5) / (len(matches) + 0.5))
+        for passage_id, count in matches:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * passages[passage_id]["length"] / average_length)
+            scores[passage_id] = scores.get(passage_id, 0.0) + idf * count * (BM25_K1 + 1) / (count + norm)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def passage_result(passage, score):
+    return {
+        "source": passage["source"],
+        "url": passage["url"],
+        "status": passage["status"],
+        "score": round(score, 3),
+        "offset": passage["offset"],
+        "snippet": normalize_line(passage["text"])[:900],
+    }
+
+
+def search_extracted_documents(query, top_k=4):
+    terms = query_terms(query)
+    limit = clamp_int(top_k, 4, 1, 8)
+    index = passage_index()
+    key = (tuple(terms), limit)
+    if key in index["results"]:
+        return index["results"][key]
+    results = [
+        passage_result(index["passages"][passage_id], score)
+        for passage_id, score in rank_passages(index, terms)[:limit]
+    ]
     if not results:
-        for document in documents:
-            text = document.get("text", "")
-            if document.get("status") == "extracted" and text.strip():
-                results.append({
-                    "source": document.get("name", ""),
-                    "url": document.get("url", ""),
-                    "status": document.get("status", ""),
-                    "score": 0,
-                    "snippet": best_snippet(text, terms),
-                })
+        # Nothing matched: show the opening passage of each document instead.
+        seen = set()
+        for passage in index["passages"]:
+            if passage["source"] in seen:
+                continue
+            seen.add(passage["source"])
+            results.append(passage_result(passage, 0.0))
             if len(results) >= limit:
                 break
-    return sorted(results, key=lambda item: item["score"], reverse=True)[:limit]
+    index["results"][key] = results
+    return results
 
 
 def get_bid_evidence(evidence_bundle, section, top_k=20):
@@ -679,10 +1262,38 @@ def tool_results_message(tool_call_id, result_items):
     }
 
 
-def synthesize_from_tool_results(api_key, prompt, base_request, tool_result_evidence):
-    # Ask Cohere for the final review using plain-text tool evidence.
-    # This avoids provider-specific `role: tool` document-block validation while
-    # still forcing the first Cohere call to inspect evidence through tools.
+def cohere_usage(body):
+    usage = body.get("usage") or {}
+    tokens = usage.get("tokens") or usage.get("billed_units") or {}
+    return int(tokens.get("input_tokens") or 0), int(tokens.get("output_tokens") or 0)
+
+
+def timed_cohere_post(api_key, request_payload, trace, turn, phase, fallbacks=True):
+    # One model round trip, recorded in the trace with its latency and tokens.
+    started = time.monotonic()
+    post = cohere_post_with_fallbacks if fallbacks else cohere_post
+    body = post(api_key, request_payload)
+    input_tokens, output_tokens = cohere_usage(body)
+    trace.append({
+        "kind": "turn",
+        "name": "model_turn",
+        "turn": turn,
+        "phase": phase,
+        "elapsed_ms": round((time.monotonic() - started) * 1000),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "tool_calls": len((body.get("message") or {}).get("tool_calls") or []),
+        "result_count": 0,
+    })
+    return body
+
+
+def synthesize_from_tool_results(api_key, prompt, base_request, tool_result_evidence, trace, turn):
+    # Ask Cohere for the final review using plain-text tool evidence, which
+    # avoids provider-specific `role: tool` validation. This follows the first
+    # tool turn by default; with tool-result turns enabled it is only the
+    # fallback when the provider rejected a turn, the turn limit ran out, or
+    # the model's last message was not parseable JSON.
     synthesis_prompt = {
         **prompt,
         "tool_results": tool_result_evidence,
@@ -713,7 +1324,7 @@ def synthesize_from_tool_results(api_key, prompt, base_request, tool_result_evid
         ],
         "response_format": payload.get("cohere", {}).get("response_format", {"type": "json_object"}),
     }
-    synthesis_body = cohere_post(api_key, synthesis_request)
+    synthesis_body = timed_cohere_post(api_key, synthesis_request, trace, turn, "synthesis", fallbacks=False)
     synthesis_content = extract_message_text(synthesis_body.get("message") or {})
     if not synthesis_content:
         raise RuntimeError(
@@ -727,7 +1338,7 @@ def compact_tool_result(item):
     if not isinstance(item, dict):
         return {"value": normalize_line(str(item))[:700]}
     compact = {}
-    for key in ("source", "url", "status", "score", "snippet", "text", "section", "error"):
+    for key in ("source", "url", "status", "score", "offset", "snippet", "text", "section", "error"):
         if key not in item:
             continue
         value = item.get(key)
@@ -741,6 +1352,34 @@ def compact_tool_result(item):
     return compact
 
 
+def run_tool_calls(tool_calls, evidence_bundle):
+    # Evidence tools are read-only lookups, so one turn's calls run side by
+    # side. The passage index is built first so workers never race to build it.
+    calls = tool_calls[:MAX_TOOL_CALLS_PER_TURN]
+    passage_index()
+
+    def run(tool_call):
+        started = time.monotonic()
+        normalized, arguments, result_items = execute_tool_call(tool_call, evidence_bundle)
+        compact_results = [compact_tool_result(item) for item in result_items]
+        return normalized, arguments, compact_results, round((time.monotonic() - started) * 1000, 1)
+
+    if len(calls) < 2:
+        return [run(tool_call) for tool_call in calls]
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        return list(pool.map(run, calls))
+
+
+def parse_final_answer(message):
+    content = extract_message_text(message)
+    if not content:
+        return None
+    try:
+        return validate_cohere_analysis(parse_model_json(str(content)))
+    except ValueError:
+        return None
+
+
 def call_cohere(evidence_bundle):
     api_key = os.environ.get("COHERE_API_KEY", "").strip()
     if not api_key:
@@ -809,167 +1448,95 @@ def call_cohere(evidence_bundle):
         "p": 0.95,
         "stream": False,
     }
-    tool_request = {
+    tools = payload.get("cohere", {}).get("tools", COHERE_TOOLS)
+    response_format = payload.get("cohere", {}).get("response_format", {"type": "json_object"})
+    # Returning tool results as `role: tool` messages lets the model answer
+    # in the loop, but some providers reject those turns. Unless the payload
+    # opts in, the first turn's tool results go straight to the plain-text
+    # synthesis request instead of a second turn that may be refused.
+    tool_result_turns = bool(payload.get("cohere", {}).get("tool_result_turns"))
+    max_turns = MAX_COHERE_TURNS if tool_result_turns else 1
+    request = {
         **base_request,
         "messages": messages,
-        "tools": payload.get("cohere", {}).get("tools", COHERE_TOOLS),
+        "tools": tools,
         "tool_choice": "REQUIRED",
         "strict_tools": True,
     }
-    tool_body = cohere_post_with_fallbacks(api_key, tool_request)
-    tool_message = tool_body.get("message") or {}
-    tool_calls = [normalize_tool_call(item) for item in (tool_message.get("tool_calls") or [])]
     tool_trace = []
     tool_result_evidence = []
+    analysis = None
+    turn = 0
+    # Each turn runs the model's tool calls concurrently. With tool-result
+    # turns the compacted results go back to the model, and its own JSON
+    # answer ends the loop without a separate synthesis round trip.
+    while turn < max_turns:
+        turn += 1
+        try:
+            body = timed_cohere_post(api_key, request, tool_trace, turn, "tools")
+        except RuntimeError:
+            if turn == 1:
+                raise
+            break
+        message = body.get("message") or {}
+        tool_calls = [normalize_tool_call(item) for item in (message.get("tool_calls") or [])]
+        if not tool_calls:
+            analysis = parse_final_answer(message)
+            break
 
-    if tool_calls:
-        assistant_tool_message = {
-            "role": "assistant",
-            "tool_calls": tool_calls,
-        }
-        if tool_message.get("tool_plan"):
-            assistant_tool_message["tool_plan"] = str(tool_message.get("tool_plan"))
-        messages.append(assistant_tool_message)
-
-        for tool_call in tool_calls[:4]:
-            normalized, arguments, result_items = execute_tool_call(tool_call, evidence_bundle)
-            compact_results = [compact_tool_result(item) for item in result_items[:3]]
+        if tool_result_turns:
+            assistant_tool_message = {
+                "role": "assistant",
+                "tool_calls": tool_calls,
+            }
+            if message.get("tool_plan"):
+                assistant_tool_message["tool_plan"] = str(message.get("tool_plan"))
+            messages.append(assistant_tool_message)
+        for normalized, arguments, compact_results, elapsed_ms in run_tool_calls(tool_calls, evidence_bundle):
             tool_trace.append({
+                "kind": "tool",
+                "turn": turn,
                 "id": normalized["id"],
                 "name": normalized["function"]["name"],
                 "arguments": arguments,
-                "result_count": len(result_items),
-                "results": compact_results,
+                "elapsed_ms": elapsed_ms,
+                "result_count": len(compact_results),
+                "results": compact_results[:3],
             })
             tool_result_evidence.append({
                 "tool": normalized["function"]["name"],
                 "arguments": arguments,
-                "results": compact_results,
+                "results": compact_results[:3],
             })
-    else:
+            if tool_result_turns:
+                messages.append(tool_results_message(normalized["id"], compact_results))
+        request = {
+            **base_request,
+            "messages": messages,
+            "tools": tools,
+            "strict_tools": True,
+        }
+        if turn + 1 == max_turns:
+            request["tool_choice"] = "NONE"
+            request["response_format"] = response_format
+
+    if not tool_result_evidence:
         tool_trace.append({
+            "kind": "tool",
             "id": "",
             "name": "none",
             "arguments": {},
             "result_count": 0,
             "error": "Cohere returned no tool calls.",
         })
-
-    if tool_result_evidence:
-        return synthesize_from_tool_results(api_key, prompt, base_request, tool_result_evidence), tool_trace
-
-    final_request = {
-        **base_request,
-        "messages": messages,
-        "response_format": payload.get("cohere", {}).get("response_format", {"type": "json_object"}),
-    }
-    try:
-        final_body = cohere_post(api_key, final_request)
-    except RuntimeError:
-        final_request = {
-            **base_request,
-            "messages": messages,
-            "tools": payload.get("cohere", {}).get("tools", COHERE_TOOLS),
-            "tool_choice": "NONE",
-        }
-        final_body = cohere_post_with_fallbacks(api_key, final_request)
-
-    for _ in range(4):
-        message = final_body.get("message") or {}
-        content = extract_message_text(message)
-        if content:
-            return validate_cohere_analysis(parse_model_json(str(content))), tool_trace
-
-        followup_tool_calls = [
-            normalize_tool_call(item)
-            for item in (message.get("tool_calls") or [])
-        ]
-        if not followup_tool_calls:
-            raise RuntimeError(
-                "Cohere returned an empty final message. "
-                f"Body snippet: {json.dumps(final_body, ensure_ascii=False)[:900]}"
-            )
-
-        assistant_tool_message = {
-            "role": "assistant",
-            "tool_calls": followup_tool_calls,
-        }
-        if message.get("tool_plan"):
-            assistant_tool_message["tool_plan"] = str(message.get("tool_plan"))
-        messages.append(assistant_tool_message)
-
-        for tool_call in followup_tool_calls[:4]:
-            normalized, arguments, result_items = execute_tool_call(tool_call, evidence_bundle)
-            compact_results = [compact_tool_result(item) for item in result_items[:3]]
-            tool_trace.append({
-                "id": normalized["id"],
-                "name": normalized["function"]["name"],
-                "arguments": arguments,
-                "result_count": len(result_items),
-                "results": compact_results,
-            })
-            tool_result_evidence.append({
-                "tool": normalized["function"]["name"],
-                "arguments": arguments,
-                "results": compact_results,
-            })
-            messages.append(tool_results_message(normalized["id"], result_items))
-
-        final_request = {
-            **base_request,
-            "messages": messages,
-            "response_format": payload.get("cohere", {}).get("response_format", {"type": "json_object"}),
-        }
-        try:
-            final_body = cohere_post(api_key, final_request)
-        except RuntimeError:
-            final_request = {
-                **base_request,
-                "messages": messages,
-                "tools": payload.get("cohere", {}).get("tools", COHERE_TOOLS),
-                "tool_choice": "NONE",
-            }
-            final_body = cohere_post_with_fallbacks(api_key, final_request)
-
-    synthesis_prompt = {
-        **prompt,
-        "tool_results": tool_result_evidence,
-        "final_instruction": (
-            "The evidence-tool phase is complete. Do not request additional tools. "
-            "Return the final strict JSON object now."
-        ),
-    }
-    synthesis_request = {
-        **base_request,
-        "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "You are a Canadian public procurement bid-room analyst. "
-                    "Use the provided extracted evidence and tool results. Return only valid JSON."
-                ),
-            },
-            {
-                "role": "user",
-                "content": (
-                    "Generate the final JSON object for this bid-room review. "
-                    "The first character of your response must be `{`. "
-                    "Do not request tools and do not include markdown.\n\n"
-                    + json.dumps(synthesis_prompt, ensure_ascii=False)
-                ),
-            },
-        ],
-        "response_format": payload.get("cohere", {}).get("response_format", {"type": "json_object"}),
-    }
-    synthesis_body = cohere_post(api_key, synthesis_request)
-    synthesis_content = extract_message_text(synthesis_body.get("message") or {})
-    if not synthesis_content:
-        raise RuntimeError(
-            "Cohere did not produce a final JSON response after tool calls. "
-            f"Body snippet: {json.dumps(synthesis_body, ensure_ascii=False)[:900]}"
+    if analysis is None:
+        analysis = synthesize_from_tool_results(
+            api_key, prompt, base_request, tool_result_evidence, tool_trace, turn + 1
         )
-    return validate_cohere_analysis(parse_model_json(str(synthesis_content))), tool_trace
+    return analysis, tool_trace
 
+
+# ---- processor main ----
 documents = []
 warnings = []
 
@@ -987,39 +1554,12 @@ for inline in payload.get("documents", []):
         "error": "",
     })
 
-for index, attachment in enumerate(payload.get("attachments", [])[: int(payload.get("limits", {}).get("max_attachments", 5))], 1):
-    url = attachment.get("url", "")
-    name = attachment.get("name") or safe_name(url, f"attachment-{index}")
-    record = {
-        "name": name,
-        "source": attachment.get("kind", "attachment"),
-        "url": url,
-        "bytes": 0,
-        "sha256": "",
-        "status": "pending",
-        "text": "",
-        "text_length": 0,
-        "error": "",
-    }
-    data, headers, error = read_url(url)
-    if error:
-        record["status"] = "download_failed"
-        record["error"] = error
-        documents.append(record)
-        continue
-    record["bytes"] = len(data)
-    record["sha256"] = sha256_bytes(data)
-    path = download_dir / safe_name(name or url, f"attachment-{index}")
-    path.write_bytes(data)
-    try:
-        text = extract_document_text(path, str(headers.get("Content-Type", "")))
-        record["text"] = text[:MAX_DOC_CHARS]
-        record["text_length"] = len(text)
-        record["status"] = "extracted" if text.strip() else "empty"
-    except Exception as exc:
-        record["status"] = "extract_failed"
-        record["error"] = str(exc)
-    documents.append(record)
+attachments = payload.get("attachments", [])[: int(payload.get("limits", {}).get("max_attachments", 5))]
+if attachments:
+    with ThreadPoolExecutor(max_workers=min(DOWNLOAD_CONCURRENCY, len(attachments))) as download_pool:
+        downloads = list(download_pool.map(lambda item: download_attachment(*item), enumerate(attachments, 1)))
+    extract_downloads(downloads)
+    documents.extend(record for record, _path, _content_type in downloads)
 
 text_documents = [
     {"name": item["name"], "text": item.get("text", "")}
@@ -1028,7 +1568,10 @@ text_documents = [
 ]
 evidence = extract_evidence(text_documents, payload.get("profile", {}))
 document_summaries = [
-    {key: item.get(key) for key in ("name", "source", "url", "bytes", "sha256", "status", "text_length", "error")}
+    {
+        key: item.get(key)
+        for key in ("name", "source", "url", "bytes", "sha256", "etag", "last_modified", "status", "text_length", "error", "cache")
+    }
     for item in documents
 ]
 evidence_bundle = {
@@ -1049,7 +1592,7 @@ if payload.get("cohere", {}).get("enabled"):
     cohere_analysis, cohere_tool_calls = call_cohere(evidence_bundle)
 
 artifact = {
-    "processor": "workspacealberta-e2b-bid-room-v1",
+    "processor": "__PROCESSOR_VERSION__",
     "processed_at_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
     "opportunity": payload.get("opportunity", {}),
     "profile": payload.get("profile", {}),
@@ -1059,11 +1602,19 @@ artifact = {
         "requirements": evidence["requirements"],
         "deadlines": evidence["deadlines"],
         "text_characters_sent_to_model": len(evidence["text_for_model"]),
+        "packing": evidence["packing"],
     },
     "cohere_analysis": cohere_analysis,
     "cohere_tool_calls": cohere_tool_calls,
     "warnings": warnings,
 }
+if EXTRACTION_CACHE_ENABLED:
+    # Only complete extractions are worth caching; the host strips this.
+    artifact["extracted_texts"] = [
+        {key: item[key] for key in ("sha256", "name", "status", "text", "text_length")}
+        for item in documents
+        if item.get("cache") == "miss" and item.get("status") == "extracted"
+    ]
 
 print(json.dumps(artifact, indent=2, ensure_ascii=False))
 """
@@ -1078,6 +1629,8 @@ class BidRoomSandboxResult:
     artifact: dict[str, Any]
     stdout: str
     stderr: str
+    cached: bool = False
+    warm_start: bool = False
 
 
 def load_local_env() -> None:
@@ -1299,6 +1852,8 @@ def build_process_payload(
             "max_attachments": MAX_ATTACHMENTS,
             "max_file_bytes": MAX_FILE_BYTES,
             "max_cohere_chars": MAX_COHERE_CHARS,
+            "download_concurrency": DOWNLOAD_CONCURRENCY,
+            "doc_time_budget_seconds": DOC_TIME_BUDGET_SECONDS,
         },
         "cohere": {
             "enabled": cohere_enabled,
@@ -1306,6 +1861,7 @@ def build_process_payload(
             "endpoint": COHERE_CHAT_URL,
             "max_tokens": 2400,
             "response_format": COHERE_RESPONSE_FORMAT,
+            "tool_result_turns": False,
         },
     }
 
@@ -1346,10 +1902,40 @@ def build_sample_payload(*, cohere_enabled: bool = False) -> dict[str, Any]:
     )
 
 
-def build_sandbox_command(payload: dict[str, Any]) -> str:
-    """Build a Python command that processes a bid package inside E2B."""
+def load_processor_helpers(payload: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Exec the processor's helper definitions (not its main body) on the host.
+
+    For tests and benchmarks of in-sandbox logic such as ``extract_evidence``;
+    never used to process real attachments.
+    """
+    script = SANDBOX_PROCESSOR.split(PROCESSOR_MAIN_MARKER, 1)[0]
+    script = script.replace("__PAYLOAD_JSON__", repr(json.dumps(payload or build_sample_payload())))
+    namespace: dict[str, Any] = {"__name__": "bid_room_processor"}
+    exec(compile(script, "<bid-room-processor>", "exec"), namespace)  # noqa: S102 - our own script
+    return namespace
+
+
+def render_processor(payload: dict[str, Any]) -> str:
+    """Return ``SANDBOX_PROCESSOR`` with the payload and version substituted in."""
     script = SANDBOX_PROCESSOR.replace("__PAYLOAD_JSON__", repr(json.dumps(payload)))
-    return "python3 - <<'PY'\n" + script + "\nPY"
+    return script.replace("__PROCESSOR_VERSION__", PROCESSOR_VERSION)
+
+
+def build_sandbox_command(payload_path: str = SANDBOX_PAYLOAD_PATH) -> str:
+    """Build a Python command that processes the bid package at ``payload_path`` inside E2B.
+
+    The payload is written to the sandbox first (``sandbox.files.write``) rather
+    than inlined: with a full extraction cache it alone would push the
+    ``bash -c`` argument past the kernel's 128 KiB limit (E2BIG).
+    """
+    script = SANDBOX_PROCESSOR.replace(
+        "__PAYLOAD_JSON__", f"Path({payload_path!r}).read_text(encoding='utf-8')"
+    ).replace("__PROCESSOR_VERSION__", PROCESSOR_VERSION)
+    command = "python3 - <<'PY'\n" + script + "\nPY"
+    size = len(command.encode("utf-8"))
+    if size > MAX_COMMAND_BYTES:
+        raise ValueError(f"Sandbox command is {size} bytes; the limit is {MAX_COMMAND_BYTES}.")
+    return command
 
 
 def parse_artifact(stdout: str) -> dict[str, Any]:
@@ -1434,13 +2020,10 @@ def _run_e2b_payload(
             raise RuntimeError("COHERE_API_KEY is not configured. The prod Cohere key is not used for E2B bid-room processing.")
         envs["COHERE_API_KEY"] = cohere_key
 
-    try:
-        from e2b import Sandbox
-    except ImportError as exc:
-        raise RuntimeError("Install the E2B SDK with `python -m pip install e2b>=2.21.1`.") from exc
+    from procurement_core.sandbox_pool import lease_sandbox, release_sandbox
 
-    sandbox = Sandbox.create(
-        timeout=timeout_seconds,
+    sandbox, warm = lease_sandbox(
+        timeout_seconds=timeout_seconds,
         envs=envs,
         metadata={
             "project": "workspacealberta",
@@ -1458,8 +2041,11 @@ def _run_e2b_payload(
     stderr = ""
 
     try:
-        command = build_sandbox_command(payload)
-        command_result = sandbox.commands.run(command, timeout=command_timeout_seconds)
+        sandbox.files.write(SANDBOX_PAYLOAD_PATH, json.dumps(payload))
+        command = build_sandbox_command()
+        # Warm sandboxes were created before this request, so secrets go on
+        # the command rather than the sandbox.
+        command_result = sandbox.commands.run(command, envs=envs, timeout=command_timeout_seconds)
         stdout = _result_text(command_result, "stdout")
         stderr = _result_text(command_result, "stderr")
         artifact = validate_bid_room_artifact(
@@ -1469,7 +2055,7 @@ def _run_e2b_payload(
     finally:
         killed = False
         if not keep_alive:
-            sandbox.kill()
+            release_sandbox(sandbox)
             killed = True
 
     if artifact is None:
@@ -1480,6 +2066,7 @@ def _run_e2b_payload(
         artifact=artifact,
         stdout=stdout,
         stderr=stderr,
+        warm_start=warm,
     )
 
 
@@ -1529,9 +2116,17 @@ def render_bid_room_markdown(result: BidRoomSandboxResult) -> str:
     output += f"**Source:** {opportunity.get('source', '')}\n"
     output += f"**Title:** {opportunity.get('title', '')}\n"
     output += f"**Sandbox:** `{result.sandbox_id}`"
+    if result.warm_start:
+        output += " (warm)"
     if result.killed:
         output += " (closed)"
-    output += "\n\n"
+    output += "\n"
+    if result.cached:
+        output += (
+            f"**Cache:** reused the result processed at {artifact.get('processed_at_utc', '')} "
+            "(attachments unchanged)\n"
+        )
+    output += "\n"
 
     if analysis:
         output += "## Cohere Recommendation\n"
@@ -1556,12 +2151,34 @@ def render_bid_room_markdown(result: BidRoomSandboxResult) -> str:
 
     output += "## Evidence Processed\n"
     output += f"- **Documents:** {len(artifact.get('documents', []))}\n"
+    cache_hits = sum(1 for item in artifact.get("documents", []) if item.get("cache") == "hit")
+    if cache_hits:
+        output += f"- **Reused cached extractions:** {cache_hits}\n"
     output += f"- **Matched terms:** {', '.join(evidence.get('matched_terms', [])) or 'None'}\n"
     output += f"- **Requirement-like lines:** {len(evidence.get('requirements', []))}\n"
     output += f"- **Deadline-like lines:** {len(evidence.get('deadlines', []))}\n"
-    output += f"- **Characters sent to model:** {evidence.get('text_characters_sent_to_model', 0)}\n\n"
+    output += f"- **Characters sent to model:** {evidence.get('text_characters_sent_to_model', 0)}\n"
+    packing = evidence.get("packing") or {}
+    if packing.get("truncated"):
+        output += (
+            f"- **Prompt packing:** {packing.get('passages_packed', 0)} of {packing.get('passages_total', 0)} passages "
+            f"from {packing.get('documents_included', 0)}/{packing.get('documents_total', 0)} documents "
+            f"({packing.get('source_chars', 0)} source characters, "
+            f"{packing.get('duplicates_skipped', 0)} near-duplicates skipped)\n"
+        )
+    output += "\n"
     output += "## Cohere Tool Calls\n"
-    tool_calls = artifact.get("cohere_tool_calls") or []
+    trace = artifact.get("cohere_tool_calls") or []
+    tool_calls = [item for item in trace if item.get("kind") != "turn"]
+    turns = [item for item in trace if item.get("kind") == "turn"]
+    if turns:
+        output += (
+            f"- **Model turns:** {len(turns)} "
+            f"({sum(item.get('elapsed_ms', 0) for item in turns) / 1000:.1f}s model, "
+            f"{sum(item.get('elapsed_ms', 0) for item in tool_calls) / 1000:.2f}s tools, "
+            f"{sum(item.get('input_tokens', 0) for item in turns)} input / "
+            f"{sum(item.get('output_tokens', 0) for item in turns)} output tokens)\n"
+        )
     if tool_calls:
         for tool_call in tool_calls[:8]:
             output += (
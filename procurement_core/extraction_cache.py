@@ -0,0 +1,181 @@
+"""Content-addressed cache of text extracted from bid-room attachments.
+
+Standard terms, insurance schedules, and bid forms are attached to dozens of
+notices, and every bid room used to download and re-parse them with
+``extract_pdf``/``extract_docx``/``extract_xlsx``. The E2B sandbox is thrown
+away after each run, so this cache lives on the host and travels with the
+payload.
+
+- **Key.** An entry is the extracted text for one attachment, keyed by the
+  SHA-256 of its bytes (computed by the sandbox while streaming the
+  download) under the processor's ``EXTRACTOR_VERSION``. Bumping that
+  version starts a fresh cache directory.
+- **Before the run.** :func:`attach` adds ``payload["extraction_cache"]``:
+  the entries last seen at this bid room's attachment URLs, plus the most
+  reused entries overall (boilerplate that turns up under new URLs), within
+  a text budget. The processor still downloads and hashes every attachment,
+  but one whose digest matches an entry takes the cached text and is never
+  parsed (its summary shows ``cache: hit``).
+- **After the run.** :func:`harvest` pops the artifact's
+  ``extracted_texts`` (complete extractions only — partial, timed-out, and
+  failed documents are not cached), stores them, remembers which digest each
+  URL served, and counts how many bid rooms each digest has appeared in.
+
+Entries live as JSON under ``DATA_DIR/bid_room_extract_cache/<version>/``.
+Attachments are public tender documents, so entries are shared across
+tenants. Cache problems never fail a bid-room call: unreadable entries are
+skipped and write errors are ignored.
+
+Environment variables:
+    WA_BID_ROOM_EXTRACT_CACHE   set to 0 to disable (default on)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+CACHE_DIRNAME = "bid_room_extract_cache"
+POPULAR_ENTRIES = 8
+MAX_PAYLOAD_TEXT_CHARS = 240_000
+
+_index_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.environ.get("WA_BID_ROOM_EXTRACT_CACHE", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _cache_dir() -> Path:
+    from procurement_core import service
+    from procurement_core.e2b_bid_room import EXTRACTOR_VERSION
+
+    path = service.DATA_DIR / CACHE_DIRNAME / EXTRACTOR_VERSION
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _entry_path(sha256: str) -> Path:
+    return _cache_dir() / "texts" / sha256[:2] / f"{sha256}.json"
+
+
+def _url_path(url: str) -> Path:
+    return _cache_dir() / "urls" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _read_json(path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_json(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _is_digest(value: Any) -> bool:
+    return isinstance(value, str) and len(value) == 64 and all(char in "0123456789abcdef" for char in value)
+
+
+def get_entry(sha256: str) -> dict[str, Any] | None:
+    """Return the cached extraction for an attachment digest, if any."""
+    if not _is_digest(sha256):
+        return None
+    entry = _read_json(_entry_path(sha256))
+    if not entry or not isinstance(entry.get("text"), str):
+        return None
+    return entry
+
+
+def _load_index() -> dict[str, Any]:
+    return _read_json(_cache_dir() / "index.json") or {}
+
+
+# ============== Payload / Artifact ==============
+
+
+def attach(payload: dict[str, Any]) -> int:
+    """Add known extractions to a process payload; returns how many were attached."""
+    if not enabled():
+        return 0
+    try:
+        digests: list[str] = []
+        for attachment in payload.get("attachments", []):
+            known = _read_json(_url_path(str(attachment.get("url", ""))))
+            if known and known.get("sha256") not in digests:
+                digests.append(known["sha256"])
+        index = _load_index()
+        # Documents seen in more than one bid room are likely boilerplate.
+        popular = sorted(index, key=lambda digest: index[digest].get("seen", 0), reverse=True)
+        for digest in popular[:POPULAR_ENTRIES]:
+            if index[digest].get("seen", 0) > 1 and digest not in digests:
+                digests.append(digest)
+
+        entries = []
+        budget = MAX_PAYLOAD_TEXT_CHARS
+        for digest in digests:
+            entry = get_entry(digest)
+            if not entry or len(entry["text"]) > budget:
+                continue
+            budget -= len(entry["text"])
+            entries.append({key: entry.get(key) for key in ("sha256", "status", "text", "text_length")})
+    except OSError:
+        entries = []
+    payload["extraction_cache"] = {"entries": entries}
+    return len(entries)
+
+
+def harvest(artifact: dict[str, Any]) -> int:
+    """Store an artifact's new extractions and strip them; returns how many were stored."""
+    extracted = artifact.pop("extracted_texts", None) or []
+    if not enabled():
+        return 0
+    stored = 0
+    try:
+        for item in extracted:
+            digest = item.get("sha256")
+            if not _is_digest(digest) or item.get("status") != "extracted" or not isinstance(item.get("text"), str):
+                continue
+            _write_json(_entry_path(digest), {
+                "sha256": digest,
+                "name": str(item.get("name", "")),
+                "status": "extracted",
+                "text": item["text"],
+                "text_length": int(item.get("text_length") or len(item["text"])),
+                "stored_utc": _now(),
+            })
+            stored += 1
+
+        seen = []
+        for document in artifact.get("documents", []):
+            digest = document.get("sha256")
+            if not _is_digest(digest) or not document.get("url") or not get_entry(digest):
+                continue
+            seen.append(digest)
+            _write_json(_url_path(str(document["url"])), {"url": document["url"], "sha256": digest})
+
+        if seen:
+            with _index_lock:
+                index = _load_index()
+                for digest in seen:
+                    record = index.setdefault(digest, {"seen": 0})
+                    record["seen"] = int(record.get("seen", 0)) + 1
+                    record["last_seen_utc"] = _now()
+                _write_json(_cache_dir() / "index.json", index)
+    except OSError:
+        return stored
+    return stored
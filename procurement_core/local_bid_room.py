@@ -0,0 +1,204 @@
+"""Host-side bid-room runner: the sandbox processor without E2B.
+
+:mod:`procurement_core.e2b_bid_room` only runs ``SANDBOX_PROCESSOR`` inside an
+E2B sandbox, which needs ``E2B_API_KEY``, network access, and pip installs.
+This module runs the same script in a local subprocess instead, for
+air-gapped batch workers and local benchmarking.
+
+- **Same payload, same artifact.** :func:`run_local_bid_room_payload` takes
+  a payload from ``build_process_payload`` (or the CanadaBuys/APC builders),
+  renders the processor exactly as the E2B path does, and returns a
+  :class:`~procurement_core.e2b_bid_room.BidRoomSandboxResult` whose artifact
+  has passed ``validate_bid_room_artifact``. The ``sandbox_id`` is
+  ``local-<hex>``.
+- **Isolation.** Each run gets a private temporary working directory
+  (removed afterwards), a minimal environment (``COHERE_API_KEY`` only when
+  the payload enables Cohere), and on POSIX an address-space and CPU-time
+  ``setrlimit`` (``WA_BID_ROOM_LOCAL_MEMORY_MB``,
+  ``WA_BID_ROOM_LOCAL_CPU_SECONDS``) on top of the wall-clock timeout.
+- **Local attachments.** :func:`file_attachments` turns files on disk into
+  ``file://`` attachment entries. The processor only opens ``file://`` URLs
+  under the ``attachment_root`` passed here; without one, and always inside
+  E2B, attachments must be http(s).
+- **Offline.** ``offline=True`` refuses http(s) downloads and
+  ``allow_pip=False`` (the default) never pip-installs parsers, so PDF/DOCX/XLSX
+  extraction uses whatever ``pypdf``/``python-docx``/``openpyxl`` the host
+  already has and marks the document ``extract_failed`` otherwise.
+- **Batches.** :func:`run_local_bid_room_batch` runs several payloads on a
+  thread pool (each in its own subprocess) and returns results in input
+  order, with the exception in place of any run that failed.
+
+Environment variables:
+    WA_BID_ROOM_BACKEND              ``local`` routes the process_bid_room tool here (default ``e2b``)
+    WA_BID_ROOM_LOCAL_MEMORY_MB      address-space limit per run (default 2048; 0 = unlimited)
+    WA_BID_ROOM_LOCAL_CPU_SECONDS    CPU-time limit per run (default 600; 0 = unlimited)
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from procurement_core.e2b_bid_room import (
+    BidRoomSandboxResult,
+    load_local_env,
+    parse_artifact,
+    render_processor,
+    validate_bid_room_artifact,
+)
+
+DEFAULT_MEMORY_MB = 2048
+DEFAULT_CPU_SECONDS = 600
+MAX_BATCH_WORKERS = 16
+# Passed through so the subprocess can find Python and decode text sanely.
+PASSTHROUGH_ENV = ("PATH", "LANG", "LC_ALL", "SYSTEMROOT", "TMPDIR", "TEMP", "TMP")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def backend() -> str:
+    """Return the configured bid-room backend: ``e2b`` or ``local``."""
+    value = os.environ.get("WA_BID_ROOM_BACKEND", "e2b").strip().lower()
+    return "local" if value == "local" else "e2b"
+
+
+def file_attachments(paths: list[str | Path]) -> list[dict[str, str]]:
+    """Build attachment entries that point the processor at local files."""
+    attachments = []
+    for path in paths:
+        resolved = Path(path).resolve()
+        attachments.append({"url": resolved.as_uri(), "name": resolved.name, "kind": "local-file"})
+    return attachments
+
+
+# Applies the rlimits inside the child, then runs the processor read from
+# stdin. Unlike preexec_fn this is safe when the parent has other threads
+# (batch pool, job workers).
+_LIMITED_BOOTSTRAP = """\
+import resource, sys
+memory_mb, cpu_seconds = int(sys.argv[1]), int(sys.argv[2])
+if memory_mb:
+    resource.setrlimit(resource.RLIMIT_AS, (memory_mb * 1048576, memory_mb * 1048576))
+if cpu_seconds:
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+sys.argv = ["-"]
+exec(compile(sys.stdin.read(), "<stdin>", "exec"), {"__name__": "__main__"})
+"""
+
+
+def _processor_command(memory_mb: int, cpu_seconds: int) -> list[str]:
+    try:
+        import resource  # noqa: F401
+    except ImportError:  # Windows: rely on the wall-clock timeout alone
+        return [sys.executable, "-"]
+    if not memory_mb and not cpu_seconds:
+        return [sys.executable, "-"]
+    return [sys.executable, "-c", _LIMITED_BOOTSTRAP, str(memory_mb), str(cpu_seconds)]
+
+
+def run_local_bid_room_payload(
+    payload: dict[str, Any],
+    *,
+    command_timeout_seconds: int = 420,
+    attachment_root: str | Path | None = None,
+    offline: bool = False,
+    allow_pip: bool = False,
+    require_cohere: bool = False,
+    memory_mb: int | None = None,
+    cpu_seconds: int | None = None,
+) -> BidRoomSandboxResult:
+    """Run the bid-room processor in a local subprocess and return its validated artifact."""
+    env = {name: os.environ[name] for name in PASSTHROUGH_ENV if name in os.environ}
+    if payload.get("cohere", {}).get("enabled"):
+        load_local_env()
+        cohere_key = os.environ.get("COHERE_API_KEY", "").strip()
+        if not cohere_key:
+            raise RuntimeError("COHERE_API_KEY is not configured for local bid-room processing.")
+        env["COHERE_API_KEY"] = cohere_key
+    if memory_mb is None:
+        memory_mb = _env_int("WA_BID_ROOM_LOCAL_MEMORY_MB", DEFAULT_MEMORY_MB)
+    if cpu_seconds is None:
+        cpu_seconds = _env_int("WA_BID_ROOM_LOCAL_CPU_SECONDS", DEFAULT_CPU_SECONDS)
+
+    run_id = f"local-{uuid.uuid4().hex[:12]}"
+    with tempfile.TemporaryDirectory(prefix="wa-bid-room-") as work_dir:
+        env.update({
+            "HOME": work_dir,
+            "BID_ROOM_WORK_DIR": work_dir,
+            "BID_ROOM_FILE_ROOT": str(Path(attachment_root).resolve()) if attachment_root else "",
+            "BID_ROOM_OFFLINE": "1" if offline else "0",
+            "BID_ROOM_NO_PIP": "0" if allow_pip else "1",
+        })
+        try:
+            completed = subprocess.run(
+                _processor_command(memory_mb, cpu_seconds),
+                input=render_processor(payload),
+                capture_output=True,
+                text=True,
+                timeout=command_timeout_seconds,
+                cwd=work_dir,
+                env=env,
+            )
+        except subprocess.TimeoutExpired as exc:
+            raise RuntimeError(f"Local bid-room run exceeded {command_timeout_seconds}s.") from exc
+
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Local bid-room processor exited with status {completed.returncode}: "
+            f"{completed.stderr.strip()[-1200:]}"
+        )
+    artifact = validate_bid_room_artifact(parse_artifact(completed.stdout), require_cohere=require_cohere)
+    return BidRoomSandboxResult(
+        sandbox_id=run_id,
+        killed=True,
+        artifact=artifact,
+        stdout=completed.stdout,
+        stderr=completed.stderr,
+    )
+
+
+def run_local_bid_room_process(
+    payload: dict[str, Any],
+    *,
+    command_timeout_seconds: int = 420,
+) -> BidRoomSandboxResult:
+    """Local counterpart of ``run_live_bid_room_process``: Cohere review required."""
+    payload = dict(payload)
+    payload["cohere"] = {**payload.get("cohere", {}), "enabled": True}
+    return run_local_bid_room_payload(
+        payload,
+        command_timeout_seconds=command_timeout_seconds,
+        require_cohere=True,
+    )
+
+
+def run_local_bid_room_batch(
+    payloads: list[dict[str, Any]],
+    *,
+    workers: int = 4,
+    **options: Any,
+) -> list[BidRoomSandboxResult | Exception]:
+    """Run many payloads locally in parallel; failures are returned in place."""
+    if not payloads:
+        return []
+
+    def run_one(payload: dict[str, Any]) -> BidRoomSandboxResult | Exception:
+        try:
+            return run_local_bid_room_payload(payload, **options)
+        except Exception as exc:  # noqa: BLE001 - one bad package must not sink the batch
+            return exc
+
+    size = max(1, min(workers, MAX_BATCH_WORKERS, len(payloads)))
+    with ThreadPoolExecutor(max_workers=size, thread_name_prefix="local-bid-room") as pool:
+        return list(pool.map(run_one, payloads))
@@ -0,0 +1,242 @@
+"""DuckDB analytics store for CanadaBuys pipeline runs.
+
+Every ``pipelines/canadabuys/pipeline.py`` run used to leave another
+``filtered-<timestamp>.csv`` / ``summary-<timestamp>.json`` pair behind, so a
+question like "how did Alberta steel notices trend" meant re-parsing each
+of them. With ``--store`` the run is appended to
+``<output_dir>/canadabuys.duckdb`` instead:
+
+- ``runs`` — one row per run: ``run_id``, ``generated_at``, ``source``,
+  ``processed_total``, ``matched_total``, and the full summary as JSON.
+- ``notices`` — every matched notice once, deduplicated on reference
+  number plus amendment number (``notice_key``). A newer run replaces the
+  row and keeps ``first_seen_run``/``first_seen_at``; ``last_seen_run`` /
+  ``last_seen_at`` record the latest sighting. All CSV columns are stored
+  as text, including the ``match_*`` columns; columns first seen in a later
+  dataset are added as they appear.
+- ``run_notices`` — (``run_id``, ``notice_key``) for every notice a run
+  matched, for point-in-time and per-run counts.
+
+The filtered CSV is loaded with DuckDB's ``read_csv`` so rows never pass
+through Python. Notices without a reference or solicitation number are
+keyed by a hash of the whole row.
+
+Query from the command line (read-only, like ``opera_core.store``)::
+
+    python -m procurement_core.notice_store "SELECT count(*) FROM notices"
+    python -m procurement_core.notice_store --runs
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - exercised only without duckdb
+    duckdb = None
+
+__all__ = ["NoticeStore", "STORE_FILENAME"]
+
+STORE_FILENAME = "canadabuys.duckdb"
+REFERENCE_FIELD = "referenceNumber-numeroReference"
+SOLICITATION_FIELD = "solicitationNumber-numeroSollicitation"
+AMENDMENT_FIELD = "amendmentNumber-numeroModification"
+_READ_ONLY_KEYWORDS = ("select", "with", "describe", "show")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _key_expression(header: list[str]) -> str:
+    """SQL for notice_key over the staged rows (alias ``i``)."""
+    row_key = "'row:' || md5(to_json(i)::VARCHAR)"
+    references = [_quote(field) for field in (REFERENCE_FIELD, SOLICITATION_FIELD) if field in header]
+    if not references:
+        return row_key
+    reference = "coalesce(" + ", ".join(f"nullif(trim({column}), '')" for column in references) + ")"
+    amendment = f"coalesce(trim({_quote(AMENDMENT_FIELD)}), '')" if AMENDMENT_FIELD in header else "''"
+    return f"coalesce({reference} || '#' || {amendment}, {row_key})"
+
+
+class NoticeStore:
+    """DuckDB history of pipeline runs and deduplicated matched notices."""
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = Path(data_dir)
+
+    @property
+    def path(self) -> Path:
+        return self.data_dir / STORE_FILENAME
+
+    def append_run(self, run_id: str, csv_path: Path, summary: dict) -> int:
+        """Load a run's filtered CSV and summary; return notices stored.
+
+        Notices already in the store are replaced by this run's version.
+        """
+        with Path(csv_path).open("r", encoding="utf-8", newline="") as handle:
+            header = next(csv.reader(handle), [])
+        generated_at = summary.get("generated_at_utc") or ""
+        with self._connect() as connection:
+            # One transaction: a failure part-way must not lose stored notices
+            # or leave runs/run_notices out of step with notices.
+            connection.execute("BEGIN TRANSACTION")
+            try:
+                stored = self._append(connection, run_id, csv_path, header, generated_at, summary)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            return stored
+
+    def _append(
+        self, connection: Any, run_id: str, csv_path: Path, header: list[str], generated_at: str, summary: dict
+    ) -> int:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs (run_id VARCHAR PRIMARY KEY, generated_at TIMESTAMP,"
+            " source VARCHAR, processed_total BIGINT, matched_total BIGINT, summary JSON)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS run_notices (run_id VARCHAR, notice_key VARCHAR)"
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, CAST(nullif(?, '') AS TIMESTAMP), ?, ?, ?, ?)",
+            [
+                run_id,
+                generated_at.rstrip("Z"),
+                summary.get("source", ""),
+                summary.get("processed_total", 0),
+                summary.get("matched_total", 0),
+                json.dumps(summary, sort_keys=True),
+            ],
+        )
+        connection.execute("DELETE FROM run_notices WHERE run_id = ?", [run_id])
+        if not header:
+            return 0
+
+        columns = ", ".join(_quote(field) for field in header)
+        seen_at = f"CAST(nullif({_literal(generated_at.rstrip('Z'))}, '') AS TIMESTAMP)"
+        # Stage the CSV; a notice listed twice in one run keeps its last row.
+        connection.execute(
+            "CREATE OR REPLACE TEMP TABLE incoming AS SELECT * EXCLUDE (line) FROM ("
+            f" SELECT {_key_expression(header)} AS notice_key, row_number() OVER () AS line, {columns}"
+            f" FROM read_csv({_literal(str(csv_path))}, header = true, all_varchar = true) AS i)"
+            " QUALIFY row_number() OVER (PARTITION BY notice_key ORDER BY line DESC) = 1"
+        )
+        exists = connection.execute(
+            "SELECT count(*) FROM information_schema.tables"
+            " WHERE table_schema = 'main' AND table_name = 'notices'"
+        ).fetchone()[0]
+        if not exists:
+            connection.execute(
+                "CREATE TABLE notices AS SELECT notice_key,"
+                f" {_literal(run_id)} AS first_seen_run, {seen_at} AS first_seen_at,"
+                f" {_literal(run_id)} AS last_seen_run, {seen_at} AS last_seen_at, {columns}"
+                " FROM incoming"
+            )
+        else:
+            stored = {
+                row[0]
+                for row in connection.execute(
+                    "SELECT column_name FROM information_schema.columns"
+                    " WHERE table_schema = 'main' AND table_name = 'notices'"
+                ).fetchall()
+            }
+            for field in header:
+                if field not in stored:
+                    connection.execute(f"ALTER TABLE notices ADD COLUMN {_quote(field)} VARCHAR")
+            connection.execute(
+                "CREATE OR REPLACE TEMP TABLE merged AS SELECT i.notice_key,"
+                f" coalesce(n.first_seen_run, {_literal(run_id)}) AS first_seen_run,"
+                f" coalesce(n.first_seen_at, {seen_at}) AS first_seen_at,"
+                f" {_literal(run_id)} AS last_seen_run, {seen_at} AS last_seen_at,"
+                + ", ".join(f"i.{_quote(field)}" for field in header)
+                + " FROM incoming i LEFT JOIN notices n USING (notice_key)"
+            )
+            connection.execute("DELETE FROM notices WHERE notice_key IN (SELECT notice_key FROM incoming)")
+            connection.execute("INSERT INTO notices BY NAME SELECT * FROM merged")
+        connection.execute(
+            f"INSERT INTO run_notices SELECT {_literal(run_id)}, notice_key FROM incoming"
+        )
+        return connection.execute("SELECT count(*) FROM incoming").fetchone()[0]
+
+    def list_runs(self) -> list[dict]:
+        """Return [{'run_id', 'generated_at', 'source', 'processed_total', 'matched_total'}, ...]."""
+        if not self.path.exists():
+            return []
+        result = self.run_sql(
+            "SELECT run_id, generated_at, source, processed_total, matched_total"
+            " FROM runs ORDER BY generated_at, run_id"
+        )
+        return [dict(zip(result["columns"], row)) for row in result["rows"]]
+
+    def run_sql(self, sql: str) -> dict:
+        """Run a read-only query; return {columns, rows, rowcount}.
+
+        Only single SELECT, WITH, DESCRIBE, or SHOW statements are allowed.
+        """
+        statement = sql.strip().rstrip(";").strip()
+        keyword = statement.split(None, 1)[0].lower() if statement else ""
+        if keyword not in _READ_ONLY_KEYWORDS or ";" in statement:
+            raise ValueError(
+                "run_sql is read-only: only single SELECT/WITH/DESCRIBE/SHOW"
+                " statements are allowed"
+            )
+        with self._connect(read_only=True) as connection:
+            result = connection.execute(statement)
+            columns = [description[0] for description in result.description or []]
+            rows = [list(row) for row in result.fetchall()]
+        return {"columns": columns, "rows": rows, "rowcount": len(rows)}
+
+    def _connect(self, read_only: bool = False) -> Any:
+        if duckdb is None:
+            raise ImportError(
+                "duckdb is required for the notice store; install it with"
+                " `python -m pip install duckdb`"
+            )
+        if read_only:
+            if not self.path.exists():
+                raise FileNotFoundError(f"No notice store at {self.path}; run the pipeline with --store first")
+            return duckdb.connect(str(self.path), read_only=True)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        return duckdb.connect(str(self.path))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the CanadaBuys pipeline notice store.")
+    parser.add_argument("sql", nargs="?", help="Read-only SQL over runs, notices, and run_notices.")
+    parser.add_argument(
+        "--data-dir",
+        default=str(Path(__file__).resolve().parents[1] / "output" / "canadabuys"),
+        help="Pipeline output directory holding canadabuys.duckdb (default: output/canadabuys).",
+    )
+    parser.add_argument("--runs", action="store_true", help="List stored runs.")
+    args = parser.parse_args(argv)
+
+    store = NoticeStore(Path(args.data_dir))
+    sql = args.sql
+    if args.runs or not sql:
+        sql = "SELECT run_id, generated_at, source, processed_total, matched_total FROM runs ORDER BY generated_at, run_id"
+    try:
+        result = store.run_sql(sql)
+    except (ValueError, FileNotFoundError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    writer = csv.writer(sys.stdout)
+    writer.writerow(result["columns"])
+    writer.writerows(result["rows"])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
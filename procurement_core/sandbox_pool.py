@@ -0,0 +1,242 @@
+"""Warm E2B sandbox pool for bid-room processing.
+
+A cold bid-room run pays for ``Sandbox.create`` and then, inside the
+processor, for ``ensure_package`` pip installs of ``pypdf``,
+``cryptography``, ``python-docx``, and ``openpyxl`` before any document is
+touched. This module moves that setup off the request path.
+
+- **Warm sandboxes.** When ``WA_BID_ROOM_POOL_SIZE`` is above zero, a daemon
+  thread keeps that many sandboxes booted with the extraction packages
+  installed (:data:`WARMUP_COMMAND`). The processor's ``ensure_package`` then
+  finds them already importable.
+- **Custom template.** ``E2B_BID_ROOM_TEMPLATE`` names an E2B template with
+  the packages baked in; it is used for pooled and cold sandboxes alike, and
+  the warmup command becomes a quick import check.
+- **Lease / release.** :func:`lease_sandbox` hands out a healthy warm sandbox
+  (extending its timeout to the caller's), or creates a cold one when the
+  pool is empty or disabled. :func:`release_sandbox` kills a sandbox that ran
+  a tender — it held untrusted attachments and a tenant's profile, so it is
+  never handed to another request — and returns an unused lease to the pool.
+  Every lease wakes the refill thread.
+- **Health and idle TTL.** A warm sandbox older than
+  ``WA_BID_ROOM_POOL_IDLE_SECONDS`` or failing ``is_running()`` is killed
+  and replaced rather than leased. Pooled sandboxes are created with an E2B
+  timeout slightly longer than the idle TTL, so one the pool loses track of
+  still expires on its own.
+
+Pool failures never fail a bid-room call: a warmup or health-check error
+drops that sandbox and the caller falls back to a cold create.
+
+Environment variables:
+    WA_BID_ROOM_POOL_SIZE          warm sandboxes to keep (default 0 = off, max 8)
+    WA_BID_ROOM_POOL_IDLE_SECONDS  idle TTL before a warm sandbox is recycled (default 600)
+    E2B_BID_ROOM_TEMPLATE          optional E2B template with extraction packages preinstalled
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any
+
+DEFAULT_POOL_SIZE = 0
+MAX_POOL_SIZE = 8
+DEFAULT_IDLE_SECONDS = 600
+MAINTENANCE_INTERVAL_SECONDS = 30
+WARMUP_TIMEOUT_SECONDS = 240
+EXTRACTION_PACKAGES = ("pypdf", "cryptography", "python-docx", "openpyxl")
+WARMUP_COMMAND = (
+    "python3 -c 'import pypdf, cryptography, docx, openpyxl' 2>/dev/null"
+    " || python3 -m pip install -q " + " ".join(EXTRACTION_PACKAGES)
+)
+POOL_METADATA = {"project": "workspacealberta", "feature": "bid-room-pool"}
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_idle: deque[tuple[Any, float]] = deque()
+_creating = 0
+_worker: threading.Thread | None = None
+
+
+def _env_int(name: str, default: int, minimum: int, maximum: int) -> int:
+    try:
+        value = int(os.environ.get(name, default))
+    except ValueError:
+        return default
+    return max(minimum, min(maximum, value))
+
+
+def pool_size() -> int:
+    return _env_int("WA_BID_ROOM_POOL_SIZE", DEFAULT_POOL_SIZE, 0, MAX_POOL_SIZE)
+
+
+def idle_seconds() -> int:
+    return _env_int("WA_BID_ROOM_POOL_IDLE_SECONDS", DEFAULT_IDLE_SECONDS, 60, 3600)
+
+
+def template() -> str | None:
+    return os.environ.get("E2B_BID_ROOM_TEMPLATE", "").strip() or None
+
+
+def _sandbox_class() -> Any:
+    try:
+        from e2b import Sandbox
+    except ImportError as exc:
+        raise RuntimeError("Install the E2B SDK with `python -m pip install e2b>=2.21.1`.") from exc
+    return Sandbox
+
+
+def create_sandbox(
+    *,
+    timeout_seconds: int,
+    envs: dict[str, str] | None = None,
+    metadata: dict[str, str] | None = None,
+) -> Any:
+    """Create a cold sandbox, using the bid-room template when configured."""
+    options: dict[str, Any] = {"timeout": timeout_seconds, "envs": envs or {}, "metadata": metadata or {}}
+    if template():
+        options["template"] = template()
+    return _sandbox_class().create(**options)
+
+
+def _kill(sandbox: Any) -> None:
+    try:
+        sandbox.kill()
+    except Exception:  # noqa: BLE001 - the sandbox may already be gone
+        pass
+
+
+def _healthy(sandbox: Any) -> bool:
+    try:
+        return bool(sandbox.is_running())
+    except Exception:  # noqa: BLE001 - treat any probe error as unhealthy
+        return False
+
+
+# ============== Pool Maintenance ==============
+
+
+def _create_warm() -> Any | None:
+    sandbox = None
+    try:
+        sandbox = create_sandbox(timeout_seconds=idle_seconds() + 120, metadata=POOL_METADATA)
+        sandbox.commands.run(WARMUP_COMMAND, timeout=WARMUP_TIMEOUT_SECONDS)
+        return sandbox
+    except Exception:  # noqa: BLE001 - a failed warmup just means one fewer warm sandbox
+        if sandbox is not None:
+            _kill(sandbox)
+        return None
+
+
+def evict_expired() -> int:
+    """Kill warm sandboxes past the idle TTL; returns how many were evicted."""
+    cutoff = time.monotonic() - idle_seconds()
+    expired = []
+    with _lock:
+        while _idle and _idle[0][1] < cutoff:
+            expired.append(_idle.popleft()[0])
+    for sandbox in expired:
+        _kill(sandbox)
+    return len(expired)
+
+
+def fill() -> int:
+    """Create warm sandboxes until the pool is at size; returns how many were added."""
+    global _creating
+    added = 0
+    while True:
+        with _lock:
+            if len(_idle) + _creating >= pool_size():
+                return added
+            _creating += 1
+        sandbox = _create_warm()
+        with _lock:
+            _creating -= 1
+            if sandbox is None:
+                return added
+            _idle.append((sandbox, time.monotonic()))
+        added += 1
+
+
+def _maintain() -> None:
+    while True:
+        _wake.wait(MAINTENANCE_INTERVAL_SECONDS)
+        _wake.clear()
+        evict_expired()
+        fill()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_maintain, name="e2b-sandbox-pool", daemon=True)
+            _worker.start()
+
+
+def start() -> bool:
+    """Begin warming the pool in the background; returns False when it is off."""
+    if pool_size() <= 0 or not os.environ.get("E2B_API_KEY", "").strip():
+        return False
+    _ensure_worker()
+    _wake.set()
+    return True
+
+
+# ============== Lease / Release ==============
+
+
+def lease_sandbox(
+    *,
+    timeout_seconds: int,
+    envs: dict[str, str] | None = None,
+    metadata: dict[str, str] | None = None,
+) -> tuple[Any, bool]:
+    """Return ``(sandbox, warm)``: a healthy pooled sandbox, or a cold one."""
+    if pool_size() > 0:
+        _ensure_worker()
+        cutoff = time.monotonic() - idle_seconds()
+        while True:
+            with _lock:
+                entry = _idle.popleft() if _idle else None
+            if entry is None:
+                break
+            sandbox, created = entry
+            if created >= cutoff and _healthy(sandbox):
+                try:
+                    sandbox.set_timeout(timeout_seconds)
+                except Exception:  # noqa: BLE001 - fall through to the next candidate
+                    _kill(sandbox)
+                    continue
+                _wake.set()
+                return sandbox, True
+            _kill(sandbox)
+        _wake.set()
+    return create_sandbox(timeout_seconds=timeout_seconds, envs=envs, metadata=metadata), False
+
+
+def release_sandbox(sandbox: Any, *, used: bool = True) -> None:
+    """Kill a used sandbox, or return an unused lease to the pool."""
+    if not used and pool_size() > 0 and _healthy(sandbox):
+        with _lock:
+            if len(_idle) < pool_size():
+                _idle.append((sandbox, time.monotonic()))
+                return
+    _kill(sandbox)
+
+
+def shutdown() -> None:
+    """Kill every idle warm sandbox (used by tests and graceful shutdown)."""
+    with _lock:
+        idle = [entry[0] for entry in _idle]
+        _idle.clear()
+    for sandbox in idle:
+        _kill(sandbox)
+
+
+def stats() -> dict[str, int]:
+    """Return pool counters for health reporting."""
+    with _lock:
+        return {"size": pool_size(), "idle": len(_idle), "creating": _creating}
@@ -15,9 +15,13 @@ Layout (top to bottom):
     directory, CanadaBuys open-data URL, Cohere/Hugging Face model routes, and
     Alberta Purchasing Connection (APC) API bases and category-code maps.
 2.  **Model routing** — :func:`call_cohere_chat` prefers direct Cohere keys
-    (``COHERE_API_KEY`` then ``COHERE_PROD_API_KEY`` failover on rate/quota
-    errors, see :func:`is_cohere_limit_error`) and falls back to the Hugging
-    Face OpenAI-compatible router for the W4A4 community route.
+    (``COHERE_API_KEY`` and ``COHERE_PROD_API_KEY``, balanced by
+    ``procurement_core.cohere_keys`` with per-key circuit breakers on
+    rate/quota errors, see :func:`is_cohere_limit_error`) and falls back to
+    the Hugging Face OpenAI-compatible router for the W4A4 community route
+    when no key is set or every key is saturated.
+    :func:`stream_cohere_chat` is the streamed form: same routing, SSE deltas
+    with thinking blocks removed incrementally by :class:`ThinkingStripper`.
 3.  **Alberta Purchasing Connection client** — filter/payload builders,
     search (:func:`search_alberta_api`), public detail fetch, markdown
     renderers, and profile scoring for APC rows.
@@ -43,7 +47,7 @@ sandboxed bid-room review).
 Configuration (environment variables):
     CANADABUYS_DATA_DIR                    Cache dir (default ``~/.canadabuys/``)
     CANADABUYS_LOAD_ENV_FILE               Set 0/false to skip .env loading
-    COHERE_API_KEY / COHERE_PROD_API_KEY   Direct Cohere routes (failover order)
+    COHERE_API_KEY / COHERE_PROD_API_KEY   Direct Cohere routes (load-balanced)
     HF_TOKEN / HUGGINGFACEHUB_API_TOKEN    Hugging Face router fallback
     CANADABUYS_COHERE_MODEL                Default ``command-a-plus-05-2026``
     CANADABUYS_COHERE_REASONING_EFFORT     Only sent when explicitly set
@@ -56,12 +60,16 @@ import gzip
 import json
 import os
 import re
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar, Token
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+from procurement_core import cohere_keys, unspsc
+
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
@@ -126,6 +134,9 @@ HF_TOKEN_ENV_NAMES = (
     "HUGGINGFACEHUB_API_TOKEN",
     "HUGGING_FACE_HUB_TOKEN",
 )
+# Streaming consumer for the current tool call (see set_progress_sink). When
+# set, analyze_contract_with_cohere streams the model output into it.
+_progress_sink: ContextVar[Callable[[str], None] | None] = ContextVar("wa_progress_sink", default=None)
 MAX_CONTRACT_PROMPT_CHARS = 12000
 
 ALBERTA_APC_API_BASE = os.environ.get(
@@ -296,10 +307,17 @@ def strip_cohere_thinking(text: str) -> str:
 class CohereApiError(RuntimeError):
     """Cohere API failure with status details for controlled failover."""
 
-    def __init__(self, status_code: int, message: str, key_name: str) -> None:
+    def __init__(
+        self,
+        status_code: int,
+        message: str,
+        key_name: str,
+        retry_after: float | None = None,
+    ) -> None:
         self.status_code = status_code
         self.message = message
         self.key_name = key_name
+        self.retry_after = retry_after
         super().__init__(f"Cohere API returned HTTP {status_code}: {message[:300]}")
 
 
@@ -324,17 +342,13 @@ def is_cohere_limit_error(error: CohereApiError) -> bool:
     )
 
 
-def call_cohere_hf_chat(
+def _hf_chat_request(
     messages: list[dict[str, str]],
-    max_tokens: int = 800,
-    temperature: float = 0.2,
-) -> str:
-    """Call Command A+ through the Hugging Face OpenAI-compatible router."""
-    token, _ = get_hf_token()
-    if not token:
-        names = " or ".join(HF_TOKEN_ENV_NAMES[:2])
-        raise RuntimeError(f"Hugging Face token is not configured. Set {names}.")
-
+    max_tokens: int,
+    temperature: float,
+    token: str,
+    stream: bool = False,
+) -> Request:
     payload = {
         "model": COHERE_HF_MODEL,
         "messages": messages,
@@ -342,9 +356,9 @@ def call_cohere_hf_chat(
         "temperature": temperature,
         "top_p": 0.95,
         "reasoning_effort": "none",
-        "stream": False,
+        "stream": stream,
     }
-    request = Request(
+    return Request(
         HF_CHAT_COMPLETIONS_URL,
         data=json.dumps(payload).encode("utf-8"),
         headers={
@@ -355,9 +369,10 @@ def call_cohere_hf_chat(
         method="POST",
     )
 
+
+def _open_hf_chat(request: Request) -> Any:
     try:
-        with urlopen(request, timeout=120) as response:
-            body = json.loads(response.read().decode("utf-8"))
+        return urlopen(request, timeout=120)
     except HTTPError as exc:
         raw_body = exc.read().decode("utf-8", errors="replace")
         try:
@@ -377,6 +392,25 @@ def call_cohere_hf_chat(
     except URLError as exc:
         raise RuntimeError(f"Could not reach Hugging Face router: {exc.reason}") from exc
 
+
+def _require_hf_token() -> str:
+    token, _ = get_hf_token()
+    if not token:
+        names = " or ".join(HF_TOKEN_ENV_NAMES[:2])
+        raise RuntimeError(f"Hugging Face token is not configured. Set {names}.")
+    return token
+
+
+def call_cohere_hf_chat(
+    messages: list[dict[str, str]],
+    max_tokens: int = 800,
+    temperature: float = 0.2,
+) -> str:
+    """Call Command A+ through the Hugging Face OpenAI-compatible router."""
+    request = _hf_chat_request(messages, max_tokens, temperature, _require_hf_token())
+    with _open_hf_chat(request) as response:
+        body = json.loads(response.read().decode("utf-8"))
+
     choices = body.get("choices", [])
     if not choices:
         raise RuntimeError("Hugging Face router returned no choices.")
@@ -386,22 +420,13 @@ def call_cohere_hf_chat(
     return strip_cohere_thinking(content)
 
 
-def call_cohere_direct_chat(
+def _cohere_direct_request(
     messages: list[dict[str, str]],
-    max_tokens: int = 1200,
-    temperature: float = 0.2,
-    token: str = "",
-    key_name: str = "",
-) -> str:
-    """Call Command A+ through Cohere's OpenAI-compatible endpoint."""
-    if not token:
-        token, key_name = get_cohere_api_key()
-    if not token:
-        names = " or ".join(COHERE_API_KEY_ENV_NAMES)
-        raise RuntimeError(f"Cohere API key is not configured. Set {names}.")
-    if not key_name:
-        key_name = "Cohere API key"
-
+    max_tokens: int,
+    temperature: float,
+    token: str,
+    stream: bool = False,
+) -> Request:
     cohere_messages = [
         {
             "role": "developer" if message.get("role") == "system" else message.get("role", "user"),
@@ -415,14 +440,14 @@ def call_cohere_direct_chat(
         "max_tokens": max_tokens,
         "temperature": temperature,
         "top_p": 0.95,
-        "stream": False,
+        "stream": stream,
     }
     # Cohere's compatibility endpoint returns HTTP 500 for some prompts when
     # reasoning_effort is pinned; only send it when explicitly configured.
     reasoning_effort = os.environ.get("CANADABUYS_COHERE_REASONING_EFFORT")
     if reasoning_effort:
         payload["reasoning_effort"] = reasoning_effort
-    request = Request(
+    return Request(
         COHERE_CHAT_COMPLETIONS_URL,
         data=json.dumps(payload).encode("utf-8"),
         headers={
@@ -433,9 +458,10 @@ def call_cohere_direct_chat(
         method="POST",
     )
 
+
+def _open_cohere_direct(request: Request, key_name: str) -> Any:
     try:
-        with urlopen(request, timeout=120) as response:
-            body = json.loads(response.read().decode("utf-8"))
+        response = urlopen(request, timeout=120)
     except HTTPError as exc:
         raw_body = exc.read().decode("utf-8", errors="replace")
         try:
@@ -445,9 +471,34 @@ def call_cohere_direct_chat(
             )
         except json.JSONDecodeError:
             error_message = raw_body
-        raise CohereApiError(exc.code, error_message, key_name) from exc
+        cohere_keys.observe_headers(key_name, exc.headers)
+        retry_after = cohere_keys.parse_seconds(exc.headers.get("Retry-After")) if exc.headers else None
+        raise CohereApiError(exc.code, error_message, key_name, retry_after) from exc
     except URLError as exc:
         raise RuntimeError(f"Could not reach Cohere API: {exc.reason}") from exc
+    cohere_keys.observe_headers(key_name, getattr(response, "headers", None))
+    return response
+
+
+def call_cohere_direct_chat(
+    messages: list[dict[str, str]],
+    max_tokens: int = 1200,
+    temperature: float = 0.2,
+    token: str = "",
+    key_name: str = "",
+) -> str:
+    """Call Command A+ through Cohere's OpenAI-compatible endpoint."""
+    if not token:
+        token, key_name = get_cohere_api_key()
+    if not token:
+        names = " or ".join(COHERE_API_KEY_ENV_NAMES)
+        raise RuntimeError(f"Cohere API key is not configured. Set {names}.")
+    if not key_name:
+        key_name = "Cohere API key"
+
+    request = _cohere_direct_request(messages, max_tokens, temperature, token)
+    with _open_cohere_direct(request, key_name) as response:
+        body = json.loads(response.read().decode("utf-8"))
 
     choices = body.get("choices", [])
     if not choices:
@@ -458,36 +509,68 @@ def call_cohere_direct_chat(
     return strip_cohere_thinking(content)
 
 
+def _with_cohere_key_failover(call: Callable[[str, str], Any]) -> tuple[Any, str] | None:
+    """Run ``call(token, key_name)`` on the best available Cohere key.
+
+    Keys are ordered by :func:`cohere_keys.schedule`; a rate/quota error opens
+    that key's circuit and the next key is tried. Returns None when no key is
+    set, or when every key is saturated and a Hugging Face token is available.
+    """
+    configured = get_cohere_api_keys()
+    if not configured:
+        return None
+    primary = configured[0][1]
+    has_hf_route = bool(get_hf_token()[0])
+    candidates = cohere_keys.schedule(configured)
+    if not candidates:
+        if has_hf_route:
+            return None
+        candidates = cohere_keys.by_reopen_time(configured)
+
+    last_error: CohereApiError | None = None
+    for token, key_name in candidates:
+        cohere_keys.begin(key_name)
+        try:
+            result = call(token, key_name)
+        except CohereApiError as exc:
+            if is_cohere_limit_error(exc):
+                cohere_keys.record_outcome(key_name, "limit", exc.retry_after)
+                last_error = exc
+                continue
+            cohere_keys.record_outcome(key_name, "transient" if exc.status_code >= 500 else "rejected")
+            raise
+        except Exception:
+            cohere_keys.record_outcome(key_name, "transient")
+            raise
+        cohere_keys.record_outcome(key_name, "ok")
+        provider = "Cohere API"
+        if key_name != primary:
+            provider += f" via `{key_name}`" + (" fallback" if last_error else "")
+        return result, provider
+
+    if last_error is None or has_hf_route:
+        return None
+    raise last_error
+
+
 def call_cohere_chat(
     messages: list[dict[str, str]],
     max_tokens: int = 1200,
     temperature: float = 0.2,
 ) -> tuple[str, str, str]:
     """Call the configured Cohere route, preferring direct Cohere keys."""
-    cohere_keys = get_cohere_api_keys()
-    if cohere_keys:
-        last_error = None
-        for index, (token, key_name) in enumerate(cohere_keys):
-            try:
-                content = call_cohere_direct_chat(
-                    messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    token=token,
-                    key_name=key_name,
-                )
-                provider = "Cohere API"
-                if index > 0:
-                    provider += f" via `{key_name}` fallback"
-                return content, provider, COHERE_MODEL
-            except CohereApiError as exc:
-                last_error = exc
-                has_next_key = index + 1 < len(cohere_keys)
-                if not has_next_key or not is_cohere_limit_error(exc):
-                    raise
-
-        if last_error:
-            raise last_error
+    direct = _with_cohere_key_failover(
+        lambda token, key_name: call_cohere_direct_chat(
+            messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            token=token,
+            key_name=key_name,
+        )
+    )
+    if direct is not None:
+        content, provider = direct
+        return content, provider, COHERE_MODEL
 
     return (
         call_cohere_hf_chat(messages, max_tokens=max_tokens, temperature=temperature),
@@ -496,6 +579,157 @@ def call_cohere_chat(
     )
 
 
+# ============== Streaming Model Output ==============
+
+
+class ThinkingStripper:
+    """Incremental :func:`strip_cohere_thinking` for streamed text.
+
+    Thinking blocks are dropped as they arrive. A possible partial tag at the
+    end of a chunk, and trailing whitespace, are held back until the next
+    chunk shows what they are, so the joined output of :meth:`feed` and
+    :meth:`flush` matches ``strip_cohere_thinking`` of the whole text.
+    """
+
+    BLOCKS = (
+        ("<|START_THINKING|>", "<|END_THINKING|>"),
+        ("<START_THINKING>", "<END_THINKING>"),
+    )
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._opening = ""
+        self._closing = ""
+        self._search_from = 0
+        self._space = ""
+        self._started = False
+
+    def _visible(self, text: str) -> str:
+        # Mirror the trailing .strip(): drop leading whitespace, and hold
+        # trailing whitespace until more visible text follows it.
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+        text = self._space + text
+        stripped = text.rstrip()
+        self._space = text[len(stripped):]
+        return stripped
+
+    def _partial_tag_length(self, text: str) -> int:
+        longest_tag = max(len(opening) for opening, _ in self.BLOCKS)
+        for size in range(min(len(text), longest_tag - 1), 0, -1):
+            tail = text[-size:]
+            if any(opening.startswith(tail) for opening, _ in self.BLOCKS):
+                return size
+        return 0
+
+    def feed(self, chunk: str) -> str:
+        """Add streamed text; return the part that is safe to show."""
+        self._pending += chunk
+        output = []
+        while True:
+            if self._closing:
+                end = self._pending.find(self._closing, self._search_from)
+                if end == -1:
+                    self._search_from = max(0, len(self._pending) - len(self._closing) + 1)
+                    return "".join(output)
+                self._pending = self._pending[end + len(self._closing):]
+                self._opening = self._closing = ""
+                continue
+            starts = [
+                (index, opening, closing)
+                for opening, closing in self.BLOCKS
+                if (index := self._pending.find(opening)) != -1
+            ]
+            if starts:
+                index, self._opening, self._closing = min(starts)
+                output.append(self._visible(self._pending[:index]))
+                self._pending = self._pending[index + len(self._opening):]
+                self._search_from = 0
+                continue
+            keep = self._partial_tag_length(self._pending)
+            output.append(self._visible(self._pending[:len(self._pending) - keep]))
+            self._pending = self._pending[len(self._pending) - keep:]
+            return "".join(output)
+
+    def flush(self) -> str:
+        """Return what is left at end of stream (an unclosed block is shown, as in the full-text version)."""
+        text = self._opening + self._pending if self._closing else self._pending
+        self._pending = self._opening = self._closing = ""
+        output = self._visible(text)
+        self._space = ""
+        return output
+
+
+def iter_chat_completion_deltas(response: Any) -> Iterator[str]:
+    """Yield content deltas from an OpenAI-compatible ``text/event-stream`` body."""
+    for raw_line in response:
+        line = raw_line.decode("utf-8", errors="replace").strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            event = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+        if event.get("error"):
+            raise RuntimeError(f"Model stream failed: {str(event['error'])[:300]}")
+        for choice in event.get("choices") or []:
+            content = (choice.get("delta") or {}).get("content")
+            if isinstance(content, str) and content:
+                yield content
+
+
+def _stripped_stream(response: Any) -> Iterator[str]:
+    stripper = ThinkingStripper()
+    with response:
+        for delta in iter_chat_completion_deltas(response):
+            text = stripper.feed(delta)
+            if text:
+                yield text
+    tail = stripper.flush()
+    if tail:
+        yield tail
+
+
+def stream_cohere_chat(
+    messages: list[dict[str, str]],
+    max_tokens: int = 1200,
+    temperature: float = 0.2,
+) -> tuple[Iterator[str], str, str]:
+    """Open a streamed chat on the configured route: ``(chunks, provider, model)``.
+
+    Routing and key failover match :func:`call_cohere_chat` and happen while
+    the stream is opened, before any text is returned. Chunks arrive with
+    thinking blocks already removed.
+    """
+    direct = _with_cohere_key_failover(
+        lambda token, key_name: _open_cohere_direct(
+            _cohere_direct_request(messages, max_tokens, temperature, token, stream=True),
+            key_name,
+        )
+    )
+    if direct is not None:
+        response, provider = direct
+        return _stripped_stream(response), provider, COHERE_MODEL
+
+    request = _hf_chat_request(messages, max_tokens, temperature, _require_hf_token(), stream=True)
+    return _stripped_stream(_open_hf_chat(request)), "Hugging Face Inference Providers", COHERE_HF_MODEL
+
+
+def set_progress_sink(sink: Callable[[str], None] | None) -> Token:
+    """Route streamed tool output to ``sink`` for the current context."""
+    return _progress_sink.set(sink)
+
+
+def reset_progress_sink(token: Token) -> None:
+    _progress_sink.reset(token)
+
+
 # ============== Alberta Purchasing Connection ==============
 
 
@@ -822,6 +1056,7 @@ INDUSTRY_UNSPSC = {
     "aluminum": ["1111", "111106", "301116"],
     "construction": ["721", "301", "221", "251"],
 }
+INDUSTRY_UNSPSC_CLASSIFIER = unspsc.UnspscClassifier.from_prefixes(INDUSTRY_UNSPSC)
 
 
 def load_profile() -> dict:
@@ -938,7 +1173,7 @@ def score_contract(contract: dict, profile: dict) -> tuple[int, list[str]]:
     title = get_field(contract, "title-titre-eng", "title-titre-fra").lower()
     desc = get_field(contract, "tenderDescription-descriptionAppelOffres-eng").lower()
     regions = f"{get_field(contract, 'regionsOfOpportunity-regionAppelOffres-eng')} {get_field(contract, 'regionsOfDelivery-regionsLivraison-eng')}".lower()
-    unspsc = get_field(contract, "unspsc", "")
+    unspsc_industries = set(INDUSTRY_UNSPSC_CLASSIFIER.match(unspsc.extract_codes(get_field(contract, "unspsc", ""))))
 
     # Keyword matches in title (high value)
     title_matches = [kw for kw in keywords if kw.lower() in title]
@@ -952,14 +1187,11 @@ def score_contract(contract: dict, profile: dict) -> tuple[int, list[str]]:
         score += 5 * len(desc_matches)
         reasons.append(f"description matches: {', '.join(desc_matches[:3])}")
 
-    # UNSPSC code matches
+    # UNSPSC code matches (prefix trie over the notice's codes)
     for industry in industries:
-        prefixes = INDUSTRY_UNSPSC.get(industry, [])
-        for prefix in prefixes:
-            if prefix in unspsc:
-                score += 15
-                reasons.append(f"UNSPSC code matches {industry}")
-                break
+        if industry in unspsc_industries:
+            score += 15
+            reasons.append(f"UNSPSC code matches {industry}")
 
     # Region match
     if location:
@@ -1452,6 +1684,9 @@ TOOL_NAMES = (
     "summarize_alberta_opportunities",
     "find_alberta_opportunities",
     "process_bid_room",
+    "get_bid_room_job",
+    "process_bid_room_batch",
+    "get_bid_room_batch",
     "check_cohere_status",
     "analyze_contract_with_cohere",
     # Extension tools (procurement_core/extensions.py)
@@ -1916,7 +2151,9 @@ async def daily_bid_brief(args: dict) -> str:
 
 def process_bid_room_artifact(args: dict) -> dict[str, Any]:
     """Process a bid room in E2B and return a JSON-ready artifact envelope."""
+    from procurement_core import bid_room_cache, extraction_cache, local_bid_room
     from procurement_core.e2b_bid_room import (
+        BidRoomSandboxResult,
         build_apc_bid_room_payload,
         build_canadabuys_bid_room_payload,
         render_bid_room_markdown,
@@ -1959,17 +2196,41 @@ def process_bid_room_artifact(args: dict) -> dict[str, Any]:
             max_attachments=max_attachments,
         )
 
-    result = run_live_bid_room_process(
-        payload,
-        timeout_seconds=timeout_seconds,
-        command_timeout_seconds=command_timeout_seconds,
-        keep_alive=keep_alive,
-    )
+    # A kept-alive sandbox is for inspection, so it always runs fresh.
+    use_cache = not keep_alive and not bool(args.get("refresh", False))
+    cached = bid_room_cache.lookup(payload) if use_cache else None
+    if cached:
+        result = BidRoomSandboxResult(
+            sandbox_id=cached["sandbox_id"],
+            killed=True,
+            artifact=cached["artifact"],
+            stdout="",
+            stderr="",
+            cached=True,
+        )
+    else:
+        extraction_cache.attach(payload)
+        if local_bid_room.backend() == "local":
+            result = local_bid_room.run_local_bid_room_process(
+                payload,
+                command_timeout_seconds=command_timeout_seconds,
+            )
+        else:
+            result = run_live_bid_room_process(
+                payload,
+                timeout_seconds=timeout_seconds,
+                command_timeout_seconds=command_timeout_seconds,
+                keep_alive=keep_alive,
+            )
+        extraction_cache.harvest(result.artifact)
+        if use_cache:
+            bid_room_cache.store(payload, result.sandbox_id, result.artifact)
     if warnings:
         result.artifact.setdefault("warnings", []).extend(warnings)
     return {
         "sandbox_id": result.sandbox_id,
         "sandbox_killed": result.killed,
+        "cached": result.cached,
         "artifact": result.artifact,
         "markdown": render_bid_room_markdown(result),
     }
@@ -1978,11 +2239,58 @@ def process_bid_room_artifact(args: dict) -> dict[str, Any]:
 async def process_bid_room(args: dict) -> str:
     """Process a tender package in E2B and analyze it with Cohere inside the sandbox."""
     try:
+        if args.get("background"):
+            from procurement_core.bid_room_jobs import render_job_markdown, submit_job
+
+            record, created = submit_job(args)
+            return render_job_markdown(record, created=created)
         return process_bid_room_artifact(args)["markdown"]
     except (RuntimeError, ValueError) as exc:
         return f"Bid room processing is not available: {exc}"
 
 
+async def get_bid_room_job(args: dict) -> str:
+    """Report the status of a background bid-room job, or its result once done."""
+    from procurement_core.bid_room_jobs import get_job, render_job_markdown
+
+    job_id = str(args.get("job_id") or "").strip()
+    if not job_id:
+        return "Please provide a job_id."
+    record = get_job(job_id)
+    if record is None:
+        return f"Bid room job not found: {job_id}"
+    return render_job_markdown(record)
+
+
+async def process_bid_room_batch(args: dict) -> str:
+    """Queue bid rooms for several tenders (references, watchlist, or top matches)."""
+    from procurement_core.bid_room_batch import batch_view, render_batch_markdown, submit_batch
+
+    try:
+        record = submit_batch(args)
+    except (RuntimeError, ValueError) as exc:
+        return f"Bid room batch is not available: {exc}"
+    return render_batch_markdown(batch_view(record))
+
+
+async def get_bid_room_batch(args: dict) -> str:
+    """Report batch progress and the finished tenders ranked by fit score."""
+    from procurement_core.bid_room_batch import batch_view, get_batch, iter_batch_updates, render_batch_markdown
+
+    batch_id = str(args.get("batch_id") or "").strip()
+    if not batch_id:
+        return "Please provide a batch_id."
+    wait_seconds = clamp_int(args.get("wait_seconds"), default=0, minimum=0, maximum=300)
+    if wait_seconds:
+        # Polling sleeps between checks; keep it off the event loop (to_thread
+        # carries the tenant context along).
+        await asyncio.to_thread(lambda: list(iter_batch_updates(batch_id, timeout=wait_seconds)))
+    record = get_batch(batch_id)
+    if record is None:
+        return f"Bid room batch not found: {batch_id}"
+    return render_batch_markdown(batch_view(record))
+
+
 # ============== Alberta Purchasing Connection Handlers ==============
 
 
@@ -2200,8 +2508,12 @@ async def check_cohere_status(args: dict) -> str:
     return output
 
 
-async def analyze_contract_with_cohere(args: dict) -> str:
-    """Use Cohere Command A+ to analyze a tender notice from either source."""
+def prepare_contract_analysis(args: dict) -> dict[str, Any] | str:
+    """Build the model request for ``analyze_contract_with_cohere``.
+
+    Returns the messages plus source details, or a user-facing message when
+    the tender cannot be loaded.
+    """
     reference = args.get("reference", "")
     if not reference:
         return "Please provide a reference number."
@@ -2271,23 +2583,101 @@ async def analyze_contract_with_cohere(args: dict) -> str:
         },
     ]
 
-    try:
-        analysis, provider, model = call_cohere_chat(messages, max_tokens=max_tokens)
-    except RuntimeError as exc:
-        return f"Cohere analysis is not available: {exc}"
+    from procurement_core import cohere_cache
+
+    # The key is for the route we expect to take: Cohere when a key is set,
+    # otherwise HF. 0.2 is call_cohere_chat's (and stream_cohere_chat's)
+    # default temperature.
+    model = COHERE_MODEL if get_cohere_api_keys() else COHERE_HF_MODEL
+    return {
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "source_name": source_name,
+        "source_ref": source_ref,
+        "model": model,
+        "cache_key": cohere_cache.cache_key(model, messages, max_tokens, 0.2),
+    }
+
+
+def contract_analysis_cache_key(prepared: dict[str, Any], model: str) -> str:
+    """Return the key to cache ``prepared``'s analysis under once ``model`` answered.
+
+    When every Cohere key is saturated the request fails over to HF; that answer
+    is stored under the HF model, not the Cohere key that lookups use.
+    """
+    from procurement_core import cohere_cache
 
+    if model == prepared["model"]:
+        return prepared["cache_key"]
+    return cohere_cache.cache_key(model, prepared["messages"], prepared["max_tokens"], 0.2)
+
+
+def contract_analysis_header(
+    prepared: dict[str, Any],
+    provider: str,
+    model: str,
+    cached_utc: str = "",
+) -> str:
     output = "# Cohere Tender Analysis\n\n"
-    output += f"**Source:** {source_name}\n"
+    output += f"**Source:** {prepared['source_name']}\n"
     output += f"**Provider:** {provider}\n"
     output += f"**Model:** `{model}`\n"
-    output += f"**Reference:** `{source_ref}`\n\n"
-    output += analysis
-    output += (
-        f"\n\n---\nVerify requirements, amendments, and attachments on {source_name} "
+    output += f"**Reference:** `{prepared['source_ref']}`\n"
+    if cached_utc:
+        output += f"**Cached:** yes, analysis from {cached_utc} (pass `refresh: true` for a new one)\n"
+    return output + "\n"
+
+
+def contract_analysis_footer(prepared: dict[str, Any]) -> str:
+    return (
+        f"\n\n---\nVerify requirements, amendments, and attachments on {prepared['source_name']} "
         "before making a bid decision."
     )
 
-    return output
+
+async def analyze_contract_with_cohere(args: dict) -> str:
+    """Use Cohere Command A+ to analyze a tender notice from either source.
+
+    With a progress sink set (stdio MCP clients that send a progress token),
+    the analysis is streamed into it as it is generated.
+    """
+    from procurement_core import cohere_cache
+
+    prepared = prepare_contract_analysis(args)
+    if isinstance(prepared, str):
+        return prepared
+
+    sink = _progress_sink.get()
+    cached = None if args.get("refresh") else cohere_cache.lookup(prepared["cache_key"])
+    if cached is not None:
+        header = contract_analysis_header(prepared, cached["provider"], cached["model"], cached["stored_utc"])
+        if sink is not None:
+            sink(header + cached["content"])
+        return header + cached["content"] + contract_analysis_footer(prepared)
+
+    messages, max_tokens = prepared["messages"], prepared["max_tokens"]
+    try:
+        if sink is None:
+            analysis, provider, model = call_cohere_chat(messages, max_tokens=max_tokens)
+        else:
+            chunks, provider, model = stream_cohere_chat(messages, max_tokens=max_tokens)
+    except RuntimeError as exc:
+        return f"Cohere analysis is not available: {exc}"
+
+    header = contract_analysis_header(prepared, provider, model)
+    if sink is not None:
+        sink(header)
+        parts = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                sink(chunk)
+        except (OSError, RuntimeError) as exc:
+            interrupted = f"\n\n[Cohere stream interrupted: {exc}]"
+            return header + "".join(parts) + interrupted + contract_analysis_footer(prepared)
+        analysis = "".join(parts)
+    cohere_cache.store(contract_analysis_cache_key(prepared, model), analysis, provider, model)
+    return header + analysis + contract_analysis_footer(prepared)
 
 
 # ============== Extension Tool Bindings ==============
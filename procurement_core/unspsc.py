@@ -0,0 +1,88 @@
+"""UNSPSC code classification shared by the CSV pipeline and profile scoring.
+
+Both ``pipelines/canadabuys/pipeline.py`` (industry rules from
+``config.json``) and :func:`procurement_core.service.score_contract`
+(``INDUSTRY_UNSPSC``) ask the same question: which rules does a notice's
+UNSPSC code list hit? Testing every rule against every code costs
+O(rules × codes) per row and grows with each industry added.
+
+:class:`UnspscClassifier` compiles the rules once into a trie keyed on
+digits. Each node can carry two kinds of terminal:
+
+- **prefix** — the rule hits any code that starts with the node's path;
+- **exact** — the rule hits only a code equal to the node's path.
+
+Looking up one code walks at most its own length (8 digits for a
+commodity code), collecting prefix terminals on the way down and exact
+terminals at the end, independent of how many rules are loaded. Hits come
+back in rule insertion order, each rule at most once.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable
+
+_CODE_PATTERN = re.compile(r"[0-9]{4,8}")
+
+
+def extract_codes(value: str) -> list[str]:
+    """Return the 4–8 digit codes in a raw UNSPSC field (``*30101700``, lists, etc.)."""
+    if not value:
+        return []
+    return _CODE_PATTERN.findall(value)
+
+
+class _Node:
+    __slots__ = ("children", "exact", "prefix")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.exact: list[int] = []
+        self.prefix: list[int] = []
+
+
+class UnspscClassifier:
+    """Digit trie of exact and prefix UNSPSC rules."""
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._payloads: list[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def add(self, code: str, payload: Any, *, exact: bool = False) -> None:
+        """Register ``payload`` for codes equal to (``exact``) or starting with ``code``."""
+        digits = re.sub(r"[^0-9]", "", code or "")
+        node = self._root
+        for digit in digits:
+            node = node.children.setdefault(digit, _Node())
+        (node.exact if exact else node.prefix).append(len(self._payloads))
+        self._payloads.append(payload)
+
+    def _walk(self, code: str, hits: set[int]) -> None:
+        node = self._root
+        hits.update(node.prefix)
+        for digit in code:
+            node = node.children.get(digit)
+            if node is None:
+                return
+            hits.update(node.prefix)
+        hits.update(node.exact)
+
+    def match(self, codes: Iterable[str]) -> list[Any]:
+        """Return the payloads hit by any of ``codes``, in insertion order."""
+        hits: set[int] = set()
+        for code in codes:
+            self._walk(code, hits)
+        return [self._payloads[index] for index in sorted(hits)]
+
+    @classmethod
+    def from_prefixes(cls, prefixes_by_label: dict[str, list[str]]) -> "UnspscClassifier":
+        """Build a prefix classifier whose payloads are the mapping's labels."""
+        classifier = cls()
+        for label, prefixes in prefixes_by_label.items():
+            for prefix in prefixes:
+                classifier.add(prefix, label)
+        return classifier
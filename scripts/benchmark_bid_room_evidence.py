@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark the bid-room evidence extractor on a synthetic large tender package.
+
+Compares the processor's fused single-pass ``extract_evidence`` with the
+original one-``re.finditer``-per-pattern implementation (kept in
+``tests/evidence_reference.py`` as the golden reference), checks that
+both produce identical evidence lists, and prints per-run timings. The fused
+timing includes packing the prompt text to the character budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from procurement_core.e2b_bid_room import load_processor_helpers  # noqa: E402
+from tests.evidence_reference import evidence_lists, legacy_extract_evidence  # noqa: E402
+
+SENTENCES = [
+    "The Contractor must provide all labour, materials, and equipment for the Work.",
+    "Proponents shall submit a completed pricing form with their bid.",
+    "A mandatory site meeting will be held at the Edmonton yard.",
+    "Commercial general liability insurance of $5,000,000 is required.",
+    "A bid bond of 10% of the tendered price must accompany each submission.",
+    "Welders must hold current CWB certification under CSA W47.1.",
+    "All workers shall complete site safety orientation before starting.",
+    "Questions must be submitted in writing no later than 2026-06-10 14:00.",
+    "Closing date: 2026-06-18 14:00:00 Mountain Time.",
+    "The Owner reserves the right to reject any or all bids.",
+    "Structural steel shall conform to CSA G40.21 Grade 350W.",
+    "Shop drawings for the steel fabrication are to be stamped by an Alberta engineer.",
+    "Payment terms are net 30 days from receipt of a valid invoice.",
+    "Refer to Appendix B for the general conditions of contract.",
+]
+KEYWORDS = ["steel", "structural", "fabrication", "welding", "shop drawings", "edmonton", "railings", "beams"]
+
+
+def build_package(documents: int, pages: int, seed: int) -> list[dict[str, str]]:
+    rng = random.Random(seed)
+    package = []
+    for index in range(documents):
+        lines = []
+        for page in range(pages):
+            lines.append(f"Page {page + 1}")
+            lines.extend(rng.choice(SENTENCES) for _ in range(40))
+        package.append({"name": f"tender-part-{index + 1}.pdf", "text": "\n".join(lines)})
+    return package
+
+
+def best_of(function, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bid-room evidence extraction.")
+    parser.add_argument("--documents", type=int, default=5, help="Documents per package. Default: 5.")
+    parser.add_argument("--pages", type=int, default=80, help="Pages per document. Default: 80.")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per implementation. Default: 5.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the synthetic text.")
+    args = parser.parse_args()
+
+    package = build_package(args.documents, args.pages, args.seed)
+    profile = {"keywords": KEYWORDS}
+    fused = load_processor_helpers()["extract_evidence"]
+
+    if evidence_lists(fused(package, profile)) != evidence_lists(legacy_extract_evidence(package, profile)):
+        print("MISMATCH: fused extractor output differs from the legacy implementation.")
+        return 1
+
+    characters = sum(len(document["text"]) for document in package)
+    legacy_seconds = best_of(lambda: legacy_extract_evidence(package, profile), args.repeats)
+    fused_seconds = best_of(lambda: fused(package, profile), args.repeats)
+    print(f"Package: {args.documents} documents x {args.pages} pages, {characters:,} characters")
+    print(f"Legacy per-pattern scan: {legacy_seconds * 1000:8.1f} ms")
+    print(f"Fused single-pass scan:  {fused_seconds * 1000:8.1f} ms")
+    print(f"Speedup: {legacy_seconds / fused_seconds:.2f}x (identical evidence)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
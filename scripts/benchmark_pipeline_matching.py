@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark the CanadaBuys pipeline's region/keyword matching on a tender feed.
+
+Reads every row of the feed (``open``, ``new``, or a CSV path/URL, as for
+``pipeline.py --source``), then times the original per-pattern ``in`` loops
+(kept in ``tests/matching_reference.py`` as the golden reference)
+against :class:`pipeline.KeywordMatcher` in its ``scan`` and ``regex``
+strategies. Every row's region and keyword hits must be identical across
+all three or the script exits with status 1.
+
+``--extra-keywords N`` adds N synthetic keywords to a ``synthetic``
+industry to show how each approach scales as ``config.json`` grows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "pipelines" / "canadabuys"))
+
+import pipeline  # noqa: E402
+from tests.matching_reference import legacy_match_keywords, legacy_match_regions  # noqa: E402
+
+
+def best_of(function, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline region/keyword matching.")
+    parser.add_argument("--config", default=str(ROOT_DIR / "pipelines" / "canadabuys" / "config.json"))
+    parser.add_argument("--source", default="open", help="open, new, or a CSV path/URL. Default: open.")
+    parser.add_argument("--extra-keywords", type=int, default=0, help="Synthetic keywords to add. Default: 0.")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per implementation. Default: 5.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for synthetic keywords.")
+    args = parser.parse_args()
+
+    config = pipeline.load_config(Path(args.config))
+    regions = config.get("filters", {}).get("regions", [])
+    keyword_map = {industry: data.get("keywords", []) for industry, data in config.get("industries", {}).items()}
+    if args.extra_keywords:
+        rng = random.Random(args.seed)
+        keyword_map["synthetic"] = [
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+            for _ in range(args.extra_keywords)
+        ]
+
+    with pipeline.open_source(pipeline.resolve_source(config, args.source)) as handle:
+        rows = list(csv.DictReader(handle))
+
+    def legacy():
+        return [(legacy_match_regions(row, regions), legacy_match_keywords(row, keyword_map)) for row in rows]
+
+    results = {"legacy": legacy()}
+    timings = {"legacy": best_of(legacy, args.repeats)}
+    for strategy in ("scan", "regex"):
+        region_matcher = pipeline.KeywordMatcher(((region, region) for region in regions), strategy=strategy)
+        keyword_matcher = pipeline.KeywordMatcher(
+            ((industry, keyword) for industry, keywords in keyword_map.items() for keyword in keywords),
+            strategy=strategy,
+        )
+
+        def compiled(region_matcher=region_matcher, keyword_matcher=keyword_matcher):
+            return [
+                (pipeline.match_regions(row, region_matcher), pipeline.match_keywords(row, keyword_matcher))
+                for row in rows
+            ]
+
+        results[strategy] = compiled()
+        timings[strategy] = best_of(compiled, args.repeats)
+
+    for strategy in ("scan", "regex"):
+        if results[strategy] != results["legacy"]:
+            print(f"MISMATCH: the {strategy} matcher differs from the legacy loops.")
+            return 1
+
+    patterns = sum(len(keywords) for keywords in keyword_map.values())
+    chosen = pipeline.build_keyword_matcher(keyword_map).strategy
+    print(f"Feed: {len(rows):,} rows; {patterns} keywords, {len(regions)} regions (pipeline uses `{chosen}`)")
+    for name, label in (("legacy", "Legacy per-pattern loops"), ("scan", "Matcher, scan strategy"), ("regex", "Matcher, regex strategy")):
+        speedup = timings["legacy"] / timings[name]
+        print(f"{label:26} {timings[name] * 1000:9.1f} ms  ({speedup:.2f}x, identical hits)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
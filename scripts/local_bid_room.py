@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Process local tender files as a bid room on this machine (no E2B sandbox)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from procurement_core.e2b_bid_room import (  # noqa: E402
+    BidRoomSandboxResult,
+    build_process_payload,
+    profile_for_bid_room,
+    render_bid_room_markdown,
+)
+from procurement_core.local_bid_room import file_attachments, run_local_bid_room_payload  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the bid-room processor locally over tender files on disk."
+    )
+    parser.add_argument("files", nargs="+", help="Tender documents (PDF, DOCX, XLSX, ZIP, text, HTML).")
+    parser.add_argument("--reference", default="LOCAL-BID-ROOM", help="Reference to stamp on the artifact.")
+    parser.add_argument("--title", default="", help="Opportunity title.")
+    parser.add_argument(
+        "--capabilities",
+        default="",
+        help="Comma-separated business capabilities used as profile keywords.",
+    )
+    parser.add_argument("--cohere", action="store_true", help="Run the Cohere review (needs COHERE_API_KEY and network).")
+    parser.add_argument("--allow-pip", action="store_true", help="Allow pip installs of missing PDF/DOCX/XLSX parsers.")
+    parser.add_argument(
+        "--command-timeout",
+        type=int,
+        default=420,
+        help="Processor timeout in seconds. Default: 420.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the full JSON artifact.")
+    args = parser.parse_args()
+
+    paths = [Path(item).resolve() for item in args.files]
+    missing = [str(path) for path in paths if not path.is_file()]
+    if missing:
+        parser.error(f"not a file: {', '.join(missing)}")
+
+    capabilities = [item.strip() for item in args.capabilities.split(",") if item.strip()]
+    payload = build_process_payload(
+        opportunity={"source": "local", "reference": args.reference, "title": args.title},
+        profile=profile_for_bid_room({"company_name": "Local run", "capabilities": capabilities}),
+        documents=[],
+        attachments=file_attachments(paths),
+        cohere_enabled=args.cohere,
+    )
+    result: BidRoomSandboxResult = run_local_bid_room_payload(
+        payload,
+        command_timeout_seconds=args.command_timeout,
+        attachment_root=os.path.commonpath([str(path.parent) for path in paths]),
+        offline=not args.cohere,
+        allow_pip=args.allow_pip,
+        require_cohere=args.cohere,
+    )
+
+    if args.json:
+        print(json.dumps({"run_id": result.sandbox_id, "artifact": result.artifact}, indent=2))
+    else:
+        print(render_bid_room_markdown(result))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
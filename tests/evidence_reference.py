@@ -0,0 +1,90 @@
+"""Reference bid-room evidence extractor: the original per-pattern scan.
+
+``SANDBOX_PROCESSOR``'s ``extract_evidence`` now scans each document once
+with a single fused pattern. This module keeps the implementation it
+replaced, one ``re.finditer`` pass per requirement/deadline pattern, as the
+golden reference: ``test_bid_room_evidence.py`` checks that both give
+identical evidence lists and ``scripts/benchmark_bid_room_evidence.py`` times
+one against the other. It lives with the tests because nothing at runtime
+uses it.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+__all__ = ["evidence_lists", "legacy_extract_evidence"]
+
+MAX_DOC_CHARS = 24000
+MAX_COHERE_CHARS = 80000
+
+
+def normalize_line(text: Any) -> str:
+    return " ".join(str(text).split())
+
+
+def legacy_extract_evidence(text_documents: list[dict[str, str]], profile: dict[str, Any]) -> dict[str, Any]:
+    """The original implementation: one re.finditer pass per pattern."""
+    requirement_patterns = [
+        r"\bmust\b[^.\n]{0,360}[.\n]",
+        r"\bshall\b[^.\n]{0,360}[.\n]",
+        r"\bmandatory\b[^.\n]{0,360}[.\n]",
+        r"\brequired\b[^.\n]{0,360}[.\n]",
+        r"\binsurance\b[^.\n]{0,360}[.\n]",
+        r"\bbond(?:ing)?\b[^.\n]{0,360}[.\n]",
+        r"\bcertification\b[^.\n]{0,360}[.\n]",
+        r"\bsafety\b[^.\n]{0,360}[.\n]",
+        r"\bsecurity clearance\b[^.\n]{0,360}[.\n]",
+    ]
+    deadline_patterns = [
+        r"(?:closing date|closing|site meeting|questions? must be submitted|deadline|due date)[: ]+[^.\n]{0,240}[.\n]?",
+        r"\b20\d{2}-\d{2}-\d{2}(?:[T ][0-9:]{4,8})?",
+    ]
+    requirements = []
+    deadlines = []
+    matched_terms = set()
+    keywords = [str(word).lower() for word in profile.get("keywords", []) if str(word).strip()]
+    text_for_model = []
+
+    for document in text_documents:
+        text = document.get("text", "")
+        lowered = text.lower()
+        for keyword in keywords:
+            if keyword in lowered:
+                matched_terms.add(keyword)
+        for pattern in requirement_patterns:
+            for match in re.finditer(pattern, text, flags=re.IGNORECASE):
+                line = normalize_line(match.group(0))
+                if line:
+                    requirements.append({"source": document["name"], "text": line[:500]})
+        for pattern in deadline_patterns:
+            for match in re.finditer(pattern, text, flags=re.IGNORECASE):
+                line = normalize_line(match.group(0))
+                if line:
+                    deadlines.append({"source": document["name"], "text": line[:400]})
+        text_for_model.append(f"## {document['name']}\n{text[:MAX_DOC_CHARS]}")
+
+    def dedupe(items):
+        seen = set()
+        output = []
+        for item in items:
+            key = (item["source"], item["text"].lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            output.append(item)
+        return output
+
+    return {
+        "requirements": dedupe(requirements)[:80],
+        "deadlines": dedupe(deadlines)[:40],
+        "matched_terms": sorted(matched_terms),
+        "text_for_model": "\n\n".join(text_for_model)[:MAX_COHERE_CHARS],
+    }
+
+
+def evidence_lists(evidence: dict[str, Any]) -> dict[str, Any]:
+    # text_for_model is packed by evidence density since the prompt budget
+    # change; the extracted lists are what must stay identical.
+    return {key: evidence[key] for key in ("requirements", "deadlines", "matched_terms")}
@@ -0,0 +1,26 @@
+"""Reference region/keyword matching: the pipeline's original per-pattern loops.
+
+pipeline.KeywordMatcher replaced these loops. They are kept as the golden
+reference: test_pipeline_matching.py checks the matcher against them row for
+row, and scripts/benchmark_pipeline_matching.py times them. They live with
+the tests because the pipeline itself never calls them.
+"""
+
+from tests.pipeline_helpers import pipeline
+
+
+def legacy_match_regions(row: dict, regions: list[str]) -> set[str]:
+    combined = [row.get(field, "") for field in pipeline.REGION_FIELDS if row.get(field, "")]
+    haystack = " ".join(combined).lower()
+    return {region for region in regions if region.lower() in haystack}
+
+
+def legacy_match_keywords(row: dict, keyword_map: dict) -> dict:
+    text_parts = [row.get(field, "") for field in pipeline.TEXT_FIELDS if row.get(field)]
+    haystack = " ".join(text_parts).lower()
+    matches = {}
+    for industry, keywords in keyword_map.items():
+        for keyword in keywords:
+            if keyword.lower() in haystack:
+                matches.setdefault(industry, set()).add(keyword)
+    return matches
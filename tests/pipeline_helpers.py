@@ -0,0 +1,63 @@
+"""Shared helpers for the CanadaBuys pipeline tests."""
+
+import csv
+import json
+import sys
+import tempfile
+import unittest
+from collections import namedtuple
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "pipelines" / "canadabuys"))
+
+import pipeline  # noqa: E402
+
+CONFIG_PATH = Path(pipeline.__file__).with_name("config.json")
+
+PipelineRun = namedtuple("PipelineRun", "csv_path json_path summary")
+
+
+def write_rows(path, rows, fieldnames=None):
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=fieldnames or list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def run_pipeline(source, output, config_path=CONFIG_PATH, **options):
+    """Run the pipeline with attachment checks/downloads off unless ``options`` turn them on."""
+    arguments = {
+        "max_rows": None,
+        "check_attachments": False,
+        "attachment_check_limit": 0,
+        "attachment_timeout": 5,
+        "download_attachments": False,
+        "download_limit": 0,
+    }
+    arguments.update(options)
+    csv_path, json_path = pipeline.run_pipeline(
+        config_path=Path(config_path),
+        source=str(source),
+        output_dir=str(output),
+        **arguments,
+    )
+    return PipelineRun(csv_path, json_path, json.loads(json_path.read_text(encoding="utf-8")))
+
+
+class PipelineTestCase(unittest.TestCase):
+    """A temporary directory with ``tenders.csv`` as the default source."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = Path(self._tmp.name)
+        self.source = self.tmp / "tenders.csv"
+
+    def write_source(self, rows, fieldnames=None):
+        return write_rows(self.source, rows, fieldnames)
+
+    def run_pipeline(self, output, **options):
+        options.setdefault("source", self.source)
+        return run_pipeline(output=output, **options)
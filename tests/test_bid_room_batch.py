@@ -0,0 +1,134 @@
+"""Tests for bulk bid-room batches (no live sandbox)."""
+
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("CANADABUYS_LOAD_ENV_FILE", "0")
+
+PROFILE = {"company_name": "Prairie Steel", "description": "steel fabrication and welding"}
+FIT = {"AB-2026-00011": 40, "AB-2026-00012": 85, "AB-2026-00013": 85}
+RECOMMENDATION = {"AB-2026-00011": "Pass - outside scope", "AB-2026-00012": "Maybe", "AB-2026-00013": "Pursue"}
+
+
+def fake_envelope(args):
+    reference = args["reference"]
+    return {
+        "sandbox_id": "sbx-test",
+        "sandbox_killed": True,
+        "artifact": {
+            "reference": reference,
+            "opportunity": {"title": f"Tender {reference}", "closing": "2026-11-30"},
+            "evidence": {"requirements": ["Mandatory site visit"], "deadlines": []},
+            "cohere_analysis": {"fit_score": FIT[reference], "bid_recommendation": RECOMMENDATION[reference]},
+        },
+        "markdown": f"# Bid Room Review\n\n{reference}",
+    }
+
+
+class BidRoomBatchTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        from procurement_core import service
+
+        self._old_data_dir = service.DATA_DIR
+        service.DATA_DIR = Path(self._tmp.name)
+
+    def tearDown(self):
+        from procurement_core import service
+
+        service.DATA_DIR = self._old_data_dir
+        self._tmp.cleanup()
+
+    def _run(self, args):
+        from procurement_core import bid_room_batch
+
+        with mock.patch("procurement_core.service.process_bid_room_artifact", side_effect=fake_envelope):
+            record = bid_room_batch.submit_batch({"profile": PROFILE, **args})
+            events = list(bid_room_batch.iter_batch_updates(record["batch_id"], poll_seconds=0.05, timeout=10))
+        return record, events
+
+    def test_batch_ranks_finished_tenders_by_fit(self):
+        record, events = self._run({"references": "AB-2026-00011, AB-2026-00012 AB-2026-00013 ab-2026-00011"})
+
+        self.assertEqual(record["source"], "references")
+        self.assertEqual(len(record["tenders"]), 3)
+        kinds = [kind for kind, _payload in events]
+        self.assertEqual(kinds, ["tender", "tender", "tender", "summary"])
+        view = events[-1][1]
+        self.assertEqual(view["status"], "completed")
+        self.assertEqual(view["succeeded"], 3)
+        # Equal fit scores fall back to the recommendation (pursue before maybe).
+        self.assertEqual(
+            [item["reference"] for item in view["ranking"]],
+            ["AB-2026-00013", "AB-2026-00012", "AB-2026-00011"],
+        )
+        self.assertEqual(view["ranking"][0]["requirements"], 1)
+
+    def test_watchlist_source_and_limit(self):
+        from procurement_core.extensions import save_watchlist
+
+        save_watchlist([{"reference": "AB-2026-00012"}, {"reference": "AB-2026-00011"}])
+        record, events = self._run({"source": "watchlist", "limit": 1})
+
+        self.assertEqual([entry["reference"] for entry in record["tenders"]], ["AB-2026-00012"])
+        self.assertIn("first 1 of 2", record["warnings"][0])
+        self.assertEqual(events[-1][1]["ranking"][0]["fit_score"], 85)
+
+    def test_invalid_requests_are_rejected(self):
+        from procurement_core import bid_room_batch
+
+        with self.assertRaises(ValueError):
+            bid_room_batch.submit_batch({"source": "references"})
+        with self.assertRaises(ValueError):
+            bid_room_batch.submit_batch({"source": "everything", "references": ["AB-1"]})
+        with self.assertRaises(ValueError):
+            bid_room_batch.submit_batch({"source": "watchlist"})
+
+    def test_batches_are_tenant_scoped(self):
+        from procurement_core import bid_room_batch, storage
+
+        token = storage.set_tenant("tenant-a")
+        try:
+            record, _events = self._run({"references": ["AB-2026-00011"]})
+            self.assertIsNotNone(bid_room_batch.get_batch(record["batch_id"]))
+        finally:
+            storage.reset_tenant(token)
+
+        self.assertIsNone(bid_room_batch.get_batch(record["batch_id"]))
+        self.assertIsNone(bid_room_batch.get_batch("../../etc/passwd"))
+
+    def test_tools_submit_and_report(self):
+        from procurement_core.service import call_tool_text
+
+        release = threading.Event()
+
+        def slow_envelope(args):
+            release.wait(10)
+            return fake_envelope(args)
+
+        with mock.patch("procurement_core.service.process_bid_room_artifact", side_effect=slow_envelope):
+            submitted = asyncio.run(
+                call_tool_text(
+                    "process_bid_room_batch",
+                    {"references": ["AB-2026-00011", "AB-2026-00012"], "profile": PROFILE},
+                )
+            )
+            self.assertIn("Bid Room Batch", submitted)
+            self.assertIn("Not Finished", submitted)
+            batch_id = submitted.split("**Batch ID:** `", 1)[1].split("`", 1)[0]
+            release.set()
+            report = asyncio.run(call_tool_text("get_bid_room_batch", {"batch_id": batch_id, "wait_seconds": 10}))
+
+        self.assertIn("Ranked by Fit", report)
+        self.assertLess(report.index("AB-2026-00012"), report.index("AB-2026-00011"))
+        missing = asyncio.run(call_tool_text("get_bid_room_batch", {"batch_id": "f" * 32}))
+        self.assertIn("not found", missing)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Tests for the host-side bid-room artifact cache (no live sandbox or network)."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("CANADABUYS_LOAD_ENV_FILE", "0")
+
+CONTRACT = {
+    "referenceNumber-numeroReference": "TEST-FED-CACHE",
+    "title-titre-eng": "Steel package",
+    "attachment_urls": "https://example.com/a.pdf;https://example.com/b.docx",
+}
+PROFILE = {"company_name": "Test Co", "capabilities": ["steel"]}
+
+
+def fake_artifact(payload, *, etag="\"v1\""):
+    return {
+        "processor": "workspacealberta-e2b-bid-room-v1",
+        "processed_at_utc": "2026-10-19T00:00:00Z",
+        "opportunity": payload["opportunity"],
+        "profile": payload["profile"],
+        "documents": [
+            {"name": "notice.txt", "url": "", "sha256": "n0", "status": "extracted"},
+            {"name": "a.pdf", "url": "https://example.com/a.pdf", "sha256": "a1", "etag": etag, "status": "extracted"},
+            {"name": "b.docx", "url": "https://example.com/b.docx", "sha256": "b1", "etag": "", "status": "extracted"},
+        ],
+        "evidence": {"matched_terms": ["steel"], "requirements": [], "deadlines": []},
+        "cohere_analysis": None,
+        "cohere_tool_calls": [],
+        "warnings": [],
+    }
+
+
+class BidRoomCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        from procurement_core import service
+
+        self._old_data_dir = service.DATA_DIR
+        service.DATA_DIR = Path(self._tmp.name)
+
+    def tearDown(self):
+        from procurement_core import service
+
+        service.DATA_DIR = self._old_data_dir
+        self._tmp.cleanup()
+
+    def _payload(self, profile=PROFILE):
+        from procurement_core.e2b_bid_room import build_canadabuys_bid_room_payload
+
+        return build_canadabuys_bid_room_payload(CONTRACT, profile)
+
+    def test_hit_when_validators_and_hashes_match(self):
+        from procurement_core import bid_room_cache
+
+        payload = self._payload()
+        entry = bid_room_cache.store(payload, "sbx-1", fake_artifact(payload))
+        self.assertIsNotNone(entry)
+        self.assertEqual(len(entry["attachments"]), 2)
+
+        validators = {
+            "https://example.com/a.pdf": {"etag": "\"v1\"", "last_modified": ""},
+            "https://example.com/b.docx": {"etag": "", "last_modified": ""},
+        }
+        with mock.patch.object(bid_room_cache, "_head", side_effect=validators.get), \
+                mock.patch.object(bid_room_cache, "_stream_sha256", return_value="b1") as stream:
+            hit = bid_room_cache.lookup(payload)
+        self.assertEqual(hit["sandbox_id"], "sbx-1")
+        # Only the attachment without validators is re-hashed.
+        stream.assert_called_once_with("https://example.com/b.docx")
+
+    def test_miss_when_attachment_changed(self):
+        from procurement_core import bid_room_cache
+
+        payload = self._payload()
+        bid_room_cache.store(payload, "sbx-1", fake_artifact(payload))
+        with mock.patch.object(bid_room_cache, "_head", return_value={"etag": "\"v2\"", "last_modified": ""}), \
+                mock.patch.object(bid_room_cache, "_stream_sha256", return_value="b1"):
+            self.assertIsNone(bid_room_cache.lookup(payload))
+
+    def test_key_covers_profile_processor_and_cohere_settings(self):
+        from procurement_core import bid_room_cache, e2b_bid_room
+
+        payload = self._payload()
+        other_profile = self._payload({"company_name": "Other Co", "capabilities": ["lumber"]})
+        original = bid_room_cache.cache_key(payload)
+        self.assertNotEqual(original, bid_room_cache.cache_key(other_profile))
+        with mock.patch.object(e2b_bid_room, "SANDBOX_PROCESSOR", e2b_bid_room.SANDBOX_PROCESSOR + "\n# edit"):
+            self.assertNotEqual(original, bid_room_cache.cache_key(payload))
+        for setting, value in (("max_tokens", 800), ("tool_result_turns", True), ("response_format", {"type": "text"})):
+            changed = self._payload()
+            changed["cohere"][setting] = value
+            self.assertNotEqual(original, bid_room_cache.cache_key(changed), setting)
+
+    def test_failed_download_is_not_cached(self):
+        from procurement_core import bid_room_cache
+
+        payload = self._payload()
+        artifact = fake_artifact(payload)
+        artifact["documents"][2].update(sha256="", status="download_failed")
+        self.assertIsNone(bid_room_cache.store(payload, "sbx-1", artifact))
+
+    def test_ttl_zero_disables_cache(self):
+        from procurement_core import bid_room_cache
+
+        payload = self._payload()
+        with mock.patch.dict(os.environ, {"WA_BID_ROOM_CACHE_TTL_SECONDS": "0"}):
+            self.assertIsNone(bid_room_cache.store(payload, "sbx-1", fake_artifact(payload)))
+            self.assertIsNone(bid_room_cache.lookup(payload))
+
+    def test_service_reuses_cached_artifact(self):
+        from procurement_core import bid_room_cache, service
+        from procurement_core.e2b_bid_room import BidRoomSandboxResult
+
+        def fake_run(payload, **kwargs):
+            return BidRoomSandboxResult("sbx-live", True, fake_artifact(payload), "", "")
+
+        args = {"reference": "TEST-FED-CACHE", "profile": PROFILE}
+        with mock.patch.object(service, "load_contracts_for_unified", return_value=([CONTRACT], [])), \
+                mock.patch("procurement_core.e2b_bid_room.run_live_bid_room_process", side_effect=fake_run) as run, \
+                mock.patch.object(bid_room_cache, "attachment_unchanged", return_value=True):
+            first = service.process_bid_room_artifact(args)
+            second = service.process_bid_room_artifact(args)
+            forced = service.process_bid_room_artifact({**args, "refresh": True})
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["sandbox_id"], "sbx-live")
+        self.assertIn("**Cache:**", second["markdown"])
+        self.assertFalse(forced["cached"])
+        self.assertEqual(run.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Golden test: the fused single-pass evidence extractor matches the per-pattern original."""
+
+import random
+import unittest
+
+from procurement_core.e2b_bid_room import load_processor_helpers
+from tests.evidence_reference import evidence_lists, legacy_extract_evidence
+
+EDGE_CASES = [
+    "The contractor must must supply steel. Bidders shall attend.\nMandatory site meeting: 2026-06-01 10:00.",
+    "xmust not match. mustard is fine. Foreclosing: not a deadline but matches today.",
+    "Questions must be submitted by 2026-05-30. The closing date: June 18 2026\nDeadline for bonds",
+    "Bonding and bond required. Insurance certification is required.\nSafety first, security clearance required.",
+    "CAFÉ owners must comply. İstanbul shall be noted. Café closing: 2026-07-01T14:00",
+    "Due date 2026-13-45 and 2026-06-18T14:00:00 and 20260618.",
+    "must\nshall\nrequired\n",
+    "",
+    "Structural steel fabrication with C++ tooling. REQUIRED: STEEL.",
+    "Fire safety plan. Bondue date: 2026-06-18. Insurancemust shall.",
+]
+KEYWORDS = ["steel", "structural steel", "c++", "café", " weld", "fabrication", "istanbul", "required", "fire safety", "safety plan"]
+VOCABULARY = [
+    "must", "shall", "mandatory", "required", "insurance", "bond", "bonding", "certification",
+    "safety", "security clearance", "closing", "closing date", "site meeting", "question",
+    "questions must be submitted", "deadline", "due date", "2026-06-18", "2026-06-18 14:00",
+    "steel", "structural", "weld", "fire", "bondue date:", "the", "vendor", "xmust", "foreclosing", "Café", "MUST",
+    ".", ".", ",", ":", "\n", "\n\n",
+]
+
+
+class EvidenceExtractorGoldenTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.helpers = load_processor_helpers()
+
+    def assert_same(self, documents, keywords):
+        profile = {"keywords": keywords}
+        self.assertEqual(
+            evidence_lists(self.helpers["extract_evidence"](documents, profile)),
+            evidence_lists(legacy_extract_evidence(documents, profile)),
+        )
+
+    def test_edge_cases_match_legacy(self):
+        documents = [{"name": f"doc-{index}.txt", "text": text} for index, text in enumerate(EDGE_CASES)]
+        self.assert_same(documents, KEYWORDS)
+        for document in documents:
+            self.assert_same([document], KEYWORDS)
+
+    def test_random_tender_text_matches_legacy(self):
+        rng = random.Random(20261019)
+        for _ in range(200):
+            text = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(0, 400)))
+            keywords = rng.sample(KEYWORDS, rng.randint(0, len(KEYWORDS)))
+            self.assert_same([{"name": "random.txt", "text": text}], keywords)
+
+    def test_spans_are_tagged_with_offsets(self):
+        text = "Vendors must bring steel. Closing: 2026-06-18."
+        spans, found = self.helpers["scan_evidence"](text, ["steel"])
+        kinds = {(kind, text[start:end]) for kind, _index, start, end, _matched in spans}
+        self.assertIn(("requirement", "must bring steel."), kinds)
+        self.assertIn(("deadline", "2026-06-18"), kinds)
+        self.assertEqual(found, {"steel"})
+
+
+class PromptPackingTest(unittest.TestCase):
+    BOILERPLATE = "The Owner reserves the right to reject any or all bids in its sole discretion. " * 30
+
+    def pack(self, documents, budget, keywords=("steel",)):
+        helpers = load_processor_helpers({"limits": {"max_cohere_chars": budget}})
+        return helpers["extract_evidence"](documents, {"keywords": list(keywords)})
+
+    def test_package_within_budget_is_sent_whole(self):
+        documents = [{"name": "a.txt", "text": "Vendors must supply steel."}, {"name": "b.txt", "text": "Notes."}]
+        evidence = self.pack(documents, 80000)
+        self.assertEqual(evidence["text_for_model"], "## a.txt\nVendors must supply steel.\n\n## b.txt\nNotes.")
+        self.assertFalse(evidence["packing"]["truncated"])
+        self.assertEqual(evidence["packing"]["packed_chars"], len(evidence["text_for_model"]))
+
+    def test_dense_passages_from_late_documents_fit_the_budget(self):
+        requirements = "Bidders must supply structural steel. Welders shall hold CWB certification. " * 12
+        documents = [
+            {"name": "general.pdf", "text": self.BOILERPLATE * 4},
+            {"name": "addendum.pdf", "text": self.BOILERPLATE * 4},
+            {"name": "scope.pdf", "text": self.BOILERPLATE + requirements + self.BOILERPLATE},
+        ]
+        evidence = self.pack(documents, 5000)
+        packing = evidence["packing"]
+        text = evidence["text_for_model"]
+
+        self.assertTrue(packing["truncated"])
+        self.assertLessEqual(len(text), 5000)
+        self.assertIn("## scope.pdf", text)
+        self.assertIn("CWB certification", text)
+        self.assertGreater(packing["source_chars"], packing["packed_chars"])
+        self.assertLess(packing["passages_packed"], packing["passages_total"])
+        # The addendum's opening passage repeats general.pdf word for word.
+        self.assertGreaterEqual(packing["duplicates_skipped"], 1)
+        self.assertNotIn("## addendum.pdf", text)
+        self.assertEqual(packing["estimated_tokens"], (len(text) + 3) // 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""Tests for background bid-room jobs (no live sandbox)."""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("CANADABUYS_LOAD_ENV_FILE", "0")
+
+PROFILE = {"company_name": "Prairie Steel", "description": "steel fabrication and welding"}
+
+
+def fake_envelope(args):
+    return {
+        "sandbox_id": "sbx-test",
+        "sandbox_killed": True,
+        "artifact": {"reference": args["reference"]},
+        "markdown": f"# Bid Room Review\n\n{args['reference']}",
+    }
+
+
+class BidRoomJobsTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        from procurement_core import service
+
+        self._old_data_dir = service.DATA_DIR
+        service.DATA_DIR = Path(self._tmp.name)
+
+    def tearDown(self):
+        from procurement_core import service
+
+        service.DATA_DIR = self._old_data_dir
+        self._tmp.cleanup()
+
+    def test_job_succeeds_and_persists_envelope(self):
+        from procurement_core import bid_room_jobs
+
+        with mock.patch("procurement_core.service.process_bid_room_artifact", side_effect=fake_envelope):
+            record, created = bid_room_jobs.submit_job({"reference": "AB-2026-00001", "profile": PROFILE})
+            self.assertTrue(created)
+            self.assertEqual(record["status"], "queued")
+            done = bid_room_jobs.wait_for_job(record["job_id"], timeout=10)
+
+        self.assertEqual(done["status"], "succeeded")
+        self.assertEqual(done["result"]["sandbox_id"], "sbx-test")
+        saved = json.loads((Path(self._tmp.name) / "bid_room_jobs" / f"{record['job_id']}.json").read_text())
+        self.assertEqual(saved["result"]["artifact"]["reference"], "AB-2026-00001")
+
+    def test_identical_inflight_job_is_deduplicated(self):
+        from procurement_core import bid_room_jobs
+
+        release = threading.Event()
+
+        def slow_envelope(args):
+            release.wait(10)
+            return fake_envelope(args)
+
+        with mock.patch("procurement_core.service.process_bid_room_artifact", side_effect=slow_envelope):
+            first, created_first = bid_room_jobs.submit_job({"reference": "AB-2026-00002", "profile": PROFILE})
+            second, created_second = bid_room_jobs.submit_job({"reference": "ab-2026-00002 ", "profile": PROFILE})
+            other, created_other = bid_room_jobs.submit_job(
+                {"reference": "AB-2026-00002", "profile": PROFILE, "max_attachments": 1}
+            )
+            variants = [
+                bid_room_jobs.submit_job({"reference": "AB-2026-00002", "profile": PROFILE, **option})
+                for option in ({"refresh": True}, {"timeout_seconds": 1200}, {"command_timeout_seconds": 600})
+            ]
+            release.set()
+            for job in [first, other] + [record for record, _created in variants]:
+                bid_room_jobs.wait_for_job(job["job_id"], timeout=10)
+
+        self.assertTrue(created_first)
+        self.assertFalse(created_second)
+        self.assertEqual(first["job_id"], second["job_id"])
+        self.assertTrue(created_other)
+        self.assertNotEqual(first["job_id"], other["job_id"])
+        # refresh and timeouts are part of the key: none of these join the first job.
+        self.assertEqual([created for _record, created in variants], [True, True, True])
+        self.assertEqual(len({first["job_id"]} | {record["job_id"] for record, _created in variants}), 4)
+
+    def test_failures_are_recorded_on_the_job(self):
+        from procurement_core import bid_room_jobs
+
+        with mock.patch(
+            "procurement_core.service.process_bid_room_artifact",
+            side_effect=RuntimeError("E2B_API_KEY is not configured."),
+        ):
+            record, _ = bid_room_jobs.submit_job({"reference": "AB-2026-00003", "profile": PROFILE})
+            done = bid_room_jobs.wait_for_job(record["job_id"], timeout=10)
+
+        self.assertEqual(done["status"], "failed")
+        self.assertEqual(done["error_kind"], "unavailable")
+        self.assertIn("E2B_API_KEY", done["error"])
+
+    def test_submit_requires_reference(self):
+        from procurement_core import bid_room_jobs
+
+        with self.assertRaises(ValueError):
+            bid_room_jobs.submit_job({"profile": PROFILE})
+
+    def test_jobs_are_tenant_scoped(self):
+        from procurement_core import bid_room_jobs, storage
+
+        token = storage.set_tenant("tenant-a")
+        try:
+            with mock.patch("procurement_core.service.process_bid_room_artifact", side_effect=fake_envelope):
+                record, _ = bid_room_jobs.submit_job({"reference": "AB-2026-00004", "profile": PROFILE})
+                self.assertIsNotNone(bid_room_jobs.wait_for_job(record["job_id"], timeout=10))
+        finally:
+            storage.reset_tenant(token)
+
+        self.assertIsNone(bid_room_jobs.get_job(record["job_id"]))
+        self.assertIsNone(bid_room_jobs.get_job("../../etc/passwd"))
+
+    def test_orphaned_active_job_is_marked_interrupted(self):
+        from procurement_core import bid_room_jobs
+
+        job_id = "0" * 32
+        jobs_dir = Path(self._tmp.name) / "bid_room_jobs"
+        jobs_dir.mkdir(parents=True)
+        (jobs_dir / f"{job_id}.json").write_text(
+            json.dumps({"job_id": job_id, "status": "running", "tenant": None, "reference": "AB-1"})
+        )
+
+        record = bid_room_jobs.get_job(job_id)
+        self.assertEqual(record["status"], "failed")
+        self.assertEqual(record["error_kind"], "interrupted")
+
+    def test_tools_submit_and_poll(self):
+        from procurement_core import bid_room_jobs
+        from procurement_core.service import call_tool_text
+
+        with mock.patch("procurement_core.service.process_bid_room_artifact", side_effect=fake_envelope):
+            submitted = asyncio.run(
+                call_tool_text(
+                    "process_bid_room",
+                    {"reference": "AB-2026-00005", "profile": PROFILE, "background": True},
+                )
+            )
+            self.assertIn("Bid Room Job", submitted)
+            job_id = submitted.split("**Job ID:** `", 1)[1].split("`", 1)[0]
+            bid_room_jobs.wait_for_job(job_id, timeout=10)
+
+        result = asyncio.run(call_tool_text("get_bid_room_job", {"job_id": job_id}))
+        self.assertIn("Bid Room Review", result)
+        missing = asyncio.run(call_tool_text("get_bid_room_job", {"job_id": "f" * 32}))
+        self.assertIn("not found", missing)
+
+
+if __name__ == "__main__":
+    unittest.main()
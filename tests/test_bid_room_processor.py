@@ -0,0 +1,164 @@
+"""Run the sandbox processor script locally against attachments served on loopback.
+
+These tests execute ``SANDBOX_PROCESSOR`` exactly as E2B would (via
+``build_sandbox_command``), but in a local subprocess with Cohere disabled and
+only text/HTML/ZIP attachments, so no sandbox, model, or pip install is needed.
+"""
+
+import functools
+import hashlib
+import io
+import json
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+import zipfile
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from procurement_core.e2b_bid_room import (
+    build_process_payload,
+    build_sandbox_command,
+    parse_artifact,
+    profile_for_bid_room,
+    validate_bid_room_artifact,
+)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002 - signature from the stdlib
+        pass
+
+
+def run_processor(payload, timeout=120):
+    with tempfile.TemporaryDirectory() as tmp:
+        payload_path = Path(tmp) / "payload.json"
+        payload_path.write_text(json.dumps(payload), encoding="utf-8")
+        command = build_sandbox_command(str(payload_path))
+        command = command.replace("python3 -", f"{shlex.quote(sys.executable)} -", 1)
+        completed = subprocess.run(["bash", "-c", command], capture_output=True, text=True, timeout=timeout)
+    if completed.returncode != 0:
+        raise AssertionError(f"processor failed:\n{completed.stderr[-2000:]}")
+    return validate_bid_room_artifact(parse_artifact(completed.stdout))
+
+
+class BidRoomProcessorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        root = Path(cls._tmp.name)
+        cls.root = root
+        (root / "scope.txt").write_text(
+            "Scope of work\nThe contractor must supply structural steel beams.\n"
+            "Bids must be received by 2026-06-18 at 2:00 PM MT.\n",
+            encoding="utf-8",
+        )
+        (root / "notice.html").write_text(
+            "<html><body><p>Mandatory site visit required.</p>"
+            "<p>Proponents shall provide WCB clearance.</p></body></html>",
+            encoding="utf-8",
+        )
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("forms/pricing.txt", "Pricing form: vendor shall submit unit rates for fabrication.")
+        (root / "package.zip").write_bytes(buffer.getvalue())
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("readme.txt", "Bidders must read every form.")
+            archive.writestr("filler.txt", b"A" * (8 * 1024 * 1024))
+        (root / "bomb.zip").write_bytes(buffer.getvalue())
+
+        handler = functools.partial(QuietHandler, directory=str(root))
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls._tmp.cleanup()
+
+    def payload(self, names, **limits):
+        payload = build_process_payload(
+            opportunity={"source": "test", "reference": "TEST-PROC-001", "title": "Steel beams"},
+            profile=profile_for_bid_room({"company_name": "Test Co", "capabilities": ["steel", "fabrication"]}),
+            documents=[{"name": "notice.txt", "text": "Title: Steel beams", "source": "test"}],
+            attachments=[{"url": f"{self.base_url}/{name}", "name": name} for name in names],
+            cohere_enabled=False,
+        )
+        payload["limits"].update(limits)
+        return payload
+
+    def test_attachments_are_downloaded_and_extracted_in_order(self):
+        artifact = run_processor(self.payload(["scope.txt", "notice.html", "package.zip", "missing.pdf"]))
+        documents = {item["name"]: item for item in artifact["documents"]}
+
+        self.assertEqual(
+            [item["name"] for item in artifact["documents"]],
+            ["notice.txt", "scope.txt", "notice.html", "package.zip", "missing.pdf"],
+        )
+        self.assertEqual(documents["scope.txt"]["status"], "extracted")
+        self.assertEqual(len(documents["scope.txt"]["sha256"]), 64)
+        self.assertEqual(documents["notice.html"]["status"], "extracted")
+        self.assertGreater(documents["package.zip"]["text_length"], 0)
+        self.assertEqual(documents["missing.pdf"]["status"], "download_failed")
+        self.assertIn("steel", artifact["evidence"]["matched_terms"])
+        self.assertTrue(any("site visit" in item["text"].lower() for item in artifact["evidence"]["requirements"]))
+
+    def test_serial_fallback_with_single_connection(self):
+        artifact = run_processor(self.payload(["scope.txt", "notice.html"], download_concurrency=1))
+        statuses = [item["status"] for item in artifact["documents"][1:]]
+        self.assertEqual(statuses, ["extracted", "extracted"])
+
+    def test_oversized_download_is_rejected_without_a_partial_file(self):
+        artifact = run_processor(self.payload(["scope.txt"], max_file_bytes=64))
+        scope = artifact["documents"][1]
+        self.assertEqual(scope["status"], "download_failed")
+        self.assertIn("too large", scope["error"])
+
+    def test_zip_ratio_guard_skips_bomb_members(self):
+        artifact = run_processor(self.payload(["bomb.zip"]))
+        bomb = artifact["documents"][1]
+        self.assertEqual(bomb["status"], "extracted")
+        # The 8 MB member would contribute MAX_DOC_CHARS of text if inflated.
+        self.assertLess(bomb["text_length"], 500)
+        self.assertTrue(any(item["source"] == "bomb.zip" for item in artifact["evidence"]["requirements"]))
+
+    def test_time_budget_stops_extraction_early(self):
+        artifact = run_processor(self.payload(["package.zip", "scope.txt"], doc_time_budget_seconds=0))
+        package = artifact["documents"][1]
+        self.assertEqual(package["text_length"], 0)
+        self.assertIn("budget", package["error"])
+
+    def test_cached_extraction_skips_parsing_and_new_text_is_returned(self):
+        scope_digest = hashlib.sha256((self.root / "scope.txt").read_bytes()).hexdigest()
+        payload = self.payload(["scope.txt", "notice.html"])
+        payload["extraction_cache"] = {"entries": [{
+            "sha256": scope_digest,
+            "status": "extracted",
+            "text": "Cached scope: bidders must hold a bond.",
+            "text_length": 39,
+        }]}
+        artifact = run_processor(payload)
+        scope, notice = artifact["documents"][1:]
+
+        self.assertEqual(scope["cache"], "hit")
+        self.assertEqual(scope["text_length"], 39)
+        self.assertTrue(any("hold a bond" in item["text"] for item in artifact["evidence"]["requirements"]))
+        self.assertEqual(notice["cache"], "miss")
+        self.assertEqual([item["sha256"] for item in artifact["extracted_texts"]], [notice["sha256"]])
+        self.assertIn("WCB clearance", artifact["extracted_texts"][0]["text"])
+
+    def test_no_extracted_texts_without_the_cache(self):
+        artifact = run_processor(self.payload(["scope.txt"]))
+        self.assertNotIn("extracted_texts", artifact)
+        self.assertEqual(artifact["documents"][1]["cache"], "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Tests for the in-sandbox BM25 passage search used by the Cohere tool loop."""
+
+import unittest
+
+from procurement_core.e2b_bid_room import load_processor_helpers
+
+FILLER = "General conditions of contract apply to this work. " * 40
+
+
+def extracted(name, text, status="extracted"):
+    return {"name": name, "url": f"https://example.test/{name}", "status": status, "text": text}
+
+
+class PassageSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.helpers = load_processor_helpers()
+        self.helpers["documents"] = [
+            extracted("spec.pdf", FILLER + "Welders must hold CWB certification for structural steel. " + FILLER),
+            extracted("forms.pdf", "Bid bond of 10 percent is required with the pricing form. " + FILLER),
+            extracted("broken.pdf", "Welders welders welders", status="extract_failed"),
+            extracted("drawings.pdf", "Galvanized handrail anchors per detail 7. " + FILLER, status="partial"),
+        ]
+
+    def test_returns_the_passage_containing_the_terms(self):
+        results = self.helpers["search_extracted_documents"]("CWB welders certification", 3)
+        self.assertEqual(results[0]["source"], "spec.pdf")
+        self.assertIn("CWB certification", results[0]["snippet"])
+        self.assertGreater(results[0]["offset"], 0)
+        self.assertGreater(results[0]["score"], 0)
+        self.assertNotIn("broken.pdf", {item["source"] for item in results})
+
+    def test_partially_extracted_documents_are_searchable(self):
+        results = self.helpers["search_extracted_documents"]("galvanized handrail", 3)
+        self.assertEqual(results[0]["source"], "drawings.pdf")
+        self.assertEqual(results[0]["status"], "partial")
+
+    def test_passages_overlap_and_cover_the_document(self):
+        text = self.helpers["documents"][0]["text"]
+        spans = list(self.helpers["passage_spans"](text))
+        self.assertEqual(spans[0][0], 0)
+        self.assertEqual(spans[-1][1], len(text))
+        for (_, previous_end), (start, _) in zip(spans, spans[1:]):
+            self.assertLess(start, previous_end)
+
+    def test_rare_terms_outrank_common_ones(self):
+        results = self.helpers["search_extracted_documents"]("bond conditions", 8)
+        self.assertEqual(results[0]["source"], "forms.pdf")
+        self.assertIn("Bid bond", results[0]["snippet"])
+
+    def test_index_is_built_once_and_results_are_reused(self):
+        first = self.helpers["search_extracted_documents"]("steel", 2)
+        index = self.helpers["PASSAGE_INDEX"]
+        second = self.helpers["search_extracted_documents"]("steel", 2)
+        self.assertIs(self.helpers["PASSAGE_INDEX"], index)
+        self.assertIs(first, second)
+
+    def test_unmatched_query_falls_back_to_opening_passages(self):
+        results = self.helpers["search_extracted_documents"]("zzzz", 4)
+        self.assertEqual([item["source"] for item in results], ["spec.pdf", "forms.pdf", "drawings.pdf"])
+        self.assertEqual({item["offset"] for item in results}, {0})
+
+
+if __name__ == "__main__":
+    unittest.main()
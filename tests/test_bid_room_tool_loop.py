@@ -0,0 +1,167 @@
+"""Tests for the in-sandbox Cohere tool loop (model calls faked, no network)."""
+
+import json
+import threading
+import unittest
+from unittest import mock
+
+from procurement_core.e2b_bid_room import load_processor_helpers
+
+ANSWER = {
+    "bid_recommendation": "pursue - strong steel fit",
+    "fit_score": 82,
+    "requirements": ["CWB certification"],
+    "risks": [],
+    "missing_information": [],
+    "deadlines": ["Closing 2026-06-18"],
+    "questions_to_ask": [],
+    "next_actions": ["Confirm bonding"],
+}
+USAGE = {"tokens": {"input_tokens": 1200, "output_tokens": 80}}
+
+
+def tool_call(call_id, name, arguments):
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+
+def reply(*, tool_calls=None, text=None):
+    message = {"role": "assistant"}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    if text is not None:
+        message["content"] = [{"type": "text", "text": text}]
+    return {"message": message, "usage": USAGE}
+
+
+class CohereToolLoopTest(unittest.TestCase):
+    def setUp(self):
+        self.helpers = load_processor_helpers()
+        self.helpers["documents"] = [{
+            "name": "spec.pdf",
+            "url": "https://example.test/spec.pdf",
+            "status": "extracted",
+            "text": "Welders must hold CWB certification. Bid bond of 10 percent is required.",
+        }]
+        self.bundle = {
+            "opportunity": {"reference": "AB-2026-00001"},
+            "profile": {"keywords": ["steel"]},
+            "documents": [],
+            "evidence": {"requirements": ["Welders must hold CWB certification."], "deadlines": []},
+        }
+        self.requests = []
+        env = mock.patch.dict("os.environ", {"COHERE_API_KEY": "test-key"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def _fake_post(self, replies):
+        def post(_api_key, request_payload):
+            self.requests.append(request_payload)
+            item = replies.pop(0)
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+        self.helpers["cohere_post"] = post
+
+    def test_tool_results_go_to_synthesis_by_default(self):
+        self._fake_post([
+            reply(tool_calls=[tool_call("call-1", "search_extracted_documents", {"query": "CWB certification"})]),
+            reply(text=json.dumps(ANSWER)),
+        ])
+        analysis, trace = self.helpers["call_cohere"](self.bundle)
+
+        self.assertEqual(analysis["fit_score"], 82)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual([item["phase"] for item in trace if item["kind"] == "turn"], ["tools", "synthesis"])
+        self.assertIn("response_format", self.requests[-1])
+        self.assertIn("tool_results", self.requests[-1]["messages"][1]["content"])
+        roles = {item["role"] for request in self.requests for item in request["messages"]}
+        self.assertNotIn("tool", roles)
+
+    def test_answer_after_tools_skips_synthesis(self):
+        self.helpers["payload"]["cohere"]["tool_result_turns"] = True
+        self._fake_post([
+            reply(tool_calls=[
+                tool_call("call-1", "search_extracted_documents", {"query": "CWB certification"}),
+                tool_call("call-2", "get_bid_evidence", {"section": "requirements"}),
+            ]),
+            reply(text=json.dumps(ANSWER)),
+        ])
+        analysis, trace = self.helpers["call_cohere"](self.bundle)
+
+        self.assertEqual(analysis["fit_score"], 82)
+        self.assertEqual(len(self.requests), 2)
+        self.assertNotIn("response_format", self.requests[-1])
+        turns = [item for item in trace if item["kind"] == "turn"]
+        tools = [item for item in trace if item["kind"] == "tool"]
+        self.assertEqual([item["phase"] for item in turns], ["tools", "tools"])
+        self.assertEqual(turns[0]["tool_calls"], 2)
+        self.assertEqual(turns[0]["input_tokens"], 1200)
+        self.assertEqual([item["name"] for item in tools], ["search_extracted_documents", "get_bid_evidence"])
+        self.assertEqual({item["turn"] for item in tools}, {1})
+        # The tool messages carry the same compacted results as the trace.
+        tool_messages = [item for item in self.requests[-1]["messages"] if item["role"] == "tool"]
+        first = json.loads(tool_messages[0]["content"][0]["document"]["data"])
+        self.assertEqual(first, tools[0]["results"][0])
+
+    def test_tool_calls_in_one_turn_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def search(query, top_k=4):
+            barrier.wait()
+            return [{"source": "spec.pdf", "snippet": query}]
+
+        self.helpers["search_extracted_documents"] = search
+        self._fake_post([
+            reply(tool_calls=[
+                tool_call("call-1", "search_extracted_documents", {"query": "bond"}),
+                tool_call("call-2", "search_extracted_documents", {"query": "closing"}),
+            ]),
+            reply(text=json.dumps(ANSWER)),
+        ])
+        _analysis, trace = self.helpers["call_cohere"](self.bundle)
+
+        snippets = [item["results"][0]["snippet"] for item in trace if item["kind"] == "tool"]
+        self.assertEqual(snippets, ["bond", "closing"])
+
+    def test_last_tool_result_turn_asks_for_json(self):
+        self.helpers["payload"]["cohere"]["tool_result_turns"] = True
+        search = tool_call("call-1", "search_extracted_documents", {"query": "bond"})
+        self._fake_post([reply(tool_calls=[search])] * 3 + [reply(text=json.dumps(ANSWER))])
+        analysis, _trace = self.helpers["call_cohere"](self.bundle)
+
+        self.assertEqual(analysis["fit_score"], 82)
+        self.assertEqual(len(self.requests), self.helpers["MAX_COHERE_TURNS"])
+        self.assertEqual(self.requests[-1]["tool_choice"], "NONE")
+        self.assertEqual(self.requests[-1]["response_format"], self.helpers["payload"]["cohere"]["response_format"])
+        self.assertNotIn("response_format", self.requests[-2])
+
+    def test_rejected_tool_turn_falls_back_to_synthesis(self):
+        self.helpers["payload"]["cohere"]["tool_result_turns"] = True
+        self._fake_post([
+            reply(tool_calls=[tool_call("call-1", "search_extracted_documents", {"query": "bond"})]),
+            RuntimeError("Cohere returned HTTP 400: invalid tool message"),
+            reply(text=json.dumps(ANSWER)),
+        ])
+        analysis, trace = self.helpers["call_cohere"](self.bundle)
+
+        self.assertEqual(analysis["bid_recommendation"], ANSWER["bid_recommendation"])
+        self.assertIn("response_format", self.requests[-1])
+        synthesis_prompt = self.requests[-1]["messages"][1]["content"]
+        self.assertIn("tool_results", synthesis_prompt)
+        self.assertEqual(trace[-1]["phase"], "synthesis")
+
+    def test_unparseable_answer_without_tools_is_synthesized(self):
+        self._fake_post([
+            reply(text="We need to look at the documents first."),
+            reply(text=json.dumps(ANSWER)),
+        ])
+        analysis, trace = self.helpers["call_cohere"](self.bundle)
+
+        self.assertEqual(analysis["fit_score"], 82)
+        self.assertEqual([item["name"] for item in trace if item["kind"] == "tool"], ["none"])
+        self.assertEqual([item["phase"] for item in trace if item["kind"] == "turn"], ["tools", "synthesis"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,259 @@
+"""Tests for the CanadaBuys CSV pipeline's attachment checks and downloads.
+
+Attachments are served by a local HTTP server; nothing leaves the machine.
+"""
+
+import contextlib
+import csv
+import io
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from tests.pipeline_helpers import PipelineTestCase, pipeline
+
+BODY = b"%PDF-1.4 tender specification " * 200
+
+
+class AttachmentHandler(BaseHTTPRequestHandler):
+    hits: dict[str, int] = {}
+    ranges: list[str] = []
+    requests: list[tuple[str, str]] = []
+    etag = '"v1"'
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _serve(self, include_body):
+        cls = type(self)
+        with cls.lock:
+            cls.hits[self.path] = cls.hits.get(self.path, 0) + 1
+            cls.requests.append((self.command, self.path))
+            first_hit = cls.hits[self.path] == 1
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            threading.Event().wait(0.05)
+            if self.path.startswith("/missing"):
+                self.send_error(404)
+                return
+            if self.path.startswith("/flaky") and first_hit:
+                self.send_error(503)
+                return
+            if self.headers.get("If-None-Match") == cls.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            start = 0
+            requested = self.headers.get("Range", "")
+            if requested:
+                cls.ranges.append(requested)
+                start = int(requested.split("=", 1)[1].rstrip("-"))
+            payload = BODY[start:]
+            self.send_response(206 if requested else 200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("ETag", cls.etag)
+            self.end_headers()
+            if include_body and self.path.startswith("/truncated") and first_hit:
+                # The connection drops halfway through the body.
+                self.wfile.write(payload[: len(payload) // 2])
+                self.close_connection = True
+            elif include_body:
+                self.wfile.write(payload)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def do_HEAD(self):
+        self._serve(include_body=False)
+
+    def do_GET(self):
+        self._serve(include_body=True)
+
+
+class PipelineAttachmentTest(PipelineTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), AttachmentHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        AttachmentHandler.hits = {}
+        AttachmentHandler.ranges = []
+        AttachmentHandler.requests = []
+        AttachmentHandler.etag = '"v1"'
+        AttachmentHandler.peak = 0
+        super().setUp()
+        backoff = mock.patch.object(pipeline, "RETRY_BACKOFF_SECONDS", 0.01)
+        backoff.start()
+        self.addCleanup(backoff.stop)
+        quiet = contextlib.redirect_stderr(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def test_checks_run_concurrently_within_the_host_limit(self):
+        urls = [f"{self.base}/ok/{index}.pdf" for index in range(8)]
+        urls += [f"{self.base}/missing/a.pdf", f"{self.base}/flaky/b.pdf"]
+        status = pipeline.check_attachment_urls(urls, timeout=5, limit=0, concurrency=8, per_host=3, retries=1)
+
+        self.assertEqual(list(status), urls)
+        self.assertEqual([status[url] for url in urls[:8]], [200] * 8)
+        self.assertEqual(status[urls[8]], 404)
+        self.assertEqual(status[urls[9]], 200)
+        self.assertEqual(AttachmentHandler.hits["/flaky/b.pdf"], 2)
+        self.assertEqual(AttachmentHandler.hits["/missing/a.pdf"], 1)
+        self.assertLessEqual(AttachmentHandler.peak, 3)
+        self.assertGreater(AttachmentHandler.peak, 1)
+
+        limited = pipeline.check_attachment_urls(urls, timeout=5, limit=2, concurrency=4)
+        self.assertEqual(list(limited), urls[:2])
+
+    def test_download_limit_attempts_what_a_serial_run_would(self):
+        jobs = [
+            (f"{self.base}/missing/a.pdf", self.tmp / "p1" / "a.pdf"),
+            (f"{self.base}/ok/b.pdf", self.tmp / "p1" / "b.pdf"),
+            (f"{self.base}/ok/c.pdf", self.tmp / "p2" / "c.pdf"),
+            (f"{self.base}/ok/d.pdf", self.tmp / "p2" / "d.pdf"),
+        ]
+        outcomes = pipeline.download_attachment_jobs(jobs, timeout=5, limit=2, concurrency=4)
+
+        self.assertEqual(outcomes, [False, True, True, None])
+        self.assertEqual((self.tmp / "p2" / "c.pdf").read_bytes(), BODY)
+        self.assertFalse((self.tmp / "p2" / "d.pdf").exists())
+
+    def test_partial_download_resumes_with_a_range_request(self):
+        url = f"{self.base}/ok/spec.pdf"
+        destination = self.tmp / "p1" / "spec.pdf"
+        destination.parent.mkdir(parents=True)
+        destination.with_name("spec.pdf.part").write_bytes(BODY[:1000])
+        state = pipeline.AttachmentState(self.tmp / "state.json", 3600)
+        state.record_partial(url, '"v1"')
+
+        self.assertTrue(pipeline.download_attachment(url, destination, timeout=5, state=state))
+        self.assertEqual(AttachmentHandler.ranges, ["bytes=1000-"])
+        self.assertEqual(destination.read_bytes(), BODY)
+        self.assertFalse(destination.with_name("spec.pdf.part").exists())
+        self.assertNotIn("partial_validator", state.get(url))
+
+    def test_partial_download_without_a_validator_starts_over(self):
+        destination = self.tmp / "p1" / "spec.pdf"
+        destination.parent.mkdir(parents=True)
+        destination.with_name("spec.pdf.part").write_bytes(b"older file " * 100)
+
+        self.assertTrue(pipeline.download_attachment(f"{self.base}/ok/spec.pdf", destination, timeout=5))
+        self.assertEqual(AttachmentHandler.ranges, [])
+        self.assertEqual(destination.read_bytes(), BODY)
+
+    def test_dropped_download_resumes_in_a_retry_or_a_later_run(self):
+        destination = self.tmp / "p1" / "spec.pdf"
+        url = f"{self.base}/truncated/spec.pdf"
+        self.assertTrue(pipeline.download_attachment(url, destination, timeout=5, retries=1))
+        self.assertEqual(AttachmentHandler.ranges, [f"bytes={len(BODY) // 2}-"])
+        self.assertEqual(destination.read_bytes(), BODY)
+
+        AttachmentHandler.hits = {}
+        AttachmentHandler.ranges = []
+        url = f"{self.base}/truncated/other.pdf"
+        state = pipeline.AttachmentState(self.tmp / "state.json", 3600)
+        self.assertFalse(pipeline.download_attachment(url, destination, timeout=5, state=state))
+        self.assertEqual(state.get(url)["partial_validator"], '"v1"')
+        self.assertTrue(pipeline.download_attachment(url, destination, timeout=5, state=state))
+        self.assertEqual(AttachmentHandler.ranges, [f"bytes={len(BODY) // 2}-"])
+        self.assertEqual(destination.read_bytes(), BODY)
+
+    def _write_source(self):
+        rows = []
+        for index, names in enumerate((["a", "missing"], ["b", "c"], ["d"]), start=1):
+            urls = [f"{self.base}/{'missing' if name == 'missing' else 'ok'}/{name}-{index}.pdf" for name in names]
+            rows.append({
+                "referenceNumber-numeroReference": f"PW-{index}",
+                "title-titre-eng": "Structural steel supply",
+                "regionsOfDelivery-regionsLivraison-eng": "Alberta",
+                "attachment-piecesJointes-eng": ", ".join(urls),
+            })
+        return self.write_source(rows)
+
+    def _run(self, source, output, **options):
+        return self.run_pipeline(
+            output, source=source, check_attachments=True, download_attachments=True, download_limit=3, **options
+        ).summary
+
+    def test_summary_counters_match_a_serial_run(self):
+        source = self._write_source()
+        summaries = []
+        for concurrency in (1, 4):
+            output = self.tmp / f"out-{concurrency}"
+            summary = self._run(source, output, attachment_concurrency=concurrency)
+            with (output / "latest.csv").open(encoding="utf-8", newline="") as handle:
+                downloaded = [row["attachment_downloaded"] for row in csv.DictReader(handle)]
+            summaries.append(({key: value for key, value in summary.items() if key.startswith("attachment")}, downloaded))
+
+        self.assertEqual(summaries[0], summaries[1])
+        counters, downloaded = summaries[0]
+        self.assertEqual(counters["attachment_urls_missing"], 1)
+        self.assertEqual(counters["attachment_download_attempted"], 3)
+        self.assertEqual(counters["attachment_downloaded"], 3)
+        self.assertEqual([len([url for url in value.split(";") if url]) for value in downloaded], [1, 2, 0])
+
+
+    def test_state_store_skips_unchanged_attachments_on_later_runs(self):
+        source = self._write_source()
+        output = self.tmp / "out"
+        first = self._run(source, output, attachment_state=True)
+        state = json.loads((output / "attachment_state.json").read_text(encoding="utf-8"))
+        entry = state["urls"][f"{self.base}/ok/a-1.pdf"]
+        self.assertEqual((entry["status"], entry["etag"], entry["size"]), (200, '"v1"', len(BODY)))
+        self.assertEqual(len(entry["sha256"]), 64)
+        self.assertEqual(first["attachment_download_cached"], 0)
+
+        # Fresh entries are reused without any request.
+        AttachmentHandler.requests = []
+        second = self._run(source, output, attachment_state=True)
+        self.assertEqual(AttachmentHandler.requests, [])
+        self.assertEqual(second["attachment_downloaded"], first["attachment_downloaded"])
+        self.assertEqual(second["attachment_check_cached"], second["attachment_urls_checked"])
+        self.assertEqual(second["attachment_download_cached"], 3)
+
+        # Stale entries are revalidated; 304s skip the downloads.
+        third = self._run(source, output, attachment_state=True, attachment_recheck_hours=0)
+        self.assertEqual({method for method, _path in AttachmentHandler.requests}, {"HEAD"})
+        self.assertEqual(third["attachment_download_cached"], 3)
+
+        # A changed ETag is downloaded again.
+        AttachmentHandler.etag = '"v2"'
+        AttachmentHandler.requests = []
+        fourth = self._run(source, output, attachment_state=True, attachment_recheck_hours=0)
+        self.assertEqual(sum(1 for method, _path in AttachmentHandler.requests if method == "GET"), 3)
+        self.assertEqual(fourth["attachment_download_cached"], 0)
+        self.assertEqual(fourth["attachment_downloaded"], 3)
+
+    def test_cache_hits_do_not_postpone_the_recheck(self):
+        source = self._write_source()
+        output = self.tmp / "out"
+        start = time.time()
+        clock = mock.Mock(wraps=time)
+        with mock.patch.object(pipeline, "time", clock):
+            for day in range(7):
+                clock.time = lambda day=day: start + day * 86400
+                self._run(source, output, attachment_state=True, attachment_recheck_hours=48)
+
+        # Daily runs with a 48h window: HEADs on days 0, 2, 4 and 6.
+        heads = [path for method, path in AttachmentHandler.requests if method == "HEAD"]
+        self.assertEqual(heads.count("/ok/a-1.pdf"), 4)
+        self.assertEqual(heads.count("/missing/missing-1.pdf"), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
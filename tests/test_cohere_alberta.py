@@ -19,7 +19,7 @@ sys.path.insert(0, str(ROOT))
 # Keep imports side-effect free (service.py creates DATA_DIR at import time).
 os.environ.setdefault("CANADABUYS_DATA_DIR", tempfile.mkdtemp(prefix="canadabuys-test-"))
 
-from procurement_core import service  # noqa: E402
+from procurement_core import cohere_cache, service  # noqa: E402
 
 
 FAKE_ALBERTA_DETAILS = {
@@ -54,6 +54,9 @@ def run_analyze(args):
 
 
 class AlbertaCoherePathTest(unittest.TestCase):
+    def setUp(self):
+        cohere_cache.clear()
+
     def test_alberta_reference_reaches_cohere(self):
         """Alberta refs used to die at 'Contract not found'; they must reach Cohere."""
         with mock.patch.object(service, "get_alberta_api_details", return_value=FAKE_ALBERTA_DETAILS) as api, \
@@ -118,6 +121,9 @@ class AlbertaCoherePathTest(unittest.TestCase):
 
 
 class FederalCoherePathTest(unittest.TestCase):
+    def setUp(self):
+        cohere_cache.clear()
+
     def test_federal_reference_still_works(self):
         with mock.patch.object(service, "load_contracts", return_value=[FAKE_FEDERAL_CONTRACT]), \
              mock.patch.object(service, "load_profile", return_value={}), \
@@ -0,0 +1,121 @@
+"""Tests for the Cohere contract-analysis cache (model calls mocked)."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("CANADABUYS_DATA_DIR", tempfile.mkdtemp(prefix="canadabuys-test-"))
+
+from procurement_core import cohere_cache, service  # noqa: E402
+from tests.test_cohere_alberta import FAKE_ALBERTA_DETAILS  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "Review tender AB-1"}]
+
+
+class CohereCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_data_dir = service.DATA_DIR
+        service.DATA_DIR = Path(self._tmp.name)
+        cohere_cache.clear()
+
+    def tearDown(self):
+        service.DATA_DIR = self._old_data_dir
+        cohere_cache.clear()
+        self._tmp.cleanup()
+
+    def test_key_covers_model_messages_and_sampling(self):
+        key = cohere_cache.cache_key("command-a", MESSAGES, 1200, 0.2)
+        self.assertEqual(key, cohere_cache.cache_key("command-a", [dict(MESSAGES[0])], 1200, 0.2))
+        self.assertNotEqual(key, cohere_cache.cache_key("command-b", MESSAGES, 1200, 0.2))
+        self.assertNotEqual(key, cohere_cache.cache_key("command-a", MESSAGES, 800, 0.2))
+        self.assertNotEqual(key, cohere_cache.cache_key("command-a", MESSAGES, 1200, 0.5))
+        other = [{"role": "user", "content": "Review tender AB-2"}]
+        self.assertNotEqual(key, cohere_cache.cache_key("command-a", other, 1200, 0.2))
+
+    def test_entries_expire_and_lru_is_bounded(self):
+        with mock.patch.dict(os.environ, {"WA_COHERE_CACHE_MAX_ENTRIES": "2"}):
+            for name in ("a", "b"):
+                cohere_cache.store(name, f"analysis {name}", "Cohere API", "command-a")
+            self.assertIsNotNone(cohere_cache.lookup("a"))  # a is now most recent
+            cohere_cache.store("c", "analysis c", "Cohere API", "command-a")
+            self.assertIsNone(cohere_cache.lookup("b"))
+            self.assertEqual(cohere_cache.lookup("a")["content"], "analysis a")
+
+        with mock.patch.object(cohere_cache.time, "time", return_value=cohere_cache.time.time() + 90000):
+            self.assertIsNone(cohere_cache.lookup("a"))
+        with mock.patch.dict(os.environ, {"WA_COHERE_CACHE_TTL_SECONDS": "0"}):
+            cohere_cache.store("d", "analysis d", "Cohere API", "command-a")
+            self.assertIsNone(cohere_cache.lookup("d"))
+
+    def test_persisted_entries_survive_a_restart(self):
+        with mock.patch.dict(os.environ, {"WA_COHERE_CACHE_PERSIST": "1", "WA_COHERE_CACHE_MAX_ENTRIES": "2"}):
+            for name in ("a", "b", "c"):
+                cohere_cache.store(name, f"analysis {name}", "Cohere API", "command-a")
+                os.utime(Path(self._tmp.name) / "cohere_cache" / f"{name}.json", (1000 + ord(name),) * 2)
+            cohere_cache.clear()
+            self.assertEqual(cohere_cache.lookup("c")["content"], "analysis c")
+            self.assertEqual(len(list((Path(self._tmp.name) / "cohere_cache").glob("*.json"))), 2)
+        cohere_cache.clear()
+        self.assertIsNone(cohere_cache.lookup("c"))
+
+    def test_repeat_analysis_is_served_from_the_cache(self):
+        with mock.patch.object(service, "get_alberta_api_details", return_value=FAKE_ALBERTA_DETAILS), \
+             mock.patch.object(service, "load_profile", return_value={}), \
+             mock.patch.object(service, "get_cohere_api_keys", return_value=[("co", "COHERE_API_KEY")]), \
+             mock.patch.object(
+                 service,
+                 "call_cohere_chat",
+                 return_value=("Fit looks good.", "Cohere API", service.COHERE_MODEL),
+             ) as chat:
+            first = asyncio.run(service.analyze_contract_with_cohere({"reference": "AB-2026-04073"}))
+            second = asyncio.run(service.analyze_contract_with_cohere({"reference": "AB-2026-04073"}))
+            other_question = asyncio.run(
+                service.analyze_contract_with_cohere({"reference": "AB-2026-04073", "question": "Bonding?"})
+            )
+            refreshed = asyncio.run(service.analyze_contract_with_cohere({"reference": "AB-2026-04073", "refresh": True}))
+
+        self.assertEqual(chat.call_count, 3)
+        self.assertNotIn("**Cached:**", first)
+        self.assertIn("**Cached:** yes", second)
+        self.assertIn("Fit looks good.", second)
+        self.assertNotIn("**Cached:**", other_question)
+        self.assertNotIn("**Cached:**", refreshed)
+
+    def test_failover_answer_is_cached_under_the_model_that_gave_it(self):
+        hf_answer = ("HF says fit looks good.", "Hugging Face Inference Providers", service.COHERE_HF_MODEL)
+        with mock.patch.object(service, "get_alberta_api_details", return_value=FAKE_ALBERTA_DETAILS), \
+             mock.patch.object(service, "load_profile", return_value={}), \
+             mock.patch.object(service, "call_cohere_chat", return_value=hf_answer) as chat:
+            # Every Cohere key is saturated, so the request fails over to HF.
+            with mock.patch.object(service, "get_cohere_api_keys", return_value=[("co", "COHERE_API_KEY")]):
+                asyncio.run(service.analyze_contract_with_cohere({"reference": "AB-2026-04073"}))
+                cohere_retry = asyncio.run(service.analyze_contract_with_cohere({"reference": "AB-2026-04073"}))
+            with mock.patch.object(service, "get_cohere_api_keys", return_value=[]):
+                hf_repeat = asyncio.run(service.analyze_contract_with_cohere({"reference": "AB-2026-04073"}))
+
+        self.assertEqual(chat.call_count, 2)
+        self.assertNotIn("**Cached:**", cohere_retry)
+        self.assertIn("**Cached:** yes", hf_repeat)
+        self.assertIn(f"`{service.COHERE_HF_MODEL}`", hf_repeat)
+
+    def test_failed_analysis_is_not_cached(self):
+        with mock.patch.object(service, "get_alberta_api_details", return_value=FAKE_ALBERTA_DETAILS), \
+             mock.patch.object(service, "load_profile", return_value={}), \
+             mock.patch.object(service, "call_cohere_chat", side_effect=RuntimeError("quota exceeded")) as chat:
+            asyncio.run(service.analyze_contract_with_cohere({"reference": "AB-2026-04073"}))
+            output = asyncio.run(service.analyze_contract_with_cohere({"reference": "AB-2026-04073"}))
+
+        self.assertEqual(chat.call_count, 2)
+        self.assertIn("Cohere analysis is not available", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
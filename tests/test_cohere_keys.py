@@ -0,0 +1,130 @@
+"""Tests for Cohere key balancing and circuit breaking (no network)."""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("CANADABUYS_DATA_DIR", tempfile.mkdtemp(prefix="canadabuys-test-"))
+
+from procurement_core import cohere_keys, service  # noqa: E402
+
+TWO_KEYS = {"COHERE_API_KEY": "trial-key", "COHERE_PROD_API_KEY": "prod-key", "HF_TOKEN": "", "HUGGINGFACEHUB_API_TOKEN": ""}
+MESSAGES = [{"role": "user", "content": "Review tender AB-1"}]
+
+
+def limit_error(key_name, retry_after=None):
+    return service.CohereApiError(429, "Too many requests", key_name, retry_after)
+
+
+def always_limited(messages, max_tokens, temperature, token, key_name):
+    raise limit_error(key_name)
+
+
+class CohereKeySchedulerTest(unittest.TestCase):
+    def setUp(self):
+        cohere_keys.reset()
+        env = mock.patch.dict(os.environ, TWO_KEYS)
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(cohere_keys.reset)
+
+    def _direct(self, handler):
+        return mock.patch.object(service, "call_cohere_direct_chat", side_effect=handler)
+
+    def test_concurrent_requests_spread_across_keys(self):
+        barrier = threading.Barrier(2, timeout=5)
+        used = []
+
+        def handler(messages, max_tokens, temperature, token, key_name):
+            used.append(key_name)
+            barrier.wait()
+            return "ok"
+
+        with self._direct(handler):
+            threads = [threading.Thread(target=service.call_cohere_chat, args=(MESSAGES,)) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(sorted(used), ["COHERE_API_KEY", "COHERE_PROD_API_KEY"])
+        # Sequential traffic stays on the first key.
+        with self._direct(lambda *args, **kwargs: "ok") as direct:
+            _content, provider, _model = service.call_cohere_chat(MESSAGES)
+        self.assertEqual(direct.call_args.kwargs["key_name"], "COHERE_API_KEY")
+        self.assertEqual(provider, "Cohere API")
+
+    def test_rate_limited_key_is_skipped_until_its_circuit_half_opens(self):
+        def handler(messages, max_tokens, temperature, token, key_name):
+            if key_name == "COHERE_API_KEY":
+                raise limit_error(key_name, retry_after=120)
+            return "ok"
+
+        with self._direct(handler) as direct:
+            _content, provider, _model = service.call_cohere_chat(MESSAGES)
+            self.assertEqual(provider, "Cohere API via `COHERE_PROD_API_KEY` fallback")
+            service.call_cohere_chat(MESSAGES)
+        self.assertEqual(
+            [call.kwargs["key_name"] for call in direct.call_args_list],
+            ["COHERE_API_KEY", "COHERE_PROD_API_KEY", "COHERE_PROD_API_KEY"],
+        )
+        self.assertEqual(cohere_keys.stats()["COHERE_API_KEY"]["circuit"], "open")
+
+        later = cohere_keys.time.monotonic() + 121
+        with mock.patch.object(cohere_keys.time, "monotonic", return_value=later):
+            self.assertEqual(cohere_keys.stats()["COHERE_API_KEY"]["circuit"], "half_open")
+            with self._direct(lambda *args, **kwargs: "ok") as direct:
+                service.call_cohere_chat(MESSAGES)
+            self.assertEqual(direct.call_args.kwargs["key_name"], "COHERE_API_KEY")
+            self.assertEqual(cohere_keys.stats()["COHERE_API_KEY"]["circuit"], "closed")
+
+    def test_saturated_keys_fail_over_to_hugging_face(self):
+        with self._direct(always_limited), \
+             mock.patch.object(service, "call_cohere_hf_chat", return_value="hf answer") as hf, \
+             mock.patch.dict(os.environ, {"HF_TOKEN": "hf-token"}):
+            content, provider, model = service.call_cohere_chat(MESSAGES)
+            self.assertEqual((content, model), ("hf answer", service.COHERE_HF_MODEL))
+            self.assertEqual(provider, "Hugging Face Inference Providers")
+            # Both circuits are open now, so the next call goes straight to Hugging Face.
+            with self._direct(lambda *args, **kwargs: "ok") as direct:
+                service.call_cohere_chat(MESSAGES)
+            direct.assert_not_called()
+        self.assertEqual(hf.call_count, 2)
+
+    def test_without_a_fallback_route_limit_errors_still_surface(self):
+        with self._direct(always_limited):
+            with self.assertRaises(service.CohereApiError):
+                service.call_cohere_chat(MESSAGES)
+            # Open circuits are still tried, soonest first, rather than failing unasked.
+            with self._direct(lambda *args, **kwargs: "ok"):
+                self.assertEqual(service.call_cohere_chat(MESSAGES)[0], "ok")
+
+    def test_request_errors_do_not_trip_the_circuit(self):
+        error = service.CohereApiError(400, "invalid message", "COHERE_API_KEY")
+        with self._direct(mock.Mock(side_effect=error)):
+            with self.assertRaises(service.CohereApiError):
+                service.call_cohere_chat(MESSAGES)
+        self.assertEqual(cohere_keys.stats()["COHERE_API_KEY"]["circuit"], "closed")
+        self.assertEqual(cohere_keys.stats()["COHERE_API_KEY"]["in_flight"], 0)
+
+    def test_rate_limit_headers_rest_an_exhausted_key(self):
+        cohere_keys.observe_headers(
+            "COHERE_API_KEY",
+            {"x-ratelimit-remaining-requests": "0", "x-ratelimit-limit-requests": "20", "x-ratelimit-reset-requests": "1m30s"},
+        )
+        order = cohere_keys.schedule([("trial-key", "COHERE_API_KEY"), ("prod-key", "COHERE_PROD_API_KEY")])
+        self.assertEqual([name for _token, name in order], ["COHERE_PROD_API_KEY"])
+        self.assertAlmostEqual(cohere_keys.stats()["COHERE_API_KEY"]["retry_in_seconds"], 90, delta=1)
+        self.assertEqual(cohere_keys.parse_seconds("250ms"), 0.25)
+        self.assertIsNone(cohere_keys.parse_seconds("soon"))
+
+
+if __name__ == "__main__":
+    unittest.main()
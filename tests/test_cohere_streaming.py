@@ -0,0 +1,132 @@
+"""Tests for streamed Cohere output: incremental thinking removal, SSE parsing, progress sinks.
+
+All network access is faked; these tests run fully offline.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("CANADABUYS_DATA_DIR", tempfile.mkdtemp(prefix="canadabuys-test-"))
+
+from procurement_core import cohere_cache, service  # noqa: E402
+from tests.test_cohere_alberta import FAKE_ALBERTA_DETAILS  # noqa: E402
+
+THINKING_SAMPLES = [
+    "<|START_THINKING|>plan the answer<|END_THINKING|>\n\n## Fit\nGood fit.  ",
+    "  Intro <START_THINKING>hidden<END_THINKING> middle <|START_THINKING|>x<|END_THINKING|>end\n",
+    "No thinking here, just < and <START and <|START text.",
+    "Answer first. <START_THINKING>never closed",
+    "<|START_THINKING|>only thinking<|END_THINKING|>   ",
+]
+
+
+def sse_lines(*deltas, done=True):
+    lines = [b": keep-alive\n"]
+    for delta in deltas:
+        event = {"choices": [{"index": 0, "delta": {"content": delta}}]}
+        lines.append(f"data: {json.dumps(event)}\n".encode())
+        lines.append(b"\n")
+    if done:
+        lines.append(b"data: [DONE]\n")
+    return lines
+
+
+class FakeStream:
+    def __init__(self, lines):
+        self.lines = lines
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+        return False
+
+
+class ThinkingStripperTest(unittest.TestCase):
+    def test_matches_full_text_stripping_for_any_chunking(self):
+        for text in THINKING_SAMPLES:
+            expected = service.strip_cohere_thinking(text)
+            for size in range(1, 9):
+                stripper = service.ThinkingStripper()
+                output = "".join(stripper.feed(text[i:i + size]) for i in range(0, len(text), size))
+                output += stripper.flush()
+                self.assertEqual(output, expected, (text, size))
+
+    def test_visible_text_is_released_before_the_stream_ends(self):
+        stripper = service.ThinkingStripper()
+        self.assertEqual(stripper.feed("<|START_THINKING|>long plan"), "")
+        self.assertEqual(stripper.feed("<|END_THINKING|>Pursue this"), "Pursue this")
+        self.assertEqual(stripper.feed(" one. <"), " one.")
+        self.assertEqual(stripper.feed("b>"), " <b>")
+
+
+class StreamingChatTest(unittest.TestCase):
+    def setUp(self):
+        cohere_cache.clear()
+
+    def test_deltas_are_parsed_from_the_event_stream(self):
+        deltas = list(service.iter_chat_completion_deltas(sse_lines("Hel", "lo", "") + [b"data: ignored\n"]))
+        self.assertEqual(deltas, ["Hel", "lo"])
+
+    def test_stream_errors_raise(self):
+        lines = [b'data: {"error": {"message": "overloaded"}}\n']
+        with self.assertRaises(RuntimeError):
+            list(service.iter_chat_completion_deltas(lines))
+
+    def test_direct_route_streams_stripped_chunks(self):
+        stream = FakeStream(sse_lines("<START_THINK", "ING>hmm<END_THINKING>", "## Fit\n", "Strong."))
+        captured = {}
+
+        def fake_urlopen(request, timeout=0):
+            captured["payload"] = json.loads(request.data)
+            return stream
+
+        with mock.patch.dict(os.environ, {"COHERE_API_KEY": "test-key"}), \
+             mock.patch.object(service, "urlopen", side_effect=fake_urlopen):
+            chunks, provider, model = service.stream_cohere_chat([{"role": "user", "content": "hi"}])
+            text = "".join(chunks)
+
+        self.assertTrue(captured["payload"]["stream"])
+        self.assertEqual(provider, "Cohere API")
+        self.assertEqual(model, service.COHERE_MODEL)
+        self.assertEqual(text, "## Fit\nStrong.")
+        self.assertTrue(stream.closed)
+
+    def test_progress_sink_receives_the_analysis_as_it_streams(self):
+        received = []
+
+        def fake_stream(messages, max_tokens=1200):
+            return iter(["Fit looks ", "good."]), "Cohere API", "command-a"
+
+        with mock.patch.object(service, "get_alberta_api_details", return_value=FAKE_ALBERTA_DETAILS), \
+             mock.patch.object(service, "load_profile", return_value={}), \
+             mock.patch.object(service, "stream_cohere_chat", side_effect=fake_stream), \
+             mock.patch.object(service, "call_cohere_chat") as chat:
+            token = service.set_progress_sink(received.append)
+            try:
+                output = asyncio.run(service.call_tool_text("analyze_contract_with_cohere", {"reference": "AB-2026-04073"}))
+            finally:
+                service.reset_progress_sink(token)
+
+        chat.assert_not_called()
+        self.assertTrue(received[0].startswith("# Cohere Tender Analysis"))
+        self.assertEqual(received[1:], ["Fit looks ", "good."])
+        self.assertIn("Fit looks good.\n\n---\nVerify requirements", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,7 +24,7 @@ class E2BBidRoomTest(unittest.TestCase):
             "bid_recommendation",
         )
 
-        command = build_sandbox_command(payload)
+        command = build_sandbox_command()
         self.assertIn("workspacealberta-e2b-bid-room-v1", command)
         self.assertIn("python3 - <<'PY'", command)
 
@@ -0,0 +1,125 @@
+"""Tests for the host-side attachment text-extraction cache (no live sandbox)."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("CANADABUYS_LOAD_ENV_FILE", "0")
+
+TERMS = "a" * 64
+FORM = "b" * 64
+CONTRACT = {
+    "referenceNumber-numeroReference": "TEST-FED-EXTRACT",
+    "title-titre-eng": "Steel package",
+    "attachment_urls": "https://example.com/terms.pdf;https://example.com/form.docx",
+}
+
+
+def artifact_with(documents, extracted):
+    return {
+        "processor": "workspacealberta-e2b-bid-room-v1",
+        "opportunity": {},
+        "profile": {},
+        "documents": documents,
+        "evidence": {},
+        "extracted_texts": extracted,
+    }
+
+
+def document(url, sha256, cache="miss", status="extracted"):
+    return {"name": url.rsplit("/", 1)[-1], "url": url, "sha256": sha256, "status": status, "cache": cache}
+
+
+class ExtractionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        from procurement_core import service
+
+        self._old_data_dir = service.DATA_DIR
+        service.DATA_DIR = Path(self._tmp.name)
+
+    def tearDown(self):
+        from procurement_core import service
+
+        service.DATA_DIR = self._old_data_dir
+        self._tmp.cleanup()
+
+    def test_harvest_stores_complete_extractions_and_strips_them(self):
+        from procurement_core import extraction_cache
+
+        artifact = artifact_with(
+            [document("https://example.com/terms.pdf", TERMS), document("https://example.com/form.docx", FORM, status="partial")],
+            [
+                {"sha256": TERMS, "name": "terms.pdf", "status": "extracted", "text": "Standard terms.", "text_length": 15},
+                {"sha256": FORM, "name": "form.docx", "status": "partial", "text": "Half a form", "text_length": 11},
+            ],
+        )
+        self.assertEqual(extraction_cache.harvest(artifact), 1)
+        self.assertNotIn("extracted_texts", artifact)
+        self.assertEqual(extraction_cache.get_entry(TERMS)["text"], "Standard terms.")
+        self.assertIsNone(extraction_cache.get_entry(FORM))
+
+    def test_attach_sends_entries_for_known_urls(self):
+        from procurement_core import extraction_cache
+
+        extraction_cache.harvest(artifact_with(
+            [document("https://example.com/terms.pdf", TERMS)],
+            [{"sha256": TERMS, "name": "terms.pdf", "status": "extracted", "text": "Standard terms.", "text_length": 15}],
+        ))
+        payload = {"attachments": [{"url": "https://example.com/terms.pdf"}, {"url": "https://example.com/other.pdf"}]}
+        self.assertEqual(extraction_cache.attach(payload), 1)
+        self.assertEqual(payload["extraction_cache"]["entries"][0]["sha256"], TERMS)
+        self.assertEqual(extraction_cache.attach({"attachments": [{"url": "https://example.com/other.pdf"}]}), 0)
+
+    def test_documents_seen_in_several_bid_rooms_travel_with_new_urls(self):
+        from procurement_core import extraction_cache
+
+        extracted = [{"sha256": TERMS, "name": "terms.pdf", "status": "extracted", "text": "Standard terms.", "text_length": 15}]
+        extraction_cache.harvest(artifact_with([document("https://example.com/1/terms.pdf", TERMS)], extracted))
+        payload = {"attachments": [{"url": "https://example.com/3/terms.pdf"}]}
+        self.assertEqual(extraction_cache.attach(payload), 0)
+
+        extraction_cache.harvest(artifact_with([document("https://example.com/2/terms.pdf", TERMS)], extracted))
+        self.assertEqual(extraction_cache.attach(payload), 1)
+
+    def test_disabled_cache_attaches_nothing(self):
+        from procurement_core import extraction_cache
+
+        payload = {"attachments": []}
+        with mock.patch.dict(os.environ, {"WA_BID_ROOM_EXTRACT_CACHE": "0"}):
+            self.assertEqual(extraction_cache.attach(payload), 0)
+            artifact = artifact_with([], [{"sha256": TERMS, "status": "extracted", "text": "x"}])
+            self.assertEqual(extraction_cache.harvest(artifact), 0)
+        self.assertNotIn("extraction_cache", payload)
+        self.assertNotIn("extracted_texts", artifact)
+
+    def test_service_round_trip(self):
+        from procurement_core import service
+        from procurement_core.e2b_bid_room import BidRoomSandboxResult
+
+        payloads = []
+
+        def fake_run(payload, **kwargs):
+            payloads.append(payload)
+            artifact = artifact_with(
+                [document("https://example.com/terms.pdf", TERMS, cache="hit" if payload["extraction_cache"]["entries"] else "miss")],
+                [{"sha256": TERMS, "name": "terms.pdf", "status": "extracted", "text": "Standard terms.", "text_length": 15}],
+            )
+            return BidRoomSandboxResult("sbx", True, artifact, "", "")
+
+        args = {"reference": "TEST-FED-EXTRACT", "refresh": True}
+        with mock.patch.object(service, "load_contracts_for_unified", return_value=([CONTRACT], [])), \
+                mock.patch("procurement_core.e2b_bid_room.run_live_bid_room_process", side_effect=fake_run):
+            first = service.process_bid_room_artifact(args)
+            second = service.process_bid_room_artifact(args)
+
+        self.assertEqual(payloads[0]["extraction_cache"], {"entries": []})
+        self.assertEqual(payloads[1]["extraction_cache"]["entries"][0]["text"], "Standard terms.")
+        self.assertNotIn("extracted_texts", first["artifact"])
+        self.assertIn("Reused cached extractions:** 1", second["markdown"])
+
+
+if __name__ == "__main__":
+    unittest.main()
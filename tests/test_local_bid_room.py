@@ -0,0 +1,107 @@
+"""Tests for the host-side local bid-room runner (no E2B, Cohere disabled)."""
+
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("CANADABUYS_LOAD_ENV_FILE", "0")
+
+from procurement_core import local_bid_room  # noqa: E402
+from procurement_core.e2b_bid_room import build_process_payload, profile_for_bid_room  # noqa: E402
+from procurement_core.local_bid_room import (  # noqa: E402
+    file_attachments,
+    run_local_bid_room_batch,
+    run_local_bid_room_payload,
+)
+
+
+def make_payload(attachments, reference="TEST-LOCAL-001"):
+    return build_process_payload(
+        opportunity={"source": "test", "reference": reference, "title": "Steel beams"},
+        profile=profile_for_bid_room({"company_name": "Test Co", "capabilities": ["steel"]}),
+        documents=[{"name": "notice.txt", "text": "Bidders must attend the site meeting.", "source": "test"}],
+        attachments=attachments,
+        cohere_enabled=False,
+    )
+
+
+class LocalBidRoomTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name) / "package"
+        self.root.mkdir()
+        (self.root / "scope.txt").write_text("The contractor shall supply structural steel.\n", encoding="utf-8")
+        self.secret = Path(self._tmp.name) / "secret.txt"
+        self.secret.write_text("host secret", encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_processes_inline_and_local_file_attachments(self):
+        payload = make_payload(file_attachments([self.root / "scope.txt"]))
+        result = run_local_bid_room_payload(payload, attachment_root=self.root, offline=True)
+
+        self.assertTrue(result.sandbox_id.startswith("local-"))
+        self.assertTrue(result.killed)
+        scope = result.artifact["documents"][1]
+        self.assertEqual(scope["status"], "extracted")
+        self.assertEqual(len(scope["sha256"]), 64)
+        self.assertIn("steel", result.artifact["evidence"]["matched_terms"])
+        texts = [item["text"] for item in result.artifact["evidence"]["requirements"]]
+        self.assertTrue(any("shall supply structural steel" in text for text in texts))
+        self.assertTrue(any("must attend" in text for text in texts))
+
+    def test_files_outside_the_attachment_root_are_refused(self):
+        payload = make_payload(file_attachments([self.secret]))
+        result = run_local_bid_room_payload(payload, attachment_root=self.root, offline=True)
+        secret = result.artifact["documents"][1]
+        self.assertEqual(secret["status"], "download_failed")
+        self.assertIn("outside", secret["error"])
+
+        result = run_local_bid_room_payload(make_payload(file_attachments([self.root / "scope.txt"])), offline=True)
+        self.assertIn("unsupported URL scheme", result.artifact["documents"][1]["error"])
+
+    def test_offline_mode_refuses_network_downloads(self):
+        payload = make_payload([{"url": "https://example.com/tender.pdf", "name": "tender.pdf"}])
+        result = run_local_bid_room_payload(payload, offline=True)
+        self.assertEqual(result.artifact["documents"][1]["error"], "network access is disabled")
+
+    def test_cohere_requires_a_key(self):
+        payload = make_payload([])
+        payload["cohere"]["enabled"] = True
+        with mock.patch.dict(os.environ, {"COHERE_API_KEY": ""}), \
+                mock.patch("procurement_core.local_bid_room.load_local_env"):
+            with self.assertRaises(RuntimeError):
+                run_local_bid_room_payload(payload)
+
+    def test_batch_returns_results_in_order(self):
+        payloads = [make_payload([], reference=f"TEST-LOCAL-{index}") for index in range(3)]
+        payloads[1] = {"limits": {"max_file_bytes": "not-a-number"}}
+        results = run_local_bid_room_batch(payloads, workers=3, offline=True)
+        self.assertEqual(results[0].artifact["opportunity"]["reference"], "TEST-LOCAL-0")
+        self.assertIsInstance(results[1], Exception)
+        self.assertEqual(results[2].artifact["opportunity"]["reference"], "TEST-LOCAL-2")
+
+
+    @unittest.skipUnless(hasattr(os, "fork"), "rlimits are POSIX-only")
+    def test_limits_are_applied_in_the_child_without_preexec_fn(self):
+        script = "import resource\nprint(resource.getrlimit(resource.RLIMIT_CPU)[0], resource.getrlimit(resource.RLIMIT_AS)[0])\n"
+        with mock.patch("subprocess.Popen", wraps=subprocess.Popen) as popen:
+            completed = subprocess.run(
+                local_bid_room._processor_command(512, 30), input=script, capture_output=True, text=True, check=True
+            )
+        self.assertIsNone(popen.call_args.kwargs.get("preexec_fn"))
+        self.assertEqual(completed.stdout.split(), ["30", str(512 * 1024 * 1024)])
+        self.assertEqual(local_bid_room._processor_command(0, 0)[1:], ["-"])
+
+        with mock.patch("subprocess.run", wraps=subprocess.run) as run:
+            run_local_bid_room_payload(make_payload([]), offline=True, memory_mb=1024, cpu_seconds=60)
+        self.assertNotIn("preexec_fn", run.call_args.kwargs)
+        self.assertEqual(run.call_args.args[0][-2:], ["1024", "60"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Tests for procurement_core.notice_store and the pipeline's --store mode."""
+
+import contextlib
+import csv
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from procurement_core import notice_store
+from procurement_core.notice_store import NoticeStore
+from tests.pipeline_helpers import run_pipeline
+
+FIELDS = [
+    "referenceNumber-numeroReference",
+    "amendmentNumber-numeroModification",
+    "title-titre-eng",
+    "match_industries",
+]
+
+
+def write_csv(path, rows, fields=FIELDS):
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(fields)
+        writer.writerows(rows)
+    return path
+
+
+def summary(stamp, matched):
+    return {
+        "generated_at_utc": f"2026-10-{stamp}T06:00:00Z",
+        "source": "tenders.csv",
+        "processed_total": 100,
+        "matched_total": matched,
+    }
+
+
+@unittest.skipIf(notice_store.duckdb is None, "duckdb not installed")
+class NoticeStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = Path(self._tmp.name)
+        self.store = NoticeStore(self.tmp / "out")
+
+    def test_runs_deduplicate_notices_and_keep_first_seen(self):
+        first = write_csv(self.tmp / "first.csv", [
+            ["PW-1", "", "Structural steel", "steel"],
+            ["PW-2", "", "Plywood", "lumber"],
+            ["", "", "Untracked steel notice", "steel"],
+        ])
+        self.assertEqual(self.store.append_run("20261001-060000", first, summary("01", 3)), 3)
+
+        second = write_csv(self.tmp / "second.csv", [
+            ["PW-1", "", "Structural steel beams", "steel"],
+            ["PW-2", "001", "Plywood", "lumber"],
+            ["PW-2", "001", "Plywood and timber", "lumber"],
+        ])
+        self.assertEqual(self.store.append_run("20261002-060000", second, summary("02", 3)), 2)
+
+        notices = self.store.run_sql(
+            "SELECT notice_key, first_seen_run, last_seen_run, \"title-titre-eng\" FROM notices ORDER BY notice_key"
+        )["rows"]
+        self.assertEqual(len(notices), 4)
+        self.assertEqual(notices[0], ["PW-1#", "20261001-060000", "20261002-060000", "Structural steel beams"])
+        self.assertEqual(notices[1], ["PW-2#", "20261001-060000", "20261001-060000", "Plywood"])
+        self.assertEqual(notices[2], ["PW-2#001", "20261002-060000", "20261002-060000", "Plywood and timber"])
+        self.assertTrue(notices[3][0].startswith("row:"))
+
+        counts = self.store.run_sql("SELECT run_id, count(*) FROM run_notices GROUP BY run_id ORDER BY run_id")
+        self.assertEqual(counts["rows"], [["20261001-060000", 3], ["20261002-060000", 2]])
+        self.assertEqual(
+            [run["run_id"] for run in self.store.list_runs()], ["20261001-060000", "20261002-060000"]
+        )
+
+    def test_failed_append_rolls_back(self):
+        first = write_csv(self.tmp / "first.csv", [["PW-1", "", "Structural steel", "steel"]])
+        self.store.append_run("a", first, summary("01", 1))
+        second = write_csv(self.tmp / "second.csv", [["PW-1", "", "Structural steel beams", "steel"]])
+
+        original = NoticeStore._append
+
+        def append_then_fail(store, *args):
+            original(store, *args)
+            raise RuntimeError("disk full")
+
+        with mock.patch.object(NoticeStore, "_append", append_then_fail):
+            with self.assertRaises(RuntimeError):
+                self.store.append_run("b", second, summary("02", 1))
+        self.assertEqual([run["run_id"] for run in self.store.list_runs()], ["a"])
+        self.assertEqual(
+            self.store.run_sql("SELECT last_seen_run, \"title-titre-eng\" FROM notices")["rows"],
+            [["a", "Structural steel"]],
+        )
+        self.assertEqual(self.store.run_sql("SELECT run_id FROM run_notices")["rows"], [["a"]])
+
+    def test_later_runs_add_new_columns(self):
+        self.store.append_run("a", write_csv(self.tmp / "a.csv", [["PW-1", "", "Steel", "steel"]]), summary("01", 1))
+        fields = FIELDS + ["supplierLegalName-nomLegalFournisseur-eng"]
+        self.store.append_run(
+            "b", write_csv(self.tmp / "b.csv", [["AW-1", "", "Steel award", "steel", "Acme"]], fields), summary("02", 1)
+        )
+        rows = self.store.run_sql(
+            "SELECT notice_key, \"supplierLegalName-nomLegalFournisseur-eng\" FROM notices ORDER BY notice_key"
+        )["rows"]
+        self.assertEqual(rows, [["AW-1#", "Acme"], ["PW-1#", None]])
+
+    def test_queries_are_read_only(self):
+        self.store.append_run("a", write_csv(self.tmp / "a.csv", [["PW-1", "", "Steel", "steel"]]), summary("01", 1))
+        for sql in ("DELETE FROM notices", "SELECT 1; DROP TABLE notices"):
+            with self.assertRaises(ValueError):
+                self.store.run_sql(sql)
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            code = notice_store.main(["--data-dir", str(self.tmp / "out"), "SELECT count(*) AS n FROM notices"])
+        self.assertEqual((code, stdout.getvalue().splitlines()), (0, ["n", "1"]))
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(notice_store.main(["--data-dir", str(self.tmp / "missing"), "--runs"]), 1)
+
+    def test_pipeline_store_keeps_only_latest_files(self):
+        source = write_csv(self.tmp / "tenders.csv", [
+            ["PW-1", "", "Structural steel supply", "*Alberta"],
+            ["PW-2", "", "Office chairs", "*Alberta"],
+        ], FIELDS[:3] + ["regionsOfDelivery-regionsLivraison-eng"])
+        output = self.tmp / "out"
+        with contextlib.redirect_stderr(io.StringIO()):
+            csv_path, json_path, saved = run_pipeline(source, output, store=True)
+        self.assertEqual((csv_path.name, json_path.name), ("latest.csv", "latest.json"))
+        self.assertEqual(list(output.glob("filtered-*.csv")) + list(output.glob("summary-*.json")), [])
+        self.assertEqual(saved["store_path"], str(output / notice_store.STORE_FILENAME))
+        runs = self.store.list_runs()
+        self.assertEqual([(run["run_id"], run["matched_total"]) for run in runs], [(saved["run_id"], 1)])
+        self.assertEqual(self.store.run_sql("SELECT notice_key FROM notices")["rows"], [["PW-1#"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
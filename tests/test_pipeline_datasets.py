@@ -0,0 +1,176 @@
+"""Tests for pipeline CKAN dataset sources (awards/contract history) and Parquet output.
+
+A local HTTP server plays both the CKAN API and the file host.
+"""
+
+import contextlib
+import csv
+import io
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from tests.pipeline_helpers import CONFIG_PATH, PipelineTestCase, pipeline
+
+
+def awards_csv():
+    handle = io.StringIO()
+    writer = csv.writer(handle, lineterminator="\r\n")
+    writer.writerow([
+        "referenceNumber-numeroReference",
+        "title-titre-eng",
+        "regionOfDelivery-regionLivraison-eng",
+        "contractAwardDate-dateAttributionContrat",
+        "supplierLegalName-nomLegalFournisseur-eng",
+    ])
+    for index in range(60):
+        writer.writerow([
+            f"AW-{index:03d}",
+            ["Structural steel beams", "Plywood sheathing", "Catering services"][index % 3],
+            "*Alberta" if index % 4 else "*Ontario",
+            f"{2023 + index // 20}-06-{index % 28 + 1:02d}",
+            f"Supplier {index}",
+        ])
+    return handle.getvalue().encode("utf-8")
+
+
+class CkanHandler(BaseHTTPRequestHandler):
+    body = awards_csv()
+    requests: list[tuple[str, str, str]] = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).requests.append((self.command, self.path, self.headers.get("Range", "")))
+        if self.path.startswith("/api/action/package_show"):
+            base = f"http://{self.headers['Host']}"
+            payload = {
+                "success": True,
+                "result": {
+                    "name": "awards",
+                    "resources": [
+                        {"name": "Award notices 2022", "format": "CSV", "url": f"{base}/files/awards-2022.csv", "last_modified": "2023-01-01T00:00:00"},
+                        {"name": "Award notices", "format": "CSV", "url": f"{base}/files/awards.csv", "last_modified": "2026-10-01T00:00:00"},
+                        {"name": "Data dictionary", "format": "XML", "url": f"{base}/files/dd.xml", "last_modified": "2026-10-02T00:00:00"},
+                    ],
+                },
+            }
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if self.headers.get("If-None-Match") == '"awards-v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        requested = self.headers.get("Range", "")
+        if requested:
+            start = int(requested.split("=", 1)[1].rstrip("-"))
+        payload = type(self).body[start:]
+        self.send_response(206 if requested else 200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", '"awards-v1"')
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class CkanDatasetTest(PipelineTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), CkanHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        super().setUp()
+        CkanHandler.requests = []
+        config = pipeline.load_config(CONFIG_PATH)
+        config["sources"]["awards_package_show"] = f"{self.base}/api/action/package_show?id=awards"
+        self.config_path = self.tmp / "config.json"
+        self.config_path.write_text(json.dumps(config), encoding="utf-8")
+        self.output = self.tmp / "out"
+        quiet = contextlib.redirect_stderr(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def _run(self, **options):
+        return self.run_pipeline(self.output, source="awards", config_path=self.config_path, **options).summary
+
+    def _file_requests(self):
+        return [request for request in CkanHandler.requests if request[1].startswith("/files/")]
+
+    def test_package_resolves_to_the_newest_csv_and_is_cached(self):
+        summary = self._run()
+        self.assertEqual(summary["source"], f"{self.base}/files/awards.csv")
+        self.assertEqual(summary["ckan_resource"], "Award notices")
+        self.assertEqual((self.output / "sources" / "awards.csv").read_bytes(), CkanHandler.body)
+        # Region and text columns are found from the header when the tender
+        # feed's names are absent: 45 Alberta rows, 30 of them steel/lumber.
+        self.assertEqual(summary["matched_total"], 30)
+
+        CkanHandler.requests = []
+        self.assertEqual(self._run()["matched_total"], 30)
+        self.assertEqual(self._file_requests(), [])
+
+        older = self._run(ckan_resource="2022")
+        self.assertEqual(older["source"], f"{self.base}/files/awards-2022.csv")
+
+    def test_interrupted_download_resumes(self):
+        destination = self.output / "sources" / "awards.csv"
+        destination.parent.mkdir(parents=True)
+        destination.with_name("awards.csv.part").write_bytes(CkanHandler.body[:500])
+        # The run that left the .part behind recorded its ETag for If-Range.
+        (destination.parent / pipeline.SOURCE_STATE_FILENAME).write_text(json.dumps({
+            "version": 1,
+            "urls": {f"{self.base}/files/awards.csv": {"partial_validator": '"awards-v1"'}},
+        }), encoding="utf-8")
+
+        self._run()
+        self.assertEqual(self._file_requests(), [("GET", "/files/awards.csv", "bytes=500-")])
+        self.assertEqual(destination.read_bytes(), CkanHandler.body)
+
+    def test_cached_source_is_revalidated_once_the_window_passes(self):
+        start = time.time()
+        clock = mock.Mock(wraps=time)
+        with mock.patch.object(pipeline, "time", clock):
+            for hour in range(0, 73, 12):
+                clock.time = lambda hour=hour: start + hour * 3600
+                self.assertEqual(self._run()["matched_total"], 30)
+
+        # Runs every 12h with the default 24h window: the CSV is requested at
+        # 0h, then conditionally (304) at 24h, 48h and 72h.
+        self.assertEqual([path for _method, path, _range in self._file_requests()], ["/files/awards.csv"] * 4)
+
+    @unittest.skipIf(pipeline.duckdb is None, "duckdb not installed")
+    def test_parquet_output_is_partitioned_by_year(self):
+        summary = self._run(parquet=True)
+        parquet_dir = Path(summary["parquet_dir"])
+        self.assertEqual(parquet_dir, self.output / "parquet" / "awards")
+        self.assertEqual(
+            sorted(path.name for path in parquet_dir.iterdir()),
+            ["partition_year=2023", "partition_year=2024", "partition_year=2025"],
+        )
+        with pipeline.duckdb.connect() as connection:
+            count, references = connection.execute(
+                "SELECT count(*), count(DISTINCT \"referenceNumber-numeroReference\")"
+                f" FROM read_parquet('{parquet_dir}/**/*.parquet', hive_partitioning = true)"
+            ).fetchone()
+        self.assertEqual((count, references), (summary["output_rows"], summary["output_rows"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Tests for the pipeline's incremental mode (pipeline_state.json + latest-delta.csv)."""
+
+import csv
+import json
+import unittest
+
+from tests.pipeline_helpers import PipelineTestCase, pipeline
+
+FIELDS = [
+    "referenceNumber-numeroReference",
+    "amendmentNumber-numeroModification",
+    "title-titre-eng",
+    "regionsOfDelivery-regionsLivraison-eng",
+    "tenderClosingDate-appelOffresDateCloture",
+]
+
+
+def notice(reference, title, amendment="", region="*Alberta", closing="2026-03-01"):
+    return dict(zip(FIELDS, [reference, amendment, title, region, closing]))
+
+
+class IncrementalPipelineTest(PipelineTestCase):
+    def _write(self, rows):
+        self.write_source(rows, FIELDS)
+
+    def _run(self, output, incremental=True):
+        run = self.run_pipeline(output, incremental=incremental)
+        return run.csv_path.read_bytes(), run.summary
+
+    def _delta(self, output):
+        with (output / "latest-delta.csv").open(encoding="utf-8", newline="") as handle:
+            return [(row["change"], row["referenceNumber-numeroReference"]) for row in csv.DictReader(handle)]
+
+    def test_only_new_and_amended_notices_are_reprocessed(self):
+        output = self.tmp / "out"
+        rows = [
+            notice("PW-1", "Structural steel supply"),
+            notice("PW-2", "Lumber and plywood", closing="2026-02-01"),
+            notice("PW-3", "Office chairs"),
+            notice("PW-4", "Steel beams", region="*Ontario"),
+            notice("PW-5", "Carbon steel plate"),
+        ]
+        self._write(rows)
+        _first_csv, first = self._run(output)
+        self.assertEqual(first["incremental"]["new"], 5)
+        self.assertEqual(first["incremental"]["markdown_written"], 3)
+        self.assertEqual(sorted(self._delta(output)), [("new", "PW-1"), ("new", "PW-2"), ("new", "PW-5")])
+
+        markdown = output / "projects" / "PW-1.md"
+        markdown.write_text("left alone when unchanged\n", encoding="utf-8")
+        _second_csv, second = self._run(output)
+        self.assertEqual(second["incremental"]["unchanged"], 5)
+        self.assertEqual(second["incremental"]["markdown_written"], 0)
+        self.assertEqual(self._delta(output), [])
+        self.assertEqual(markdown.read_text(encoding="utf-8"), "left alone when unchanged\n")
+
+        rows[1] = notice("PW-2", "Lumber, plywood and timber", closing="2026-02-01")
+        rows[4] = notice("PW-5", "Carbon steel plate", amendment="001")
+        rows.append(notice("PW-6", "Aluminium extrusions"))
+        del rows[0]
+        self._write(rows)
+        third_csv, third = self._run(output)
+        self.assertEqual(
+            {key: third["incremental"][key] for key in ("new", "changed", "unchanged", "removed")},
+            {"new": 2, "changed": 1, "unchanged": 2, "removed": 2},
+        )
+        self.assertEqual(sorted(self._delta(output)), [("changed", "PW-2"), ("new", "PW-5"), ("new", "PW-6")])
+        self.assertTrue((output / "projects" / "PW-5-amendment-001.md").exists())
+
+        full_csv, full = self._run(self.tmp / "full", incremental=False)
+        self.assertEqual(third_csv, full_csv)
+        for key in ("matched_total", "processed_total", "industry_counts", "match_sources"):
+            self.assertEqual(third[key], full[key])
+
+    def test_config_changes_invalidate_the_state(self):
+        output = self.tmp / "out"
+        self._write([notice("PW-1", "Structural steel supply")])
+        self._run(output)
+        state = json.loads((output / pipeline.PIPELINE_STATE_FILENAME).read_text(encoding="utf-8"))
+        state["rules"] = "older-config"
+        (output / pipeline.PIPELINE_STATE_FILENAME).write_text(json.dumps(state), encoding="utf-8")
+
+        _csv, summary = self._run(output)
+        self.assertEqual((summary["incremental"]["new"], summary["incremental"]["unchanged"]), (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Tests for the pipeline's row classification: compiled matchers and worker pool.
+
+The original per-pattern ``in`` loops in ``matching_reference.py``
+are the golden reference (``scripts/benchmark_pipeline_matching.py`` times against them too).
+"""
+
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "pipelines" / "canadabuys"))
+
+import pipeline  # noqa: E402
+from tests.matching_reference import legacy_match_keywords, legacy_match_regions  # noqa: E402
+from tests.pipeline_helpers import run_pipeline, write_rows  # noqa: E402
+
+
+def config_maps():
+    config = pipeline.load_config(Path(pipeline.__file__).with_name("config.json"))
+    regions = config.get("filters", {}).get("regions", [])
+    keyword_map = {industry: data.get("keywords", []) for industry, data in config.get("industries", {}).items()}
+    return regions, keyword_map
+
+
+WORDS = [
+    "supply", "of", "Structural", "steel", "beams", "carbon", "stainless", "Plywood", "and", "LUMBER",
+    "aluminium", "extrusions", "technology", "services", "Edmonton", "timberline", "woodworking", "log",
+]
+REGIONS = ["Alberta", "British Columbia", "National Capital Region (NCR)", "Saskatchewan", "Northwest Territories"]
+
+
+def random_rows(count, seed=3):
+    generator = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        rows.append({
+            "title-titre-eng": " ".join(generator.choice(WORDS) for _ in range(generator.randint(0, 8))),
+            "tenderDescription-descriptionAppelOffres-eng": " ".join(
+                generator.choice(WORDS) for _ in range(generator.randint(0, 40))
+            ),
+            "regionsOfDelivery-regionsLivraison-eng": "*" + generator.choice(REGIONS),
+            "regionsOfOpportunity-regionAppelOffres-eng": generator.choice(["", "*Canada", "*" + generator.choice(REGIONS)]),
+            "unspsc": generator.choice(["", "*30101700", "*72101500", "*43211500", "*30103600, 11121600"]),
+        })
+    return rows
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def test_matches_the_legacy_loops_row_for_row(self):
+        regions, keyword_map = config_maps()
+        regions = regions + ["Saskatchewan", "Territories"]
+        for strategy in ("scan", "regex"):
+            region_matcher = pipeline.KeywordMatcher(((region, region) for region in regions), strategy=strategy)
+            keyword_matcher = pipeline.KeywordMatcher(
+                ((industry, keyword) for industry, keywords in keyword_map.items() for keyword in keywords),
+                strategy=strategy,
+            )
+            for row in random_rows(400):
+                self.assertEqual(pipeline.match_regions(row, region_matcher), legacy_match_regions(row, regions))
+                self.assertEqual(
+                    pipeline.match_keywords(row, keyword_matcher),
+                    legacy_match_keywords(row, keyword_map),
+                    (strategy, row),
+                )
+
+    def test_compiled_pattern_finds_nested_and_overlapping_keywords(self):
+        keyword_map = {
+            "steel": ["Steel", "carbon steel", "steel beam", "eel"],
+            "lumber": ["wood", "plywood", "Wood"],
+            "everything": [""],
+        }
+        matcher = pipeline.KeywordMatcher(
+            ((industry, keyword) for industry, keywords in keyword_map.items() for keyword in keywords),
+            strategy="regex",
+        )
+        row = {"title-titre-eng": "CARBON STEEL BEAMS", "tenderDescription-descriptionAppelOffres-eng": "plywood"}
+        self.assertEqual(pipeline.match_keywords(row, matcher), legacy_match_keywords(row, keyword_map))
+        self.assertEqual(
+            pipeline.match_keywords(row, matcher)["steel"],
+            {"Steel", "carbon steel", "steel beam", "eel"},
+        )
+
+    def test_strategy_follows_the_pattern_count(self):
+        _regions, keyword_map = config_maps()
+        self.assertEqual(pipeline.build_keyword_matcher(keyword_map).strategy, "scan")
+        many = {"synthetic": [f"kw{index:03d}" for index in range(pipeline.COMPILED_MATCHER_MIN_PATTERNS)]}
+        self.assertEqual(pipeline.build_keyword_matcher(many).strategy, "regex")
+
+
+class ParallelClassificationTest(unittest.TestCase):
+    def test_workers_produce_the_serial_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            rows = random_rows(700, seed=11)
+            for index, row in enumerate(rows):
+                row["referenceNumber-numeroReference"] = f"PW-{index:04d}"
+                row["tenderClosingDate-appelOffresDateCloture"] = f"2026-0{index % 3 + 1}-01"
+            source = write_rows(tmp / "tenders.csv", rows)
+
+            outputs = []
+            for workers, max_rows in ((1, None), (3, None), (1, 450), (2, 450)):
+                output = tmp / f"out-{workers}-{max_rows}"
+                csv_path, _json_path, summary = run_pipeline(
+                    source, output, max_rows=max_rows, workers=workers, classify_batch_rows=64
+                )
+                summary.pop("generated_at_utc")
+                summary.pop("markdown_dir")
+                outputs.append((csv_path.read_bytes(), summary))
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[2], outputs[3])
+        self.assertGreater(outputs[0][1]["matched_total"], outputs[2][1]["matched_total"])
+        self.assertEqual(outputs[2][1]["processed_total"], 451)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Tests for the pipeline's bounded-memory sort and streamed outputs."""
+
+import csv
+import json
+import os
+import random
+import unittest
+import zipfile
+from pathlib import Path
+
+from tests.pipeline_helpers import PipelineTestCase, pipeline
+
+
+def dated_rows(count, seed=5):
+    generator = random.Random(seed)
+    rows = []
+    for index in range(count):
+        rows.append({
+            "referenceNumber-numeroReference": f"PW-{index:04d}",
+            "title-titre-eng": generator.choice(["Structural steel", "Plywood supply", "Office chairs"]),
+            "regionsOfDelivery-regionsLivraison-eng": "*Alberta",
+            "tenderClosingDate-appelOffresDateCloture": generator.choice(["", "2026-01-05", "2026-02-10", "2026-02-10"]),
+            "procurementCategory-categorieApprovisionnement": generator.choice(["*GD", "*SRV", "*CNST"]),
+            "contractingEntityName-nomEntitContractante-eng": generator.choice(["PSPC", "DND", "Parks Canada"]),
+        })
+    return rows
+
+
+class RowSorterTest(unittest.TestCase):
+    def test_spilled_runs_merge_in_stable_sort_order(self):
+        rows = dated_rows(200)
+        sorter = pipeline.RowSorter(buffer_rows=7)
+        for position, row in enumerate(rows):
+            sorter.add(dict(row), position, "new" if position % 2 else "")
+        self.assertGreater(sorter.spilled_runs, 20)
+        self.assertEqual(len(sorter), 200)
+
+        expected = sorted(rows, key=pipeline.sort_key)
+        for _ in range(2):
+            self.assertEqual([row for row, _change in sorter], expected)
+        changes = {row["referenceNumber-numeroReference"]: change for row, change in sorter}
+        self.assertEqual(changes["PW-0001"], "new")
+        self.assertEqual(changes["PW-0002"], "")
+
+        spill_dir = sorter._spill_dir
+        sorter.close()
+        self.assertFalse(Path(spill_dir).exists())
+
+
+class StreamedOutputTest(PipelineTestCase):
+    def test_spilling_run_writes_the_in_memory_output(self):
+        self.write_source(dated_rows(300))
+        outputs = []
+        for buffer_rows in (pipeline.SORT_BUFFER_ROWS, 16):
+            output = self.tmp / f"out-{buffer_rows}"
+            csv_path, _json_path, summary = self.run_pipeline(output, sort_buffer_rows=buffer_rows)
+            summary.pop("generated_at_utc")
+            summary.pop("markdown_dir")
+            markdown = sorted(path.name for path in (output / "projects").iterdir())
+            outputs.append((csv_path.read_bytes(), summary, markdown))
+            self.assertEqual((output / "latest.csv").read_bytes(), csv_path.read_bytes())
+            self.assertEqual(json.loads((output / "latest.json").read_text(encoding="utf-8"))["source"], str(self.source))
+            self.assertFalse((output / "latest.csv.tmp").exists())
+            if hasattr(os, "link"):
+                self.assertTrue(os.path.samefile(output / "latest.csv", csv_path))
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertGreater(outputs[0][1]["output_rows"], 16)
+
+
+class ProjectMarkdownTest(PipelineTestCase):
+    def _run(self, output, **options):
+        return self.run_pipeline(output, **options).summary
+
+    def _manifest(self, output):
+        return json.loads((output / "projects" / pipeline.PROJECT_MANIFEST_FILENAME).read_text(encoding="utf-8"))
+
+    def test_unchanged_markdown_is_not_rewritten(self):
+        rows = dated_rows(60)
+        self.write_source(rows)
+        output = self.tmp / "out"
+        first = self._run(output)
+        self.assertEqual(first["markdown_written"], first["output_rows"])
+        manifest = self._manifest(output)
+        self.assertEqual(manifest["count"], first["output_rows"])
+        with (output / "latest.csv").open(encoding="utf-8", newline="") as handle:
+            references = [row["referenceNumber-numeroReference"] for row in csv.DictReader(handle)]
+        self.assertEqual([entry["id"] for entry in manifest["projects"]], references)
+        self.assertEqual(
+            pipeline.markdown_digest((output / "projects" / manifest["projects"][0]["file"]).read_text(encoding="utf-8")),
+            manifest["projects"][0]["digest"],
+        )
+
+        steel = next(row for row in rows if row["title-titre-eng"] == "Structural steel")
+        markdown = output / "projects" / f"{steel['referenceNumber-numeroReference']}.md"
+        os.utime(markdown, (0, 0))
+        self.assertEqual(self._run(output)["markdown_written"], 0)
+        self.assertEqual(markdown.stat().st_mtime, 0)
+
+        steel["title-titre-eng"] = "Structural steel beams"
+        self.write_source(rows)
+        self.assertEqual(self._run(output)["markdown_written"], 1)
+        self.assertIn("# Structural steel beams", markdown.read_text(encoding="utf-8"))
+
+    def test_incremental_manifest_keeps_output_order_with_threads(self):
+        rows = dated_rows(80)
+        self.write_source(rows)
+        output = self.tmp / "out"
+        self._run(output, incremental=True, markdown_workers=4)
+        for index, row in enumerate(rows):
+            if index % 2 and row["title-titre-eng"] == "Structural steel":
+                row["title-titre-eng"] = "Structural steel beams"
+        self.write_source(rows)
+        summary = self._run(output, incremental=True, markdown_workers=4)
+        self.assertGreater(summary["incremental"]["changed"], 0)
+        self.assertGreater(summary["incremental"]["unchanged"], 0)
+
+        with (output / "latest.csv").open(encoding="utf-8", newline="") as handle:
+            references = [row["referenceNumber-numeroReference"] for row in csv.DictReader(handle)]
+        self.assertEqual([entry["id"] for entry in self._manifest(output)["projects"]], references)
+
+    def test_archive_and_thread_pool_match_serial_files(self):
+        self.write_source(dated_rows(80))
+        serial = self.tmp / "serial"
+        self._run(serial, markdown_workers=1)
+        packed = self.tmp / "packed"
+        summary = self._run(packed, markdown_mode="archive", markdown_workers=4)
+
+        self.assertEqual(self._manifest(packed), self._manifest(serial))
+        self.assertEqual(summary["markdown_written"], 0)
+        self.assertEqual([path.name for path in (packed / "projects").iterdir()], [pipeline.PROJECT_MANIFEST_FILENAME])
+        with zipfile.ZipFile(summary["markdown_archive"]) as archive:
+            members = archive.namelist()
+            self.assertEqual(members, [entry["file"] for entry in self._manifest(serial)["projects"]])
+            for name in members:
+                self.assertEqual(archive.read(name), (serial / "projects" / name).read_bytes())
+        self.assertFalse((packed / (pipeline.PROJECT_ARCHIVE_FILENAME + ".tmp")).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 ROOT = Path(__file__).resolve().parents[1]
 SERVER_DIR = ROOT / "mcp-servers" / "canadabuys"
@@ -29,6 +30,7 @@ class ProcurementHttpAppTest(unittest.TestCase):
         health_body = health.json()
         self.assertEqual(health_body["status"], "ok")
         self.assertEqual(health_body["mcp"], {"streamable_http": "/mcp"})
+        self.assertIsInstance(health_body["cohere_keys"], dict)
 
         old_sse = self.client.get("/sse")
         self.assertEqual(old_sse.status_code, 404)
@@ -53,6 +55,20 @@ class ProcurementHttpAppTest(unittest.TestCase):
         self.assertEqual(missing_reference.status_code, 400)
         self.assertIn("reference", missing_reference.json()["detail"].lower())
 
+        self.assertIn("/bid-room/jobs/{job_id}", openapi.json()["paths"])
+        missing_job_reference = self.client.post("/bid-room/jobs", json={})
+        self.assertEqual(missing_job_reference.status_code, 400)
+        unknown_job = self.client.get("/bid-room/jobs/" + "0" * 32)
+        self.assertEqual(unknown_job.status_code, 404)
+
+        self.assertIn("/bid-room/batches/{batch_id}/events", openapi.json()["paths"])
+        empty_batch = self.client.post("/bid-room/batches", json={"source": "references"})
+        self.assertEqual(empty_batch.status_code, 400)
+        unknown_batch = self.client.get("/bid-room/batches/" + "0" * 32)
+        self.assertEqual(unknown_batch.status_code, 404)
+        unknown_events = self.client.get("/bid-room/batches/" + "0" * 32 + "/events")
+        self.assertEqual(unknown_events.status_code, 404)
+
         cohere_status = self.client.post("/tools/check_cohere_status", json={})
         self.assertEqual(cohere_status.status_code, 200)
         self.assertIn(
@@ -60,6 +76,64 @@ class ProcurementHttpAppTest(unittest.TestCase):
             cohere_status.json()["content"],
         )
 
+    def test_batch_events_stream_tenders_then_summary(self) -> None:
+        from procurement_core import bid_room_batch
+
+        def envelope(args):
+            return {
+                "sandbox_id": "sbx-test",
+                "sandbox_killed": True,
+                "artifact": {"reference": args["reference"], "cohere_analysis": {"fit_score": 70}},
+                "markdown": "# Bid Room Review",
+            }
+
+        with mock.patch("procurement_core.service.process_bid_room_artifact", side_effect=envelope):
+            record = bid_room_batch.submit_batch({"references": ["AB-2026-00021", "AB-2026-00022"]})
+            expected = list(bid_room_batch.iter_batch_updates(record["batch_id"], poll_seconds=0.05, timeout=10))
+
+        response = self.client.get(f"/bid-room/batches/{record['batch_id']}/events")
+        self.assertEqual(response.status_code, 200)
+        events = [block.split("\n", 1)[0] for block in response.text.strip().split("\n\n")]
+        self.assertEqual(events, [f"event: {kind}" for kind, _payload in expected])
+        self.assertEqual(events, ["event: tender", "event: tender", "event: summary"])
+
+    def test_cohere_analysis_streams_as_server_sent_events(self) -> None:
+        from procurement_core import cohere_cache
+
+        cohere_cache.clear()
+        prepared = {
+            "messages": [],
+            "max_tokens": 400,
+            "source_name": "CanadaBuys",
+            "source_ref": "WS1",
+            "model": "command-a",
+            "cache_key": "stream-test",
+        }
+        with mock.patch("server_http.prepare_contract_analysis", return_value=prepared), mock.patch(
+            "server_http.stream_cohere_chat",
+            return_value=(iter(["Fit ", "is good."]), "Cohere API", "command-a"),
+        ):
+            response = self.client.post("/cohere/analyze/stream", json={"reference": "WS1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = [block.split("\n", 1) for block in response.text.strip().split("\n\n")]
+        self.assertEqual([event[0] for event in events], ["event: meta", "event: chunk", "event: chunk", "event: done"])
+        self.assertIn('"text": "is good."', events[2][1])
+
+        # The finished stream is cached; a repeat replays it without the model.
+        with mock.patch("server_http.prepare_contract_analysis", return_value=prepared), mock.patch(
+            "server_http.stream_cohere_chat"
+        ) as stream:
+            repeat = self.client.post("/cohere/analyze/stream", json={"reference": "WS1"})
+        stream.assert_not_called()
+        self.assertIn('"cached": true', repeat.text)
+        self.assertIn('"text": "Fit is good."', repeat.text)
+        cohere_cache.clear()
+
+        with mock.patch("server_http.prepare_contract_analysis", return_value="Contract not found: WS2"):
+            missing = self.client.post("/cohere/analyze/stream", json={"reference": "WS2"})
+        self.assertEqual(missing.status_code, 400)
+
     def test_landing_page(self) -> None:
         landing = self.client.get("/")
         self.assertEqual(landing.status_code, 200)
@@ -175,6 +249,7 @@ class InlineProfileTest(unittest.TestCase):
             "daily_bid_brief",
             "find_alberta_opportunities",
             "process_bid_room",
+            "process_bid_room_batch",
             "analyze_contract_with_cohere",
         ):
             self.assertIn("profile", by_name[name].inputSchema["properties"], name)
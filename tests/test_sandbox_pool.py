@@ -0,0 +1,196 @@
+"""Tests for the warm E2B sandbox pool (fake sandboxes, no live E2B)."""
+
+import json
+import os
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault("CANADABUYS_LOAD_ENV_FILE", "0")
+
+
+class FakeCommands:
+    def __init__(self):
+        self.calls = []
+
+    def run(self, command, envs=None, timeout=None):
+        self.calls.append({"command": command, "envs": envs, "timeout": timeout})
+        return mock.Mock(stdout="", stderr="")
+
+
+class FakeFiles:
+    def __init__(self):
+        self.written = {}
+
+    def write(self, path, data):
+        self.written[path] = data
+
+
+class FakeSandbox:
+    created = []
+
+    def __init__(self, **options):
+        self.options = options
+        self.sandbox_id = f"fake-{len(FakeSandbox.created)}"
+        self.commands = FakeCommands()
+        self.files = FakeFiles()
+        self.running = True
+        self.killed = False
+        self.timeout = options.get("timeout")
+
+    @classmethod
+    def create(cls, **options):
+        sandbox = cls(**options)
+        cls.created.append(sandbox)
+        return sandbox
+
+    def is_running(self):
+        return self.running
+
+    def set_timeout(self, timeout):
+        self.timeout = timeout
+
+    def kill(self):
+        self.killed = True
+        self.running = False
+
+
+class SandboxPoolTest(unittest.TestCase):
+    def setUp(self):
+        from procurement_core import sandbox_pool
+
+        FakeSandbox.created = []
+        self.pool = sandbox_pool
+        self._patches = [
+            mock.patch.object(sandbox_pool, "_sandbox_class", return_value=FakeSandbox),
+            # Keep the maintenance thread out of the way; tests drive fill() directly.
+            mock.patch.object(sandbox_pool, "_ensure_worker"),
+        ]
+        for patch in self._patches:
+            patch.start()
+
+    def tearDown(self):
+        self.pool.shutdown()
+        for patch in reversed(self._patches):
+            patch.stop()
+
+    def test_disabled_pool_creates_cold_sandbox(self):
+        with mock.patch.dict(os.environ, {"WA_BID_ROOM_POOL_SIZE": "0"}):
+            sandbox, warm = self.pool.lease_sandbox(timeout_seconds=900, envs={"K": "v"})
+        self.assertFalse(warm)
+        self.assertEqual(sandbox.options["envs"], {"K": "v"})
+        self.assertEqual(sandbox.commands.calls, [])
+
+    def test_fill_warms_and_lease_reuses(self):
+        with mock.patch.dict(os.environ, {"WA_BID_ROOM_POOL_SIZE": "2", "E2B_BID_ROOM_TEMPLATE": "bid-room"}):
+            self.assertEqual(self.pool.fill(), 2)
+            self.assertEqual(self.pool.stats()["idle"], 2)
+            warm_sandbox = FakeSandbox.created[0]
+            self.assertIn("pip install", warm_sandbox.commands.calls[0]["command"])
+            self.assertEqual(warm_sandbox.options["template"], "bid-room")
+
+            sandbox, warm = self.pool.lease_sandbox(timeout_seconds=900)
+            self.assertTrue(warm)
+            self.assertIs(sandbox, warm_sandbox)
+            self.assertEqual(sandbox.timeout, 900)
+            self.assertEqual(self.pool.stats()["idle"], 1)
+
+            self.pool.release_sandbox(sandbox)
+            self.assertTrue(sandbox.killed)
+            self.assertEqual(self.pool.stats()["idle"], 1)
+
+    def test_unhealthy_and_expired_sandboxes_are_skipped(self):
+        with mock.patch.dict(os.environ, {"WA_BID_ROOM_POOL_SIZE": "2", "WA_BID_ROOM_POOL_IDLE_SECONDS": "60"}):
+            self.pool.fill()
+            first, second = FakeSandbox.created
+            first.running = False
+            with mock.patch.object(self.pool.time, "monotonic", return_value=time.monotonic() + 30):
+                sandbox, warm = self.pool.lease_sandbox(timeout_seconds=900)
+            self.assertTrue(first.killed)
+            self.assertIs(sandbox, second)
+            self.assertTrue(warm)
+
+            self.pool.fill()
+            with mock.patch.object(self.pool.time, "monotonic", return_value=time.monotonic() + 120):
+                self.assertEqual(self.pool.evict_expired(), 2)
+            cold, warm = self.pool.lease_sandbox(timeout_seconds=900)
+            self.assertFalse(warm)
+
+    def test_unused_lease_returns_to_pool(self):
+        with mock.patch.dict(os.environ, {"WA_BID_ROOM_POOL_SIZE": "1"}):
+            self.pool.fill()
+            sandbox, _ = self.pool.lease_sandbox(timeout_seconds=900)
+            self.pool.release_sandbox(sandbox, used=False)
+            self.assertFalse(sandbox.killed)
+            self.assertEqual(self.pool.stats()["idle"], 1)
+
+    def test_failed_warmup_is_dropped(self):
+        class BrokenCommands(FakeCommands):
+            def run(self, command, envs=None, timeout=None):
+                raise RuntimeError("pip failed")
+
+        class BrokenSandbox(FakeSandbox):
+            def __init__(self, **options):
+                super().__init__(**options)
+                self.commands = BrokenCommands()
+
+        with mock.patch.dict(os.environ, {"WA_BID_ROOM_POOL_SIZE": "1"}), \
+                mock.patch.object(self.pool, "_sandbox_class", return_value=BrokenSandbox):
+            self.assertEqual(self.pool.fill(), 0)
+            self.assertTrue(BrokenSandbox.created[-1].killed)
+            self.assertEqual(self.pool.stats()["idle"], 0)
+
+    def test_bid_room_run_passes_secrets_on_the_command(self):
+        from procurement_core.e2b_bid_room import _run_e2b_payload, build_sample_payload
+
+        artifact = (
+            '{"processor": "workspacealberta-e2b-bid-room-v1", "opportunity": {}, '
+            '"profile": {}, "documents": [], "evidence": {}}'
+        )
+        with mock.patch.dict(os.environ, {"WA_BID_ROOM_POOL_SIZE": "1", "E2B_API_KEY": "e2b", "COHERE_API_KEY": "co"}):
+            self.pool.fill()
+            warm_sandbox = FakeSandbox.created[0]
+            warm_sandbox.commands.run = mock.Mock(return_value=mock.Mock(stdout=artifact, stderr=""))
+            payload = build_sample_payload(cohere_enabled=True)
+            result = _run_e2b_payload(payload, timeout_seconds=600, command_timeout_seconds=120)
+
+        self.assertTrue(result.warm_start)
+        self.assertTrue(result.killed)
+        self.assertTrue(warm_sandbox.killed)
+        self.assertEqual(warm_sandbox.commands.run.call_args.kwargs["envs"], {"COHERE_API_KEY": "co"})
+
+    def test_bid_room_payload_is_written_to_the_sandbox_not_the_command(self):
+        from procurement_core import extraction_cache
+        from procurement_core.e2b_bid_room import (
+            MAX_COMMAND_BYTES,
+            SANDBOX_PAYLOAD_PATH,
+            _run_e2b_payload,
+            build_sample_payload,
+        )
+
+        payload = build_sample_payload()
+        text = "Structural steel scope. " * 1000
+        per_entry = len(text)
+        payload["extraction_cache"] = {"entries": [
+            {"sha256": f"{index:064x}", "status": "extracted", "text": text, "text_length": per_entry}
+            for index in range(extraction_cache.MAX_PAYLOAD_TEXT_CHARS // per_entry)
+        ]}
+        sandbox = FakeSandbox()
+        sandbox.commands.run = mock.Mock(return_value=mock.Mock(
+            stdout='{"processor": "x", "opportunity": {}, "profile": {}, "documents": [], "evidence": {}}',
+            stderr="",
+        ))
+        with mock.patch.dict(os.environ, {"E2B_API_KEY": "e2b"}), \
+                mock.patch.object(self.pool, "lease_sandbox", return_value=(sandbox, False)):
+            _run_e2b_payload(payload)
+
+        command = sandbox.commands.run.call_args.args[0]
+        self.assertLess(len(command.encode("utf-8")), MAX_COMMAND_BYTES)
+        self.assertNotIn(text, command)
+        self.assertIn(SANDBOX_PAYLOAD_PATH, command)
+        written = json.loads(sandbox.files.written[SANDBOX_PAYLOAD_PATH])
+        self.assertEqual(len(written["extraction_cache"]["entries"]), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the shared UNSPSC trie classifier (pipeline rules and profile scoring)."""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "pipelines" / "canadabuys"))
+
+os.environ.setdefault("CANADABUYS_DATA_DIR", tempfile.mkdtemp(prefix="canadabuys-test-"))
+
+import pipeline  # noqa: E402
+from procurement_core import service  # noqa: E402
+from procurement_core.unspsc import UnspscClassifier, extract_codes  # noqa: E402
+
+
+def brute_force(row_codes, rules):
+    hits = []
+    for rule in rules:
+        if rule["match_type"] == "exact":
+            if rule["prefix"] in row_codes:
+                hits.append(rule)
+        elif any(code.startswith(rule["prefix"]) for code in row_codes):
+            hits.append(rule)
+    return hits
+
+
+class UnspscClassifierTest(unittest.TestCase):
+    def test_exact_and_prefix_terminals(self):
+        classifier = UnspscClassifier()
+        classifier.add("3010", "steel-family")
+        classifier.add("30101700", "beams", exact=True)
+        classifier.add("301017", "beams-class")
+
+        self.assertEqual(classifier.match(["30101700"]), ["steel-family", "beams", "beams-class"])
+        self.assertEqual(classifier.match(["30101701"]), ["steel-family", "beams-class"])
+        self.assertEqual(classifier.match(["3010"]), ["steel-family"])
+        self.assertEqual(classifier.match(["3011", "72101500"]), [])
+        # A rule is reported once even when several codes hit it.
+        self.assertEqual(classifier.match(["30101500", "30102000"]), ["steel-family"])
+        self.assertEqual(extract_codes("*30101700, 72101500; 12"), ["30101700", "72101500"])
+
+    def test_pipeline_rules_match_the_brute_force_scan(self):
+        config = pipeline.load_config(Path(pipeline.__file__).with_name("config.json"))
+        rules = pipeline.build_code_rules(config)
+        classifier = pipeline.compile_code_rules(rules)
+        self.assertEqual(len(classifier), len(rules))
+
+        generator = random.Random(7)
+        samples = [[rule["code"]] for rule in rules] + [[rule["prefix"] + "99"] for rule in rules]
+        for _ in range(500):
+            samples.append([str(generator.randint(10000000, 99999999)) for _ in range(generator.randint(1, 4))])
+        for codes in samples:
+            self.assertEqual(pipeline.match_unspsc(codes, classifier), brute_force(codes, rules), codes)
+
+    def test_score_contract_uses_code_prefixes(self):
+        profile = {"industries": ["steel", "construction"], "capabilities": []}
+        score, reasons = service.score_contract({"unspsc": "*30101700"}, profile)
+        self.assertEqual(score, 30)
+        self.assertEqual(reasons, ["UNSPSC code matches steel", "UNSPSC code matches construction"])
+
+        # "221" appears inside this code but is not a prefix of it.
+        score, reasons = service.score_contract({"unspsc": "*43221000"}, profile)
+        self.assertEqual((score, reasons), (0, []))
+
+    def test_pipeline_imports_without_the_service_module(self):
+        # The pipeline only needs unspsc; procurement_core.service (env loading,
+        # data dir, duckdb) and the notice store must not come along.
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]); import pipeline; "
+            "print(*sorted(name for name in sys.modules if name.startswith('procurement_core')))"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", script, str(ROOT / "pipelines" / "canadabuys")],
+            capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(completed.stdout.split(), ["procurement_core", "procurement_core.unspsc"])
+
+
+if __name__ == "__main__":
+    unittest.main()